@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+'''
+Microbenchmarks of schema operations.
+
+Each benchmark is timed with the optimization disabled (baseline) and enabled.
+'''
+
+import argparse
+import json
+import os
+import timeit
+
+from siliconcompiler import Chip
+from siliconcompiler.schema import Schema
+
+
+def _get_chip():
+    chip = Chip('gcd')
+    chip.load_target('freepdk45_demo')
+    chip.set('option', 'var', 'test', 'value')
+    for step, index in chip.nodes_to_execute():
+        chip.set('metric', 'cellarea', 10.0, step=step, index=index)
+        chip.set('record', 'starttime', '2024-01-01 00:00:00', step=step, index=index)
+    return chip
+
+
+# Keypaths covering set values, 'default' templates and pernode values
+_GET_KEYPATHS = [
+    (('design',), {}),
+    (('option', 'var', 'test'), {}),
+    (('option', 'var', 'unset'), {}),
+    (('tool', 'openroad', 'task', 'place', 'var', 'place_density'),
+     {'step': 'place', 'index': '0'}),
+    (('metric', 'cellarea'), {'step': 'place', 'index': '0'}),
+    (('pdk', 'freepdk45', 'stackup'), {})
+]
+
+
+def bench_get(chip, baseline):
+    '''
+    Parameter lookups, the baseline walks the configuration dictionary.
+    '''
+    schema = chip.schema
+
+    def run():
+        for keypath, kwargs in _GET_KEYPATHS:
+            if baseline:
+                schema._clear_index()
+            schema.get(*keypath, **kwargs)
+    return run
+
+
+def bench_get_list(chip, baseline):
+    '''
+    Lookups of a large list of files, the baseline copies the list.
+    '''
+    schema = chip.schema.copy()
+    schema.set('option', 'cfg', [f'file{n}.json' for n in range(10000)])
+
+    def run():
+        schema.get('option', 'cfg', copy=baseline)
+    return run
+
+
+def bench_query(chip, baseline):
+    '''
+    Collecting the metrics of all the nodes, the baseline calls get() for each
+    metric and node.
+    '''
+    schema = chip.schema
+    nodes = chip.nodes_to_execute()
+
+    def run():
+        if baseline:
+            for metric in schema.getkeys('metric'):
+                for step, index in nodes:
+                    schema.get('metric', metric, step=step, index=index)
+        else:
+            schema.get_many('metric', '*', nodes=nodes)
+    return run
+
+
+def bench_set(chip, baseline):
+    '''
+    Parameter updates, the baseline walks the configuration dictionary.
+    '''
+    schema = chip.schema
+
+    def run():
+        if baseline:
+            schema._clear_index()
+        schema.set('option', 'var', 'test', 'value')
+        if baseline:
+            schema._clear_index()
+        schema.set('metric', 'cellarea', 10.0, step='place', index='0')
+    return run
+
+
+def bench_input(chip, baseline):
+    '''
+    Adding a large filelist, the baseline adds the files one by one.
+    '''
+    files = [f'rtl/mod{n}.v' for n in range(1000)]
+
+    def run():
+        dest = Chip('test')
+        dest.logger.setLevel('WARNING')
+        if baseline:
+            for filename in files:
+                dest.input(filename)
+        else:
+            dest.input(files)
+    return run
+
+
+def bench_chip(chip, baseline):
+    '''
+    Chip construction, the baseline builds the default configuration.
+    '''
+    def run():
+        if baseline:
+            Schema._templates.clear()
+        Chip('test')
+    return run
+
+
+def bench_merge(chip, baseline):
+    '''
+    Merging a manifest, the baseline checks and normalizes every value again.
+    '''
+    dest = _get_chip()
+
+    def run():
+        dest._merge_manifest(chip.schema, clobber=False, trusted=not baseline)
+    return run
+
+
+def bench_partial_merge(chip, baseline):
+    '''
+    Merging the parameters of a manifest which may be updated by a node, the
+    baseline checks and normalizes every value again.
+    '''
+    dest = _get_chip()
+
+    def run():
+        dest._merge_manifest(chip.schema, clobber=False, partial=True, trusted=not baseline)
+    return run
+
+
+def bench_write_json(chip, baseline):
+    '''
+    Writing a compact manifest, the baseline encodes the indented manifest as
+    a single string.
+    '''
+    schema = chip.schema
+
+    def run():
+        with open(os.devnull, 'w') as f:
+            if baseline:
+                f.write(json.dumps(schema.cfg, indent=4))
+            else:
+                schema.write_json(f, compact=True)
+    return run
+
+
+if __name__ == "__main__":
+    benchmarks = {
+        'get': (bench_get, 20000),
+        'get_list': (bench_get_list, 20000),
+        'query': (bench_query, 200),
+        'set': (bench_set, 20000),
+        'input': (bench_input, 20),
+        'chip': (bench_chip, 200),
+        'merge': (bench_merge, 20),
+        'partial_merge': (bench_partial_merge, 20),
+        'write_json': (bench_write_json, 20)
+    }
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--benchmark', choices=[*benchmarks.keys(), 'all'], default='all')
+    parser.add_argument('--number', type=int, help='number of iterations of each benchmark')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'all':
+        to_run = benchmarks.keys()
+    else:
+        to_run = [args.benchmark]
+
+    chip = _get_chip()
+    for name in to_run:
+        func, number = benchmarks[name]
+        if args.number:
+            number = args.number
+
+        baseline = min(timeit.repeat(func(chip, True), number=number, repeat=3))
+        optimized = min(timeit.repeat(func(chip, False), number=number, repeat=3))
+
+        print(f'{name}: baseline {baseline * 1e6 / number:.2f} us, '
+              f'optimized {optimized * 1e6 / number:.2f} us, '
+              f'speedup {baseline / optimized:.2f}x')
@@ -30,6 +30,7 @@ from siliconcompiler import package as sc_package
 from siliconcompiler import sc_open
 import glob
 from siliconcompiler.scheduler import run as sc_runner
+from siliconcompiler.scheduler import toolversion
 from siliconcompiler.flowgraph import _get_flowgraph_nodes, _get_flowgraph_node_inputs, \
     _check_execution_nodes_inputs, _get_execution_entry_nodes, _unreachable_steps_to_execute, \
     _get_execution_exit_nodes, _nodes_to_execute, _get_pruned_node_inputs, \
@@ -87,6 +88,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # Cache of file hashes
         self.__hashes = {}
 
+        # Cache of check_manifest() results, see __get_check_cache()
+        self.__check_cache = {}
+
         # Controls whether find_files returns an abspath or relative to this
         # this is primarily used when generating standalone testcases
         self._relative_path = None
@@ -157,6 +161,41 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         task = self.get('flowgraph', flow, step, index, 'task')
         return tool, task
 
+    def _get_task_manifest_keypaths(self, step, index):
+        '''
+        Returns the keypaths written to the TCL manifest of a node, or None if
+        the whole manifest is written. Only tasks which list the keypaths their
+        scripts read in 'manifestkeys' get a scoped manifest.
+        '''
+        if step is None or index is None:
+            return None
+        if not self.get('option', 'scopedmanifest', step=step, index=index):
+            return None
+
+        flow = self.get('option', 'flow')
+        tool, task = self._get_tool_task(step, index, flow=flow)
+        if not self.get('tool', tool, 'task', task, 'manifestkeys', step=step, index=index,
+                        copy=False):
+            return None
+
+        keypaths = [
+            ['design'],
+            ['arg'],
+            ['option'],
+            ['flowgraph', flow, step, index]
+        ]
+        for key in self.getkeys('tool', tool):
+            if key != 'task':
+                keypaths.append(['tool', tool, key])
+        keypaths.append(['tool', tool, 'task', task])
+
+        for param in ('require', 'manifestkeys'):
+            for key in self.get('tool', tool, 'task', task, param, step=step, index=index,
+                                copy=False):
+                keypaths.append(key.split(','))
+
+        return keypaths
+
     def _get_task(self, step, index, flow=None):
         '''
         Helper function to get the name of the task associated with a given step/index.
@@ -557,7 +596,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
             elif isinstance(use_module, (Library, Chip)):
                 self._loaded_modules['libs'].append(use_module.design)
-                self._import_library(use_module.design, use_module.schema.cfg)
+                self._import_library(use_module.design,
+                                     Schema._copy_cfg(use_module.schema._search()))
 
             else:
                 module_name = module.__name__
@@ -602,15 +642,16 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         importname = module.design
 
-        src_cfg = self.schema.cfg[group]
+        src_cfg = self.schema._search(group, modify=True)
 
         if importname in src_cfg:
             self.logger.warning(f'Overwriting existing {group} {importname}')
             del src_cfg[importname]
 
         # Copy
-        src_cfg[importname] = module.getdict(group, importname)
-        self.__import_data_sources(module.schema.cfg)
+        src_cfg[importname] = Schema._copy_cfg(module.schema._search(group, importname))
+        self.schema._clear_index()
+        self.__import_data_sources(module.schema._search())
 
     ###########################################################################
     def help(self, *keypath):
@@ -697,7 +738,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         return self.schema.valid(*keypath, default_valid=default_valid)
 
     ###########################################################################
-    def get(self, *keypath, field='value', job=None, step=None, index=None):
+    def get(self, *keypath, field='value', job=None, step=None, index=None, copy=True):
         """
         Returns a schema parameter field.
 
@@ -718,6 +759,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 on a per-node basis.
             index (str): Index name to access for parameters that may be specified
                 on a per-node basis.
+            copy (bool): If False, list values are returned as a read-only
+                view rather than a copy, which avoids copying large lists of
+                files. The view is a sequence which compares equal to the list
+                and cannot be modified.
 
         Returns:
             Value found for the keypath and field provided.
@@ -725,6 +770,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Examples:
             >>> foundry = chip.get('pdk', 'foundry')
             Returns the name of the foundry from the PDK.
+            >>> for path in chip.get('input', 'rtl', 'verilog', copy=False):
+            ...     print(path)
+            Prints the Verilog sources without copying the list of sources.
 
         """
         self.logger.debug(f"Reading from {keypath}. Field = '{field}'")
@@ -743,7 +791,67 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                     )
                     return None
 
-            return self.schema.get(*keypath, field=field, job=job, step=step, index=index)
+            return self.schema.get(*keypath, field=field, job=job, step=step, index=index,
+                                   copy=copy)
+        except (ValueError, TypeError) as e:
+            self.error(str(e))
+            return None
+
+    ###########################################################################
+    def query(self, *keypath, field='value', nodes=None, job=None, copy=True):
+        """
+        Returns a schema parameter field of all the parameters matching a
+        keypath pattern.
+
+        The keypath is matched against the schema, where '*' matches any key
+        except 'default', and the field of every parameter found is returned
+        for all the nodes requested in a single pass over the schema. This is
+        equivalent to calling :meth:`get` for each parameter and node, but
+        avoids a lookup per call when collecting many values, such as the
+        metrics of a flow. Keys which are not found below a '*' are skipped.
+        Accessing a non-existent keypath produces a logger error message and
+        raises the Chip object error flag.
+
+        Args:
+            keypath(list str): Variable length schema key list, where '*'
+                matches any key.
+            field(str): Parameter field to fetch.
+            nodes (list of (str, str)): Step and index pairs to fetch the field
+                of. Parameters which may not be specified on a per-node basis
+                have the same value for all the nodes.
+            job (str): Jobname to use for dictionary access in place of the
+                current active jobname.
+            copy (bool): If False, list values are returned without being
+                copied, see :meth:`get`.
+
+        Returns:
+            Dictionary mapping the keypath of each parameter found to its
+            field, or, if nodes is provided, to a dictionary mapping each
+            (step, index) to the field of the parameter for that node.
+
+        Examples:
+            >>> metrics = chip.query('metric', '*', nodes=[('syn', '0'), ('place', '0')])
+            >>> metrics[('metric', 'cellarea')][('syn', '0')]
+            Returns the cell area reported by syn0, from the values of all the
+            metrics of syn0 and place0.
+        """
+        self.logger.debug(f"Querying {keypath}. Field = '{field}'")
+
+        try:
+            strict = self.schema.get('option', 'strict')
+            if field == 'value' and strict and nodes is None:
+                pernodes = self.schema.get_many(*keypath, field='pernode', job=job)
+                for param_keypath, pernode in pernodes.items():
+                    if pernode == 'optional':
+                        self.error(
+                            f"Invalid args to query() of keypath {param_keypath}: nodes "
+                            "are required for reading from this parameter "
+                            "while ['option', 'strict'] is True."
+                        )
+                        return None
+
+            return self.schema.get_many(*keypath, field=field, nodes=nodes, job=job,
+                                        copy=copy)
         except (ValueError, TypeError) as e:
             self.error(str(e))
             return None
@@ -974,10 +1082,17 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             {iotable}
 
         Args:
+            filename (str or list of str): File or files to add. A list of
+                files is added with one call to :meth:`add` per fileset and
+                filetype, which is much faster than adding the files one by
+                one for large filelists.
             fileset (str): File grouping
             filetype (str): File type
             iomap (dict of tuple(set, type)): File set and type mapping based on file extension
 
+        Examples:
+            >>> chip.input(['top.v', 'alu.v', 'top.sdc'])
+            Adds the Verilog sources and the SDC constraints.
         '''
 
         self._add_input_output('input', filename, fileset, filetype, iomap, package=package)
@@ -996,44 +1111,55 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
     ###########################################################################
     def _add_input_output(self, category, filename, fileset, filetype, iomap, package=None):
         '''
-        Adds file to input or output groups.
+        Adds files to input or output groups.
         Performs a lookup in the io map for the fileset and filetype
-        and will use those if they are not provided in the arguments
+        and will use those if they are not provided in the arguments.
+        The files of each fileset and filetype are added at once.
         '''
-        # Normalize value to string in case we receive a pathlib.Path
-        filename = str(filename)
-
-        ext = utils.get_file_ext(filename)
+        if isinstance(filename, (list, tuple)):
+            filenames = filename
+        else:
+            filenames = [filename]
 
-        default_fileset = None
-        default_filetype = None
         if not iomap:
             iomap = utils.get_default_iomap()
 
-        if ext in iomap:
-            default_fileset, default_filetype = iomap[ext]
+        groups = {}
+        for filename in filenames:
+            # Normalize value to string in case we receive a pathlib.Path
+            filename = str(filename)
 
-        if not fileset:
-            use_fileset = default_fileset
-        else:
-            use_fileset = fileset
+            ext = utils.get_file_ext(filename)
 
-        if not filetype:
-            use_filetype = default_filetype
-        else:
-            use_filetype = filetype
+            default_fileset = None
+            default_filetype = None
+            if ext in iomap:
+                default_fileset, default_filetype = iomap[ext]
+
+            if not fileset:
+                use_fileset = default_fileset
+            else:
+                use_fileset = fileset
+
+            if not filetype:
+                use_filetype = default_filetype
+            else:
+                use_filetype = filetype
+
+            if not use_fileset or not use_filetype:
+                self.logger.error(f'Unable to infer {category} fileset and/or filetype for '
+                                  f'{filename} based on file extension.')
+            elif not fileset and not filetype:
+                self.logger.info(f'{filename} inferred as {use_fileset}/{use_filetype}')
+            elif not filetype:
+                self.logger.info(f'{filename} inferred as filetype {use_filetype}')
+            elif not fileset:
+                self.logger.info(f'{filename} inferred as fileset {use_fileset}')
 
-        if not use_fileset or not use_filetype:
-            self.logger.error(f'Unable to infer {category} fileset and/or filetype for '
-                              f'{filename} based on file extension.')
-        elif not fileset and not filetype:
-            self.logger.info(f'{filename} inferred as {use_fileset}/{use_filetype}')
-        elif not filetype:
-            self.logger.info(f'{filename} inferred as filetype {use_filetype}')
-        elif not fileset:
-            self.logger.info(f'{filename} inferred as fileset {use_fileset}')
+            groups.setdefault((use_fileset, use_filetype), []).append(filename)
 
-        self.add(category, use_fileset, use_filetype, filename, package=package)
+        for (use_fileset, use_filetype), group in groups.items():
+            self.add(category, use_fileset, use_filetype, group, package=package)
 
     ###########################################################################
     def _find_sc_file(self, filename, missing_ok=False, search_paths=None):
@@ -1174,9 +1300,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         is_list = bool(re.match(r'\[', paramtype))
 
-        paths = self.schema.get(*keypath, job=job, step=step, index=index)
+        # Neither list is modified, so they are not copied
+        paths = self.schema.get(*keypath, job=job, step=step, index=index, copy=False)
         dependencies = self.schema.get(*keypath, job=job,
-                                       step=step, index=index, field='package')
+                                       step=step, index=index, field='package', copy=False)
         # Convert to list if we have scalar
         if not is_list:
             # Dependencies are always specified as list with default []
@@ -1353,8 +1480,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         return schema
 
     ###########################################################################
-    def _key_may_be_updated(self, keypath):
-        '''Helper that returns whether `keypath` can be updated mid-run.'''
+    def _key_may_be_updated(self, keypath, sctype=None):
+        '''Helper that returns whether `keypath` can be updated mid-run.
+
+        The type of the parameter is looked up if `sctype` is not provided.'''
         # TODO: cleaner way to manage this?
         if keypath[0] in ('metric', 'record'):
             return True
@@ -1362,12 +1491,15 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             return True
         if keypath[0] == 'tool':
             return True
-        if self.get(*keypath, field='type') in ['file', '[file]']:
+        if sctype is None:
+            sctype = self.get(*keypath, field='type')
+        if sctype in ['file', '[file]']:
             return True
         return False
 
     ###########################################################################
-    def _merge_manifest(self, src, job=None, clobber=True, clear=True, check=False, partial=False):
+    def _merge_manifest(self, src, job=None, clobber=True, clear=True, check=False, partial=False,
+                        trusted=False):
         """
         Merges a given manifest with the current compilation manifest.
 
@@ -1383,12 +1515,32 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             check (bool): If True, checks the validity of each key
             partial (bool): If True, perform a partial merge, only merging
                 keypaths that may have been updated during run().
+            trusted (bool): If True, the values in src are merged without
+                being checked and normalized again, which is only valid if
+                src was written with the same schema version.
         """
         if job is not None:
             dest = self.schema.history(job)
         else:
             dest = self.schema
 
+        if trusted:
+            def merge_key(keylist, key_cfg):
+                if partial and not self._key_may_be_updated(keylist, sctype=key_cfg['type']):
+                    return False
+                if check and not dest.valid(*keylist, default_valid=True):
+                    self.logger.warning(f'Keypath {keylist} is not valid')
+                    return False
+                return True
+
+            dest._merge_params(src,
+                               clobber=clobber,
+                               clear=clear,
+                               skip_fields=('switch', 'type', 'require',
+                                            'shorthelp', 'example', 'help'),
+                               keypath_filter=merge_key)
+            return
+
         for keylist in src.allkeys():
             if keylist[0] in ('history', 'library'):
                 continue
@@ -1497,32 +1649,134 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 self.logger.error(f'Required input {filename} not received for {step}{index}.')
                 error = True
 
+        cache = self.__get_check_cache()
         all_required = self.get('tool', tool, 'task', task, 'require', step=step, index=index)
         for item in all_required:
             keypath = item.split(',')
             if not self.valid(*keypath):
                 self.logger.error(f'Cannot resolve required keypath {keypath}.')
                 error = True
-            else:
-                paramtype = self.get(*keypath, field='type')
-                if ('file' in paramtype) or ('dir' in paramtype):
-                    for val, step, index in self.schema._getvals(*keypath):
-                        abspath = self._find_files(*keypath,
-                                                   missing_ok=True,
-                                                   step=step, index=index)
-                        unresolved_paths = val
-                        if not isinstance(abspath, list):
-                            abspath = [abspath]
-                            unresolved_paths = [unresolved_paths]
-                        for i, path in enumerate(abspath):
-                            if path is None:
-                                unresolved_path = unresolved_paths[i]
-                                self.logger.error(f'Cannot resolve path {unresolved_path} in '
-                                                  f'required file keypath {keypath}.')
-                                error = True
+            elif not self.__check_required_files(tuple(keypath), cache['files']):
+                error = True
 
         return not error
 
+    def __check_required_files(self, keypath, resolved, report=True):
+        '''
+        Checks that the paths of a required parameter resolve, if it is a
+        file or dir parameter.
+
+        Args:
+            keypath (tuple of str): keypath of the parameter.
+            resolved (dict): (keypath, step, index) -> absolute paths the
+                values resolved to. These paths are only checked to still
+                exist rather than being searched for again. The values found
+                to resolve are added to it, except under 'tool', where paths
+                may be relative to the node directories.
+            report (bool): if False, unresolved paths are not reported, and
+                paths from packages which were not fetched yet are skipped.
+
+        Returns:
+            True if all the paths resolve.
+        '''
+        paramtype = self.get(*keypath, field='type')
+        if 'file' not in paramtype and 'dir' not in paramtype:
+            return True
+
+        ok = True
+        for val, step, index in self.schema._getvals(*keypath):
+            paths = resolved.get((keypath, step, index))
+            if paths is not None and all(os.path.exists(path) for path in paths):
+                continue
+
+            if not report:
+                packages = self.schema.get(*keypath, field='package',
+                                           step=step, index=index, copy=False)
+                if any(package and package not in self._packages for package in packages):
+                    continue
+
+            abspath = self._find_files(*keypath,
+                                       missing_ok=True,
+                                       step=step, index=index,
+                                       abs_path_only=True)
+            unresolved_paths = val
+            if not isinstance(abspath, list):
+                abspath = [abspath]
+                unresolved_paths = [unresolved_paths]
+
+            val_ok = True
+            for i, path in enumerate(abspath):
+                if path is None:
+                    val_ok = False
+                    if report:
+                        unresolved_path = unresolved_paths[i]
+                        self.logger.error(f'Cannot resolve path {unresolved_path} in '
+                                          f'required file keypath {list(keypath)}.')
+
+            if val_ok and keypath[0] != 'tool':
+                resolved[(keypath, step, index)] = abspath
+            else:
+                resolved.pop((keypath, step, index), None)
+            ok = ok and val_ok
+
+        return ok
+
+    def __get_check_cache(self):
+        '''
+        Returns the cached results of the checks of check_manifest(), after
+        dropping the results for the parameters changed since the last check.
+
+        The cache holds:
+
+        * required: keypath -> (require field, True if the parameter is empty),
+          for the parameters with a require field.
+        * files: (keypath, step, index) -> absolute paths, for the values of
+          required file parameters which resolved, see __check_required_files().
+        '''
+        changes = self.schema._pop_changes()
+        cache = self.__check_cache
+        if cache.get('schema') is not self.schema:
+            # The schema was replaced
+            changes = None
+
+        def is_changed(keypath):
+            # Changes hold the keypaths of parameters or of their parents
+            return any(keypath[:n] in changes for n in range(len(keypath) + 1))
+
+        if changes is None:
+            cache.clear()
+            cache['schema'] = self.schema
+            cache['required'] = {}
+            cache['files'] = {}
+            keypaths = self.schema.allkeys()
+        else:
+            # Parameters changing where files are found, see _find_files()
+            search_keypaths = (('design',),
+                               ('option', 'builddir'),
+                               ('option', 'jobname'),
+                               ('package',))
+            if any(is_changed(keypath) or
+                   any(change[:len(keypath)] == keypath for change in changes)
+                   for keypath in search_keypaths):
+                cache['files'].clear()
+            else:
+                cache['files'] = {entry: paths for entry, paths in cache['files'].items()
+                                  if not is_changed(entry[0])}
+
+            for keypath in [keypath for keypath in cache['required'] if is_changed(keypath)]:
+                del cache['required'][keypath]
+            keypaths = self.schema._allkeys_under(
+                [change for change in changes if change[:1] not in (('history',), ('library',))])
+
+        for keypath in keypaths:
+            if 'default' in keypath or 'history' in keypath or 'library' in keypath:
+                continue
+            requirement = self.get(*keypath, field='require')
+            if requirement:
+                cache['required'][keypath] = (requirement, self.schema._is_empty(*keypath))
+
+        return cache
+
     ###########################################################################
     def check_manifest(self):
         '''
@@ -1539,6 +1793,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         * Are all flowgraph input names legal step/index pairs?
         * Are the tool parameter setting requirements met?
 
+        The results for the parameters which did not change since the previous
+        check are reused.
+
         Returns:
             Returns True if the manifest is valid, else returns False.
 
@@ -1614,18 +1871,16 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 self.logger.error(f"Target library {library} not found.")
 
         # 3. Check requirements list
-        allkeys = self.allkeys()
-        for key in allkeys:
+        cache = self.__get_check_cache()
+        mode = self.get('option', 'mode')
+        for key, (requirement, key_empty) in cache['required'].items():
             keypath = ",".join(key)
-            if 'default' not in key and 'history' not in key and 'library' not in key:
-                key_empty = self.schema._is_empty(*key)
-                requirement = self.get(*key, field='require')
-                if key_empty and (str(requirement) == 'all'):
-                    error = True
-                    self.logger.error(f"Global requirement missing for [{keypath}].")
-                elif key_empty and (str(requirement) == self.get('option', 'mode')):
-                    error = True
-                    self.logger.error(f"Mode requirement missing for [{keypath}].")
+            if key_empty and (str(requirement) == 'all'):
+                error = True
+                self.logger.error(f"Global requirement missing for [{keypath}].")
+            elif key_empty and (str(requirement) == mode):
+                error = True
+                self.logger.error(f"Mode requirement missing for [{keypath}].")
 
         # 4. Check if tool/task modules exists
         for (step, index) in nodes_to_execute:
@@ -1668,6 +1923,11 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                     if self.schema._is_empty(*keypath):
                         error = True
                         self.logger.error(f"Value empty for {keypath} for {tool}.")
+                    elif self.valid(*keypath):
+                        # Resolve the files ahead of time for the dynamic
+                        # check of the node, see _check_manifest_dynamic()
+                        self.__check_required_files(tuple(keypath), cache['files'],
+                                                    report=False)
 
             task_run = getattr(task_module, 'run', None)
             if self.schema._is_empty('tool', tool, 'exe') and not task_run:
@@ -1799,8 +2059,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                         continue
 
                     design = self.get('design')
-                    manifest = f'{design}.pkg.json'
-                    inputs = [inp for inp in os.listdir(in_step_out_dir) if inp != manifest]
+                    manifests = (f'{design}.pkg.json', f'{design}.pkg.delta.json')
+                    inputs = [inp for inp in os.listdir(in_step_out_dir) if inp not in manifests]
                 else:
                     inputs = self._gather_outputs(in_step, in_index)
 
@@ -1828,7 +2088,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Reads a manifest from disk and merges it with the current compilation manifest.
 
         The file format read is determined by the filename suffix. Currently
-        json (*.json) and yaml(*.yaml) formats are supported.
+        json (*.json), yaml (*.yaml) and binary (*.scb) formats are supported.
 
         Args:
             filename (filepath): Path to a manifest file to be loaded.
@@ -1853,22 +2113,29 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # Read from file into new schema object
         schema = Schema(manifest=filename, logger=self.logger)
 
+        # Manifests written with the same schema version hold normalized values
+        trusted = schema.get('schemaversion') == self.get('schemaversion')
+
         # Merge data in schema with Chip configuration
-        self._merge_manifest(schema, job=job, clear=clear, clobber=clobber, partial=partial)
+        self._merge_manifest(schema, job=job, clear=clear, clobber=clobber, partial=partial,
+                             trusted=trusted)
 
-        # Read history, if we're not already reading into a job
-        if 'history' in schema.cfg and not partial and not job:
-            for historic_job in schema.cfg['history'].keys():
+        # Read history, if we're not already reading into a job.
+        # The sections of binary manifests are only decoded if they are read.
+        if not partial and not job and schema._has_section('history'):
+            for historic_job in schema.getkeys('history'):
                 self._merge_manifest(schema.history(historic_job),
                                      job=historic_job,
                                      clear=clear,
                                      clobber=clobber,
-                                     partial=False)
+                                     partial=False,
+                                     trusted=trusted)
 
         # TODO: better way to handle this?
-        if 'library' in schema.cfg and not partial:
-            for libname in schema.cfg['library'].keys():
-                self._import_library(libname, schema.cfg['library'][libname],
+        if not partial and schema._has_section('library'):
+            libraries = schema._search('library')
+            for libname in libraries.keys():
+                self._import_library(libname, libraries[libname],
                                      job=job,
                                      clobber=clobber)
 
@@ -1878,8 +2145,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Writes the compilation manifest to a file.
 
         The write file format is determined by the filename suffix. Currently
-        json (*.json), yaml (*.yaml), tcl (*.tcl), and (*.csv) formats are
-        supported.
+        json (*.json), yaml (*.yaml), tcl (*.tcl), (*.csv) and binary (*.scb)
+        formats are supported. Binary manifests are read faster, since only
+        the parts of the manifest which are accessed are decoded.
 
         Args:
             filename (filepath): Output filepath
@@ -1902,8 +2170,11 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # resolve absolute paths
         if abspath:
             schema = self._abspath()
-        else:
+        elif prune:
             schema = self.schema.copy()
+        else:
+            # Writing does not modify the schema
+            schema = self.schema
 
         if prune:
             self.logger.debug('Pruning dictionary before writing file %s', filepath)
@@ -1911,6 +2182,11 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         is_csv = re.search(r'(\.csv)(\.gz)*$', filepath)
 
+        if re.search(r'\.scb$', filepath):
+            with open(filepath, 'wb') as fout:
+                schema.write_binary(fout)
+            return
+
         # format specific dumping
         if filepath.endswith('.gz'):
             fout = gzip.open(filepath, 'wt', encoding='UTF-8')
@@ -1935,7 +2211,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                                  prefix="dict set sc_cfg",
                                  step=step,
                                  index=index,
-                                 template=utils.get_file_template('tcl/manifest.tcl.j2'))
+                                 template=utils.get_file_template('tcl/manifest.tcl.j2'),
+                                 keypaths=self._get_task_manifest_keypaths(step, index))
             elif is_csv:
                 schema.write_csv(fout)
             else:
@@ -2062,10 +2339,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
     def _import_library(self, libname, libcfg, job=None, clobber=True):
         '''Helper to import library with config 'libconfig' as a library
         'libname' in current Chip object.'''
-        if job:
-            cfg = self.schema.cfg['history'][job]['library']
-        else:
-            cfg = self.schema.cfg['library']
+        cfg = self.schema._search('library', job=job, modify=True)
 
         if 'library' in libcfg:
             for sublib_name, sublibcfg in libcfg['library'].items():
@@ -2083,6 +2357,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if 'pdk' in cfg[libname]:
             del cfg[libname]['pdk']
 
+        self.schema._clear_index()
+
     ###########################################################################
     def write_flowgraph(self, filename, flow=None,
                         fillcolor='#ffffff', fontcolor='#000000',
@@ -2446,7 +2722,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         if check:
             # compare previous hash to new hash
-            oldhash = self.schema.get(*keypath, step=step, index=index, field='filehash')
+            oldhash = self.schema.get(*keypath, step=step, index=index, field='filehash',
+                                      copy=False)
             check_failed = False
             for i, item in enumerate(oldhash):
                 if item != hashlist[i]:
@@ -3381,7 +3658,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             # Prepend 'path' schema var to system path
             syspath = self._resolve_env_vars(path) + os.pathsep + syspath
 
-        fullexe = shutil.which(exe, path=syspath)
+        fullexe = toolversion.find_exe(exe, syspath)
 
         return fullexe
 
@@ -5,8 +5,9 @@ from siliconcompiler.schema import Schema
 
 
 def _check_execution_nodes_inputs(chip, flow):
+    entry_nodes = _get_execution_entry_nodes(chip, flow)
     for node in chip.nodes_to_execute(flow):
-        if node in _get_execution_entry_nodes(chip, flow):
+        if node in entry_nodes:
             continue
         pruned_node_inputs = set(_get_pruned_node_inputs(chip, flow, node))
         node_inputs = set(_get_flowgraph_node_inputs(chip, flow, node))
@@ -25,34 +26,47 @@ def _nodes_to_execute(chip, flow, from_nodes, to_nodes, prune_nodes):
     '''
     Assumes a flowgraph with valid edges for the inputs
     '''
+    node_outputs = _get_flowgraph_outputs(chip, flow)
+
     nodes_to_execute = []
+    # Records whether a node leads to any of the to_nodes, so each node is only
+    # explored once instead of once per path through the flowgraph.
+    reaches_to_nodes = {}
     for from_node in from_nodes:
-        for node in _nodes_to_execute_recursive(chip, flow, from_node, to_nodes, prune_nodes):
-            if node not in nodes_to_execute:
-                nodes_to_execute.append(node)
+        _nodes_to_execute_recursive(from_node, to_nodes, prune_nodes, node_outputs,
+                                    nodes_to_execute, reaches_to_nodes)
     return nodes_to_execute
 
 
-def _nodes_to_execute_recursive(chip, flow, from_node, to_nodes, prune_nodes, path=[]):
-    path = path.copy()
-    nodes_to_execute = []
-
+def _nodes_to_execute_recursive(from_node, to_nodes, prune_nodes, node_outputs,
+                                nodes_to_execute, reaches_to_nodes, path=[]):
     if from_node in prune_nodes:
-        return []
+        return False
     if from_node in path:
         raise SiliconCompilerError(f'Path {path} would form a circle with {from_node}')
-    path.append(from_node)
+    path = [*path, from_node]
 
-    if from_node in to_nodes:
+    def add_path():
         for node in path:
-            nodes_to_execute.append(node)
-    for output_node in _get_flowgraph_node_outputs(chip, flow, from_node):
-        for node in _nodes_to_execute_recursive(chip, flow, output_node, to_nodes,
-                                                prune_nodes, path=path):
             if node not in nodes_to_execute:
                 nodes_to_execute.append(node)
 
-    return nodes_to_execute
+    if from_node in reaches_to_nodes:
+        # Already explored, only the nodes leading here can be new
+        if reaches_to_nodes[from_node]:
+            add_path()
+        return reaches_to_nodes[from_node]
+
+    reaches = from_node in to_nodes
+    if reaches:
+        add_path()
+    for output_node in node_outputs.get(from_node, []):
+        if _nodes_to_execute_recursive(output_node, to_nodes, prune_nodes, node_outputs,
+                                       nodes_to_execute, reaches_to_nodes, path=path):
+            reaches = True
+
+    reaches_to_nodes[from_node] = reaches
+    return reaches
 
 
 def _unreachable_steps_to_execute(chip, flow, cond=lambda _: True):
@@ -70,6 +84,7 @@ def _unreachable_steps_to_execute(chip, flow, cond=lambda _: True):
 
 
 def _reachable_flowgraph_nodes(chip, flow, from_nodes, cond=lambda _: True, prune_nodes=[]):
+    node_outputs = _get_flowgraph_outputs(chip, flow)
     visited_nodes = set()
     current_nodes = from_nodes.copy()
     while current_nodes:
@@ -81,8 +96,7 @@ def _reachable_flowgraph_nodes(chip, flow, from_nodes, cond=lambda _: True, prun
             if cond(current_node):
                 visited_nodes.add(current_node)
                 current_nodes.remove(current_node)
-                outputs = _get_flowgraph_node_outputs(chip, flow, current_node)
-                current_nodes.update(outputs)
+                current_nodes.update(node_outputs.get(current_node, []))
         if current_nodes == current_nodes_copy:
             break
     return visited_nodes
@@ -118,6 +132,21 @@ def _get_flowgraph_node_outputs(chip, flow, node):
     return node_outputs
 
 
+def _get_flowgraph_outputs(chip, flow):
+    '''
+    Returns a map from each node to its output nodes, in the same order as
+    _get_flowgraph_node_outputs(), without having to scan the flowgraph per node.
+    '''
+    node_outputs = {}
+    for node in _get_flowgraph_nodes(chip, flow):
+        node_outputs.setdefault(node, [])
+        for in_node in _get_flowgraph_node_inputs(chip, flow, node):
+            outputs = node_outputs.setdefault(in_node, [])
+            if node not in outputs:
+                outputs.append(node)
+    return node_outputs
+
+
 def _get_flowgraph_nodes(chip, flow, steps=None, indices=None):
     nodes = []
     for step in chip.getkeys('flowgraph', flow):
@@ -143,7 +172,7 @@ def gather_resume_failed_nodes(chip, flow, nodes_to_execute):
             failed_nodes.append((step, index))
         elif os.path.isfile(cfg):
             try:
-                node_status = Schema(manifest=cfg).get('flowgraph', flow, step, index, 'status')
+                node_status = _read_node_status(chip, flow, step, index)
                 if node_status != NodeStatus.SUCCESS:
                     failed_nodes.append((step, index))
             except:  # noqa E722
@@ -268,3 +297,40 @@ def get_nodes_from(chip, flow, nodes):
                              set(nodes),
                              set(to_nodes),
                              set(chip.get('option', 'prune')))
+
+
+def _get_node_delta_manifest(chip, step, index):
+    '''
+    Returns the path to the delta manifest written by a node, or None if the
+    node did not write one along with its latest output manifest.
+    '''
+    outputs = os.path.join(chip._getworkdir(step=step, index=index), 'outputs')
+    cfg = os.path.join(outputs, f'{chip.design}.pkg.json')
+    delta = os.path.join(outputs, f'{chip.design}.pkg.delta.json')
+
+    if not os.path.isfile(delta) or not os.path.isfile(cfg):
+        return None
+    # The delta is written right after the full manifest
+    if os.path.getmtime(delta) < os.path.getmtime(cfg):
+        return None
+    return delta
+
+
+def _read_node_status(chip, flow, step, index):
+    '''
+    Returns the status recorded in the output manifest of a node.
+
+    The delta manifest of the node is read instead of the full manifest when
+    it records the status, since it is much smaller.
+    '''
+    keypath = ('flowgraph', flow, step, index, 'status')
+
+    delta = _get_node_delta_manifest(chip, step, index)
+    if delta:
+        schema = Schema(manifest=delta)
+        if schema.valid(*keypath):
+            return schema.get(*keypath)
+
+    cfg = os.path.join(chip._getworkdir(step=step, index=index), 'outputs',
+                       f'{chip.design}.pkg.json')
+    return Schema(manifest=cfg).get(*keypath)
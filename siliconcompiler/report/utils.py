@@ -13,8 +13,13 @@ def _find_summary_image(chip, ext='png'):
 
 
 def _find_summary_metrics(chip, metrics_map):
+    execution_order = _get_flowgraph_execution_order(chip, chip.get('option', 'flow'))
+    # query() returns None on errors, which leaves the metrics unset
+    values = chip.query('metric', '*',
+                        nodes=[node for nodes in execution_order for node in nodes]) or {}
+
     metrics = {}
-    for nodes in reversed(_get_flowgraph_execution_order(chip, chip.get('option', 'flow'))):
+    for nodes in reversed(execution_order):
         for step, index in nodes:
             for name, metric_info in metrics_map.items():
                 if name in metrics:
@@ -22,7 +27,7 @@ def _find_summary_metrics(chip, metrics_map):
 
                 metric, formatter = metric_info
 
-                data = chip.get('metric', metric, step=step, index=index)
+                data = values.get(('metric', metric), {}).get((step, index))
                 if data is not None:
                     unit = None
                     if chip.schema._has_field('metric', metric, 'unit'):
@@ -59,14 +64,37 @@ def _collect_data(chip, flow=None, flowgraph_nodes=None, format_as_string=True):
         metrics[step, index] = {}
         reports[step, index] = {}
 
+    # Fetch the values of the metrics, weights and status of all the nodes at once.
+    # query() returns None on errors, which leaves the values unset.
+    metric_values = chip.query('metric', '*', nodes=nodes) or {}
+    weights = chip.query('flowgraph', flow, '*', '*', 'weight', '*') or {}
+    statuses = chip.query('flowgraph', flow, '*', '*', 'status') or {}
+
+    # Reports are fetched per task, since each task has its own report parameters
+    task_nodes = {}
+    for step, index in nodes:
+        task_nodes.setdefault(chip._get_tool_task(step, index, flow=flow), []).append(
+            (step, index))
+    task_reports = {}
+    for (tool, task), tool_nodes in task_nodes.items():
+        rpts = chip.query('tool', tool, 'task', task, 'report', '*', nodes=tool_nodes) or {}
+        for (*_, metric), node_rpts in rpts.items():
+            for node, node_rpt in node_rpts.items():
+                task_reports[node, metric] = node_rpt
+
+    for step, index in nodes:
+        errors[step, index] = statuses.get(('flowgraph', flow, step, index, 'status')) == \
+            NodeStatus.ERROR
+
     # Gather data and determine which metrics to show
     # We show a metric if:
     # - it is not in ['option', 'metricoff'] -AND-
     # - at least one step in the steps has a non-zero weight for the metric -OR -
     #   at least one step in the steps set a value for it
     metrics_to_show = []
+    metricoff = chip.get('option', 'metricoff')
     for metric in chip.getkeys('metric'):
-        if metric in chip.get('option', 'metricoff'):
+        if metric in metricoff:
             continue
 
         # Get the unit associated with the metric
@@ -77,27 +105,18 @@ def _collect_data(chip, flow=None, flowgraph_nodes=None, format_as_string=True):
 
         show_metric = False
         for step, index in nodes:
-            if metric in chip.getkeys('flowgraph', flow,
-                                      step, index, 'weight') and \
-               chip.get('flowgraph', flow, step, index, 'weight', metric):
+            if weights.get(('flowgraph', flow, step, index, 'weight', metric)):
                 show_metric = True
 
-            value = chip.get('metric', metric, step=step, index=index)
+            value = metric_values.get(('metric', metric), {}).get((step, index))
             if value is not None:
                 show_metric = True
-            tool, task = chip._get_tool_task(step, index, flow=flow)
-            rpts = chip.get('tool', tool, 'task', task, 'report', metric,
-                            step=step, index=index)
-
-            errors[step, index] = chip.get('flowgraph', flow,
-                                           step, index, 'status') == \
-                NodeStatus.ERROR
 
             if value is not None:
                 value = _format_value(metric, value, metric_unit, metric_type, format_as_string)
 
             metrics[step, index][metric] = value
-            reports[step, index][metric] = rpts
+            reports[step, index][metric] = task_reports.get(((step, index), metric), [])
 
         if show_metric:
             metrics_to_show.append(metric)
@@ -107,11 +126,12 @@ def _collect_data(chip, flow=None, flowgraph_nodes=None, format_as_string=True):
 
 
 def _format_value(metric, value, metric_unit, metric_type, format_as_string):
-    if metric == 'memory':
+    if metric in ['memory', 'bytesread', 'byteswritten']:
         if format_as_string:
             return units.format_binary(value, metric_unit)
         value, metric = units.scale_binary(value, metric_unit)
-    elif metric in ['exetime', 'tasktime']:
+    elif metric in ['exetime', 'tasktime', 'mergetime', 'hashtime', 'copytime',
+                    'checktime', 'manifesttime', 'logtime']:
         if format_as_string:
             return units.format_time(value)
     elif metric_type == 'int':
@@ -3,6 +3,7 @@ import distro
 import getpass
 import netifaces
 import multiprocessing
+import multiprocessing.connection
 import os
 import platform
 import psutil
@@ -23,15 +24,38 @@ from siliconcompiler import _metadata
 from siliconcompiler.remote import client
 from siliconcompiler.schema import Schema
 from siliconcompiler.scheduler import slurm
+from siliconcompiler.scheduler import streams
+from siliconcompiler.scheduler import taskcache
+from siliconcompiler.scheduler import timeline
+from siliconcompiler.scheduler import toolversion
 from siliconcompiler import NodeStatus, SiliconCompilerError
 from siliconcompiler.flowgraph import _get_flowgraph_nodes, _get_flowgraph_execution_order, \
     _get_pruned_node_inputs, _get_flowgraph_node_inputs, _get_flowgraph_entry_nodes, \
     _unreachable_steps_to_execute, _get_execution_exit_nodes, _nodes_to_execute, \
-    get_nodes_from
+    get_nodes_from, _get_node_delta_manifest, _read_node_status
 from siliconcompiler.tools._common import input_file_node_name
 import lambdapdk
 
 
+# SiliconCompiler bookkeeping phases of a node recorded as metrics, mapped to
+# the timeline spans they total
+_OVERHEAD_METRICS = {
+    'mergetime': ('_merge_input_dependencies_manifests',),
+    'hashtime': ('_hash_files',),
+    'copytime': ('_copy_previous_steps_output_data',),
+    'checktime': ('check_manifest',),
+    'manifesttime': ('write_manifest', '_write_task_manifest'),
+    'logtime': ('_check_logfile',)
+}
+
+# Timeline marker and I/O counters at the start of the node run in this process
+_node_overhead_start = None
+
+# Copy of the schema at the start of the node run in this process, which the
+# delta manifest of the node is relative to
+_node_base_schema = None
+
+
 ###############################################################################
 class SiliconCompilerTimeout(Exception):
     ''' Minimal Exception wrapper used to raise sc timeout errors.
@@ -74,13 +98,20 @@ def run(chip):
         os.environ[envvar] = val
 
     status = {}
-    if chip.get('option', 'remote'):
-        client.remote_process(chip)
-    else:
-        _local_process(chip, flow, status)
+    timeline.clear()
+    try:
+        if chip.get('option', 'remote'):
+            client.remote_process(chip)
+        else:
+            _local_process(chip, flow, status)
 
-    # Merge cfgs from last executed tasks, and write out a final manifest.
-    _finalize_run(chip, set(_get_execution_exit_nodes(chip, flow)), environment, status)
+        # Merge cfgs from last executed tasks, and write out a final manifest.
+        with timeline.span('_finalize_run'):
+            _finalize_run(chip, set(_get_execution_exit_nodes(chip, flow)), environment, status)
+    finally:
+        if chip.get('option', 'timeline'):
+            timeline.write(chip, chip.nodes_to_execute(flow),
+                           os.path.join(chip._getworkdir(), f"{chip.design}.timeline.json"))
 
 
 ###########################################################################
@@ -123,11 +154,11 @@ def _finalize_run(chip, to_nodes, environment, status={}):
             if status:
                 stat_success = (status[(step, index)] == NodeStatus.SUCCESS)
             elif os.path.isfile(lastcfg):
-                schema = Schema(manifest=lastcfg)
-                if schema.get('flowgraph', flow, step, index, 'status') == NodeStatus.SUCCESS:
+                if _read_node_status(chip, flow, step, index) == NodeStatus.SUCCESS:
                     stat_success = True
         if os.path.isfile(lastcfg):
-            chip._read_manifest(lastcfg, clobber=False, partial=True)
+            chip._read_manifest(_get_node_delta_manifest(chip, step, index) or lastcfg,
+                                clobber=False, partial=True)
 
         if stat_success:
             # (Status doesn't get propagated w/ "clobber=False")
@@ -216,7 +247,8 @@ def _local_process(chip, flow, status):
     for layer_nodes in _get_flowgraph_execution_order(chip, flow):
         for step, index in layer_nodes:
             if (step, index) in nodes_to_execute:
-                _setup_node(chip, step, index)
+                with timeline.span('_setup_node', node=(step, index)):
+                    _setup_node(chip, step, index)
 
     def mark_pending(step, index):
         for next_step, next_index in get_nodes_from(chip, flow, [(step, index)]):
@@ -242,7 +274,8 @@ def _local_process(chip, flow, status):
     chip.logger.info("Checking manifest before running.")
     check_ok = True
     if not chip.get('option', 'skipcheck'):
-        check_ok = chip.check_manifest()
+        with timeline.span('check_manifest'):
+            check_ok = chip.check_manifest()
 
     # Check if there were errors before proceeding with run
     if not check_ok:
@@ -394,6 +427,9 @@ def _runtask(chip, flow, step, index, status, exec_func, replay=False):
 
     chip._init_logger(step, index, in_run=True)
 
+    global _node_base_schema
+    _node_base_schema = chip.schema.copy()
+
     # Make record of sc version and machine
     __record_version(chip, step, index)
     # Record user information if enabled
@@ -404,6 +440,9 @@ def _runtask(chip, flow, step, index, status, exec_func, replay=False):
     wall_start = time.time()
     __record_time(chip, step, index, wall_start, 'start')
 
+    global _node_overhead_start
+    _node_overhead_start = (timeline.mark(), _get_io_counters())
+
     workdir = _setup_workdir(chip, step, index, replay)
     cwd = os.getcwd()
     os.chdir(workdir)
@@ -411,12 +450,17 @@ def _runtask(chip, flow, step, index, status, exec_func, replay=False):
     chip._add_file_logger(os.path.join(workdir, f'sc_{step}{index}.log'))
 
     try:
-        _setupnode(chip, flow, step, index, status, replay)
+        with timeline.span('_setupnode'):
+            _setupnode(chip, flow, step, index, status, replay)
 
         exec_func(chip, step, index, replay)
     except Exception as e:
         print_traceback(chip, e)
         _haltstep(chip, chip.get('option', 'flow'), step, index)
+    finally:
+        # Also reached when the node is halted
+        if chip.get('option', 'timeline'):
+            timeline.write_node(chip, step, index)
 
     # return to original directory
     os.chdir(cwd)
@@ -427,26 +471,48 @@ def _haltstep(chip, flow, step, index, log=True):
     if log:
         chip.logger.error(f"Halting step '{step}' index '{index}' due to errors.")
     chip.set('flowgraph', flow, step, index, 'status', NodeStatus.ERROR)
-    chip.write_manifest(os.path.join("outputs", f"{chip.get('design')}.pkg.json"))
+    _write_output_manifests(chip)
     sys.exit(1)
 
 
+def _write_output_manifests(chip):
+    '''
+    Writes the output manifest of the node, along with its delta manifest
+    holding only the parameters changed since the node run started.
+    Merging the delta manifest is equivalent to partially merging the full
+    manifest into a chip configured like the node before it ran.
+    '''
+    design = chip.get('design')
+    chip.write_manifest(os.path.join("outputs", f"{design}.pkg.json"))
+
+    if _node_base_schema is not None:
+        # The delta manifest is only read by the scheduler
+        with open(os.path.join("outputs", f"{design}.pkg.delta.json"), 'w') as f:
+            chip.schema._get_delta(_node_base_schema).write_json(f, compact=True)
+
+
 def _setupnode(chip, flow, step, index, status, replay):
-    _merge_input_dependencies_manifests(chip, step, index, status, replay)
+    with timeline.span('_merge_input_dependencies_manifests'):
+        _merge_input_dependencies_manifests(chip, step, index, status, replay)
 
-    _hash_files(chip, step, index, setup=True)
+    with timeline.span('_hash_files'):
+        _hash_files(chip, step, index, setup=True)
 
     # Write manifest prior to step running into inputs
     chip.set('arg', 'step', step, clobber=True)
     chip.set('arg', 'index', index, clobber=True)
-    chip.write_manifest(f'inputs/{chip.get("design")}.pkg.json')
+    with timeline.span('write_manifest'):
+        chip.write_manifest(f'inputs/{chip.get("design")}.pkg.json')
 
     _select_inputs(chip, step, index)
-    _copy_previous_steps_output_data(chip, step, index, replay)
+    with timeline.span('_copy_previous_steps_output_data'):
+        _copy_previous_steps_output_data(chip, step, index, replay)
 
     # Check manifest
     if not chip.get('option', 'skipcheck'):
-        if not chip.check_manifest():
+        with timeline.span('check_manifest'):
+            check_ok = chip.check_manifest()
+        if not check_ok:
             chip.logger.error("Fatal error in check_manifest()! See previous errors.")
             _haltstep(chip, flow, step, index)
 
@@ -494,6 +560,10 @@ def _merge_input_dependencies_manifests(chip, step, index, status, replay):
                 chip.set('flowgraph', flow, in_step, in_index, 'status', in_node_status)
             in_workdir = chip._getworkdir(in_job, in_step, in_index)
             cfgfile = f"{in_workdir}/outputs/{design}.pkg.json"
+            if in_job == chip.get('option', 'jobname'):
+                # Nodes of the same job started from the same configuration,
+                # so only the changes made by the input node are needed
+                cfgfile = _get_node_delta_manifest(chip, in_step, in_index) or cfgfile
             if os.path.isfile(cfgfile):
                 chip._read_manifest(cfgfile, clobber=False, partial=True)
 
@@ -554,7 +624,7 @@ def _copy_previous_steps_output_data(chip, step, index, replay):
                         continue
 
                 if outfile.is_file() or outfile.is_symlink():
-                    if outfile.name == f'{design}.pkg.json':
+                    if outfile.name in (f'{design}.pkg.json', f'{design}.pkg.delta.json'):
                         continue
                     utils.link_symlink_copy(outfile.path, f'inputs/{outfile.name}')
                 elif outfile.is_dir():
@@ -568,19 +638,6 @@ def _copy_previous_steps_output_data(chip, step, index, replay):
                     os.rename(f'inputs/{outfile.name}', f'inputs/{new_name}')
 
 
-def __read_std_streams(chip, quiet, is_stdout_log, stdout_reader, is_stderr_log, stderr_reader):
-    '''
-    Handle directing tool outputs to logger
-    '''
-    if not quiet:
-        if is_stdout_log:
-            for line in stdout_reader.readlines():
-                chip.logger.info(line.rstrip())
-        if is_stderr_log:
-            for line in stderr_reader.readlines():
-                chip.logger.error(line.rstrip())
-
-
 #######################################
 def _makecmd(chip, tool, task, step, index, script_name='replay.sh', include_path=True):
     '''
@@ -795,22 +852,25 @@ def _run_executable_or_builtin(chip, step, index, version, toolpath, workdir, ru
                                   'Use [log|output|none].')
                 _haltstep(chip, flow, step, index)
 
-            with open(stdout_file, 'w') as stdout_writer, \
-                    open(stdout_file, 'r', errors='replace_with_warning') as stdout_reader, \
-                    open(stderr_file, 'w') as stderr_writer, \
-                    open(stderr_file, 'r', errors='replace_with_warning') as stderr_reader:
-                # Use separate reader/writer file objects as hack to display
-                # live output in non-blocking way, so we can monitor the
-                # timeout. Based on https://stackoverflow.com/a/18422264.
-                is_stdout_log = chip.get('tool', tool, 'task', task, 'stdout', 'destination',
-                                         step=step, index=index) == 'log'
-                is_stderr_log = stderr_destination == 'log' and stderr_file != stdout_file
-                # if STDOUT and STDERR are to be redirected to the same file,
-                # use a single writer
+            is_stdout_log = stdout_destination == 'log'
+            is_stderr_log = stderr_destination == 'log' and stderr_file != stdout_file
+
+            with open(stdout_file, 'wb', buffering=0) as stdout_writer, \
+                    open(stderr_file, 'wb', buffering=0) as stderr_writer:
+                # Outputs which are displayed are read from pipes and written
+                # to their files as they are produced, the others are written
+                # directly by the tool.
+                stdout = stdout_writer
+                if is_stdout_log and not quiet:
+                    stdout = subprocess.PIPE
+                stderr = stderr_writer
                 if stderr_file == stdout_file:
+                    # if STDOUT and STDERR are to be redirected to the same file,
+                    # use a single writer
                     stderr_writer.close()
-                    stderr_reader.close()
-                    stderr_writer = subprocess.STDOUT
+                    stderr = subprocess.STDOUT
+                elif is_stderr_log and not quiet:
+                    stderr = subprocess.PIPE
 
                 preexec_fn = None
                 nice = None
@@ -825,62 +885,67 @@ def _run_executable_or_builtin(chip, step, index, version, toolpath, workdir, ru
 
                 cmd_start_time = time.time()
                 proc = subprocess.Popen(cmdlist,
-                                        stdout=stdout_writer,
-                                        stderr=stderr_writer,
+                                        stdout=stdout,
+                                        stderr=stderr,
                                         preexec_fn=preexec_fn)
+
+                pipes = []
+                if stdout == subprocess.PIPE:
+                    pipes.append((proc.stdout, stdout_writer, chip.logger.info))
+                if stderr == subprocess.PIPE:
+                    pipes.append((proc.stderr, stderr_writer, chip.logger.error))
+                output_streams = streams.OutputStreams(pipes, errors='replace_with_warning')
+
                 # How long to wait for proc to quit on ctrl-c before force
                 # terminating.
                 POLL_INTERVAL = 0.1
                 MEMORY_WARN_LIMIT = 90
                 try:
+                    memory_check_time = 0
                     while proc.poll() is None:
                         # Gather subprocess memory usage.
-                        try:
-                            pproc = psutil.Process(proc.pid)
-                            proc_mem_bytes = pproc.memory_full_info().uss
-                            for child in pproc.children(recursive=True):
-                                proc_mem_bytes += child.memory_full_info().uss
-                            max_mem_bytes = max(max_mem_bytes, proc_mem_bytes)
-
-                            memory_usage = psutil.virtual_memory()
-                            if memory_usage.percent > MEMORY_WARN_LIMIT:
-                                chip.logger.warn(
-                                    f'Current system memory usage is {memory_usage.percent}%')
-
-                                # increase limit warning
-                                MEMORY_WARN_LIMIT = int(memory_usage.percent + 1)
-                        except psutil.Error:
-                            # Process may have already terminated or been killed.
-                            # Retain existing memory usage statistics in this case.
-                            pass
-                        except PermissionError:
-                            # OS is preventing access to this information so it cannot
-                            # be collected
-                            pass
-
-                        # Loop until process terminates
-                        __read_std_streams(chip,
-                                           quiet,
-                                           is_stdout_log, stdout_reader,
-                                           is_stderr_log, stderr_reader)
+                        if time.time() - memory_check_time >= POLL_INTERVAL:
+                            memory_check_time = time.time()
+                            try:
+                                pproc = psutil.Process(proc.pid)
+                                proc_mem_bytes = pproc.memory_full_info().uss
+                                for child in pproc.children(recursive=True):
+                                    proc_mem_bytes += child.memory_full_info().uss
+                                max_mem_bytes = max(max_mem_bytes, proc_mem_bytes)
+
+                                memory_usage = psutil.virtual_memory()
+                                if memory_usage.percent > MEMORY_WARN_LIMIT:
+                                    chip.logger.warn(
+                                        f'Current system memory usage is {memory_usage.percent}%')
+
+                                    # increase limit warning
+                                    MEMORY_WARN_LIMIT = int(memory_usage.percent + 1)
+                            except psutil.Error:
+                                # Process may have already terminated or been killed.
+                                # Retain existing memory usage statistics in this case.
+                                pass
+                            except PermissionError:
+                                # OS is preventing access to this information so it cannot
+                                # be collected
+                                pass
 
                         if timeout is not None and time.time() - cmd_start_time > timeout:
                             chip.logger.error(f'Step timed out after {timeout} seconds')
                             utils.terminate_process(proc.pid)
                             raise SiliconCompilerTimeout(f'{step}{index} timeout')
-                        time.sleep(POLL_INTERVAL)
+
+                        # Forward output until the next check
+                        output_streams.read(timeout=POLL_INTERVAL)
                 except KeyboardInterrupt:
                     kill_process(chip, proc, tool, 5 * POLL_INTERVAL, msg="Received ctrl-c. ")
                     _haltstep(chip, flow, step, index, log=False)
                 except SiliconCompilerTimeout:
                     kill_process(chip, proc, tool, 5 * POLL_INTERVAL)
                     chip._error = True
-
-                # Read the remaining
-                __read_std_streams(chip,
-                                   quiet,
-                                   is_stdout_log, stdout_reader,
-                                   is_stderr_log, stderr_reader)
+                finally:
+                    # Read the remaining output and close the pipes, also when
+                    # the step is halted
+                    output_streams.close()
                 retcode = proc.returncode
 
     if retcode != 0:
@@ -943,14 +1008,27 @@ def _executenode(chip, step, index, replay):
     flow = chip.get('option', 'flow')
     tool, _ = chip._get_tool_task(step, index, flow)
 
-    _pre_process(chip, step, index)
+    with timeline.span('_pre_process'):
+        _pre_process(chip, step, index)
     _set_env_vars(chip, step, index)
 
     run_func = getattr(chip._get_task_module(step, index, flow=flow), 'run', None)
-    (toolpath, version) = _check_tool_version(chip, step, index, run_func)
+    with timeline.span('_check_tool_version'):
+        (toolpath, version) = _check_tool_version(chip, step, index, run_func)
 
     # Write manifest (tool interface) (Don't move this!)
-    _write_task_manifest(chip, tool)
+    with timeline.span('_write_task_manifest'):
+        _write_task_manifest(chip, tool)
+
+    cache_key = None
+    if taskcache.is_enabled(chip, step, index, replay):
+        with timeline.span('taskcache.fetch'):
+            cache_key = taskcache.get_key(chip, step, index, toolpath, version)
+            cached = taskcache.fetch(chip, cache_key, step, index)
+        if cached:
+            with timeline.span('_finalizenode'):
+                _finalizenode(chip, step, index, replay, cached=True)
+            return
 
     # Start CPU Timer
     chip.logger.debug("Starting executable")
@@ -960,12 +1038,22 @@ def _executenode(chip, step, index, replay):
 
     # Capture cpu runtime
     cpu_end = time.time()
+    timeline.record(tool, cpu_start, cpu_end, category='tool')
     cputime = round((cpu_end - cpu_start), 2)
     chip._record_metric(step, index, 'exetime', cputime, source=None, source_unit='s')
 
-    _post_process(chip, step, index)
+    with timeline.span('_post_process'):
+        _post_process(chip, step, index)
 
-    _finalizenode(chip, step, index, replay)
+    with timeline.span('_finalizenode'):
+        _finalizenode(chip, step, index, replay)
+
+    if cache_key:
+        try:
+            with timeline.span('taskcache.store'):
+                taskcache.store(chip, cache_key, step, index)
+        except OSError as e:
+            chip.logger.warning(f'Unable to store results in task cache: {e}')
 
 
 def _pre_process(chip, step, index):
@@ -1014,15 +1102,10 @@ def _check_tool_version(chip, step, index, run_func=None):
     if exe is not None:
         exe_path, exe_base = os.path.split(exe)
         if veropt:
-            cmdlist = [exe]
-            cmdlist.extend(veropt)
-            proc = subprocess.run(cmdlist,
-                                  stdout=subprocess.PIPE,
-                                  stderr=subprocess.STDOUT,
-                                  universal_newlines=True)
-            if proc.returncode != 0:
+            returncode, output = toolversion.probe_version(chip, exe, veropt)
+            if returncode != 0:
                 chip.logger.warning(f'Version check on {tool} failed with '
-                                    f'code {proc.returncode}')
+                                    f'code {returncode}')
 
             parse_version = getattr(chip._get_tool_module(step, index, flow=flow),
                                     'parse_version',
@@ -1031,16 +1114,16 @@ def _check_tool_version(chip, step, index, run_func=None):
                 chip.logger.error(f'{tool}/{task} does not implement parse_version().')
                 _haltstep(chip, flow, step, index)
             try:
-                version = parse_version(proc.stdout)
+                version = parse_version(output)
             except Exception as e:
-                chip.logger.error(f'{tool} failed to parse version string: {proc.stdout}')
+                chip.logger.error(f'{tool} failed to parse version string: {output}')
                 raise e
 
             chip.logger.info(f"Tool '{exe_base}' found with version '{version}' "
                              f"in directory '{exe_path}'")
             if vercheck and not _check_version(chip, version, tool, step, index):
-                if proc.returncode != 0:
-                    chip.logger.error(f"Tool '{exe_base}' responsed with: {proc.stdout}")
+                if returncode != 0:
+                    chip.logger.error(f"Tool '{exe_base}' responsed with: {output}")
                 _haltstep(chip, flow, step, index)
         else:
             chip.logger.info(f"Tool '{exe_base}' found in directory '{exe_path}'")
@@ -1085,7 +1168,7 @@ def _hash_files(chip, step, index, setup=False):
                     chip.hash_files(*args, step=step, index=index, check=False, allow_cache=True)
 
 
-def _finalizenode(chip, step, index, replay):
+def _finalizenode(chip, step, index, replay, cached=False):
     flow = chip.get('option', 'flow')
     tool, task = chip._get_tool_task(step, index, flow)
     quiet = (
@@ -1094,8 +1177,12 @@ def _finalizenode(chip, step, index, replay):
     )
     run_func = getattr(chip._get_task_module(step, index, flow=flow), 'run', None)
 
-    _check_logfile(chip, step, index, quiet, run_func)
-    _hash_files(chip, step, index)
+    if not cached:
+        # Restored metrics already include the log file matches
+        with timeline.span('_check_logfile'):
+            _check_logfile(chip, step, index, quiet, run_func)
+    with timeline.span('_hash_files'):
+        _hash_files(chip, step, index)
 
     # Capture wall runtime and cpu cores
     wall_end = time.time()
@@ -1105,9 +1192,12 @@ def _finalizenode(chip, step, index, replay):
     chip._record_metric(step, index, 'tasktime', walltime, source=None, source_unit='s')
     chip.logger.info(f"Finished task in {round(walltime, 2)}s")
 
+    _record_overhead(chip, step, index)
+
     # Save a successful manifest
     chip.set('flowgraph', flow, step, index, 'status', NodeStatus.SUCCESS)
-    chip.write_manifest(os.path.join("outputs", f"{chip.get('design')}.pkg.json"))
+    with timeline.span('write_manifest'):
+        _write_output_manifests(chip)
 
     if chip._error and not replay:
         _make_testcase(chip, step, index)
@@ -1130,6 +1220,45 @@ def _finalizenode(chip, step, index, replay):
         assert_output_files(chip, step, index)
 
 
+def _get_io_counters():
+    '''
+    Returns a tuple of (bytes read, bytes written) by this process or None if
+    the platform does not provide I/O counters.
+    '''
+    try:
+        counters = psutil.Process().io_counters()
+    except (AttributeError, psutil.Error):
+        return None
+
+    # Prefer the character counts, which include I/O served from the page cache
+    return (getattr(counters, 'read_chars', counters.read_bytes),
+            getattr(counters, 'write_chars', counters.write_bytes))
+
+
+def _record_overhead(chip, step, index):
+    '''
+    Records the time spent in SiliconCompiler bookkeeping phases and the I/O
+    of the node process since the node started.
+    '''
+    if not _node_overhead_start:
+        return
+
+    mark, io_start = _node_overhead_start
+
+    durations = timeline.get_durations([phase for phases in _OVERHEAD_METRICS.values()
+                                        for phase in phases], since=mark)
+    for metric, phases in _OVERHEAD_METRICS.items():
+        chip._record_metric(step, index, metric, sum(durations[phase] for phase in phases),
+                            source=None, source_unit='s')
+
+    io_end = _get_io_counters()
+    if io_start and io_end:
+        chip._record_metric(step, index, 'bytesread', io_end[0] - io_start[0],
+                            source=None, source_unit='B')
+        chip._record_metric(step, index, 'byteswritten', io_end[1] - io_start[1],
+                            source=None, source_unit='B')
+
+
 def _make_testcase(chip, step, index):
     # Import here to avoid circular import
     from siliconcompiler.issue import generate_testcase
@@ -1156,6 +1285,8 @@ def assert_output_files(chip, step, index):
 
     outputs = os.listdir(f'{chip._getworkdir(step=step, index=index)}/outputs')
     outputs.remove(f'{chip.design}.pkg.json')
+    if f'{chip.design}.pkg.delta.json' in outputs:
+        outputs.remove(f'{chip.design}.pkg.delta.json')
 
     output_files = chip.get('tool', tool, 'task', task, 'output',
                             step=step, index=index)
@@ -1221,7 +1352,7 @@ def _reset_flow_nodes(chip, flow, nodes_to_execute):
             # in the nodes to execute.
             clear_node(step, index)
         elif os.path.isfile(cfg):
-            node_status = Schema(manifest=cfg).get('flowgraph', flow, step, index, 'status')
+            node_status = _read_node_status(chip, flow, step, index)
             chip.set('flowgraph', flow, step, index, 'status', node_status)
         else:
             chip.set('flowgraph', flow, step, index, 'status', NodeStatus.ERROR)
@@ -1240,13 +1371,63 @@ def _reset_flow_nodes(chip, flow, nodes_to_execute):
                     clear_node(step, index)
 
 
+def _get_node_process_context():
+    '''
+    Returns the multiprocessing context used to launch nodes.
+
+    Where available, nodes are forked from a forkserver with siliconcompiler
+    preloaded, instead of re-importing siliconcompiler and its dependencies
+    in each node. Otherwise, fall back to spawn, where each node starts from
+    a fresh interpreter.
+
+    The forkserver is started from a fresh interpreter the first time a node
+    is launched. Node processes inherit the modules imported by the preload,
+    as they were after being imported, and each node is forked from that
+    state, so nodes do not see changes made by earlier nodes.
+
+    When a node starts, multiprocessing restores the sys.path, working
+    directory and main module of this process as they are at launch, and
+    the chip and the other arguments are pickled to the node. The
+    environment is not restored by multiprocessing, so nodes would see the
+    environment of the forkserver; _run_node_process() restores the
+    environment of this process instead. Other changes made by this process
+    after the forkserver started, such as to module globals or the logging
+    configuration, are not seen by the nodes.
+
+    The forkserver and its preload list are shared by the whole process, so
+    the preload also applies to other users of the forkserver start method in
+    the host application, including the default context on platforms where
+    forkserver is the default start method.
+    '''
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        multiprocessor = multiprocessing.get_context('forkserver')
+        # Only takes effect before the forkserver is started
+        multiprocessor.set_forkserver_preload(['siliconcompiler'])
+        return multiprocessor
+
+    return multiprocessing.get_context('spawn')
+
+
+def _run_node_process(environment, *args):
+    '''
+    Entry point of node processes.
+
+    Processes forked from the forkserver inherit the environment of the
+    forkserver, so the environment of the parent is restored before running
+    the node.
+    '''
+    os.environ.clear()
+    os.environ.update(environment)
+
+    _runtask(*args)
+
+
 def _prepare_nodes(chip, nodes_to_run, processes, local_processes, flow, status):
     '''
     For each node to run, prepare a process and store its dependencies
     '''
-    # Ensure we use spawn for multiprocessing so loggers initialized correctly
     jobname = chip.get('option', 'jobname')
-    multiprocessor = multiprocessing.get_context('spawn')
+    multiprocessor = _get_node_process_context()
     collected = False
     for (step, index) in chip.nodes_to_execute(flow):
         node = (step, index)
@@ -1275,8 +1456,9 @@ def _prepare_nodes(chip, nodes_to_run, processes, local_processes, flow, status)
         else:
             local_processes.append((step, index))
 
-        processes[node] = multiprocessor.Process(target=_runtask,
-                                                 args=(chip, flow, step, index, status, exec_func))
+        processes[node] = multiprocessor.Process(target=_run_node_process,
+                                                 args=(dict(os.environ),
+                                                       chip, flow, step, index, status, exec_func))
 
 
 def _check_node_dependencies(chip, node, deps, status, deps_was_successful):
@@ -1305,6 +1487,7 @@ def _check_node_dependencies(chip, node, deps, status, deps_was_successful):
 
 def _launch_nodes(chip, nodes_to_run, processes, local_processes, status):
     running_nodes = {}
+    running_memory = {}
     max_parallel_run = chip.get('option', 'scheduler', 'maxnodes')
     max_threads = os.cpu_count()
     if not max_parallel_run:
@@ -1313,15 +1496,30 @@ def _launch_nodes(chip, nodes_to_run, processes, local_processes, status):
     # clip max parallel jobs to 1 <= jobs <= max_threads
     max_parallel_run = max(1, min(max_parallel_run, max_threads))
 
-    def allow_start(node):
-        if node not in local_processes:
-            # using a different scheduler, so allow
-            return True, 0
+    # Metrics recorded by previous jobs, which are read up front when a memory
+    # budget is set and otherwise only once more nodes are ready than can be
+    # started, see load_history()
+    history = {'tasktime': {}, 'memory': {}}
+    history_nodes = list(nodes_to_run.keys())
+    history_loaded = False
+
+    # Memory budget for local nodes in bytes
+    max_memory = chip.get('option', 'scheduler', 'maxmemory')
+    if max_memory:
+        max_memory *= 1024 * 1024
+    else:
+        max_memory = psutil.virtual_memory().total
 
-        if len(running_nodes) >= max_parallel_run:
-            return False, 0
+    def get_memory_estimate(node):
+        if node in history['memory']:
+            return history['memory'][node]
+        step, index = node
+        memory = chip.get('option', 'scheduler', 'memory', step=step, index=index)
+        if memory:
+            return memory * 1024 * 1024
+        return 0
 
-        # Record thread count requested
+    def get_requested_threads(node):
         step, index = node
         tool, task = chip._get_tool_task(step, index)
         requested_threads = chip.get('tool', tool, 'task', task, 'threads',
@@ -1330,38 +1528,126 @@ def _launch_nodes(chip, nodes_to_run, processes, local_processes, status):
             # not specified, marking it max to be safe
             requested_threads = max_threads
         # clamp to max_parallel to avoid getting locked up
-        requested_threads = max(1, min(requested_threads, max_threads))
+        return max(1, min(requested_threads, max_threads))
+
+    def allow_start(node):
+        if node not in local_processes:
+            # using a different scheduler, so allow
+            return True, 0, 0
+
+        if len(running_nodes) >= max_parallel_run:
+            return False, 0, 0
+
+        # Always allow a node to start if nothing is running, to avoid getting locked up
+        requested_memory = get_memory_estimate(node)
+        if running_nodes and \
+                requested_memory + sum(running_memory.values()) > max_memory:
+            # delay until there is enough memory available
+            return False, 0, 0
+
+        # Record thread count requested
+        requested_threads = get_requested_threads(node)
 
         if requested_threads + sum(running_nodes.values()) > max_threads:
             # delay until there are enough core available
-            return False, 0
+            return False, 0, 0
 
-        # allow and record how many threads to associate
-        return True, requested_threads
+        # allow and record how many threads and how much memory to associate
+        return True, requested_threads, requested_memory
 
     deps_was_successful = {}
 
-    while len(nodes_to_run) > 0 or len(running_nodes) > 0:
-        # Check for new nodes that can be launched.
-        for node, deps in list(nodes_to_run.items()):
-            # TODO: breakpoint logic:
-            # if node is breakpoint, then don't launch while len(running_nodes) > 0
+    # Map each node to the pending nodes that consume it, so that a finished
+    # node only needs to re-evaluate its direct successors.
+    dependents = {}
+    for node, deps in nodes_to_run.items():
+        for in_node in deps:
+            dependents.setdefault(in_node, []).append(node)
+
+    # Nodes with no remaining dependencies, in the order they became ready.
+    # A dict maps each node to the time it became ready.
+    launch_start = time.time()
+    ready_nodes = {}
+    start_times = {}
+
+    def update_pending_nodes(nodes):
+        for node in nodes:
+            if node not in nodes_to_run:
+                continue
 
+            deps = nodes_to_run[node]
             _check_node_dependencies(chip, node, deps, status, deps_was_successful)
 
             if status[node] == NodeStatus.ERROR:
                 del nodes_to_run[node]
+                ready_nodes.pop(node, None)
+                # A failed node is finished, so its successors need to be re-evaluated
+                update_pending_nodes(dependents.get(node, []))
                 continue
 
-            # If there are no dependencies left, launch this node and
-            # remove from nodes_to_run.
-            if len(deps) == 0:
-                dostart, requested_threads = allow_start(node)
+            if len(deps) == 0 and node not in ready_nodes:
+                ready_nodes[node] = time.time()
+
+    def ready_nodes_fit():
+        '''
+        Returns True if all the ready nodes can be started at once.
+        '''
+        count = len(running_nodes)
+        threads = sum(running_nodes.values())
+        memory = sum(running_memory.values())
+        for node in ready_nodes:
+            if node not in local_processes:
+                continue
+            count += 1
+            threads += get_requested_threads(node)
+            memory += get_memory_estimate(node)
+        return count <= max_parallel_run and threads <= max_threads and memory <= max_memory
+
+    def load_history():
+        nonlocal history, history_loaded
+        history = _get_historical_metrics(chip, chip.get('option', 'flow'),
+                                          history_nodes, ('tasktime', 'memory'))
+        history_loaded = True
+
+    if chip.get('option', 'scheduler', 'maxmemory'):
+        # The recorded memory of each node is needed to admit it within the budget
+        load_history()
+
+    update_pending_nodes(list(nodes_to_run.keys()))
 
-                if dostart:
-                    processes[node].start()
-                    del nodes_to_run[node]
-                    running_nodes[node] = requested_threads
+    # Nodes are ranked by their critical path so that long chains are started
+    # ahead of short side branches when resources are limited.
+    priorities = None
+
+    while len(nodes_to_run) > 0 or len(running_nodes) > 0:
+        if priorities is None and not ready_nodes_fit():
+            # The order only matters when not all the ready nodes can start
+            if not history_loaded:
+                load_history()
+            priorities = _get_node_priorities(history_nodes, dependents, history['tasktime'])
+
+        launch_order = list(ready_nodes.keys())
+        if priorities is not None:
+            launch_order.sort(key=priorities.get, reverse=True)
+
+        # Launch ready nodes while there are resources available.
+        for node in launch_order:
+            # TODO: breakpoint logic:
+            # if node is breakpoint, then don't launch while len(running_nodes) > 0
+
+            dostart, requested_threads, requested_memory = allow_start(node)
+
+            if dostart:
+                start_times[node] = time.time()
+                timeline.record('waiting on inputs', launch_start, ready_nodes[node],
+                                node=node, category='scheduler')
+                timeline.record('waiting on resources', ready_nodes[node], start_times[node],
+                                node=node, category='scheduler')
+                processes[node].start()
+                del nodes_to_run[node]
+                del ready_nodes[node]
+                running_nodes[node] = requested_threads
+                running_memory[node] = requested_memory
 
         # Check for situation where we have stuff left to run but don't
         # have any nodes running. This shouldn't happen, but we will get
@@ -1371,19 +1657,123 @@ def _launch_nodes(chip, nodes_to_run, processes, local_processes, status):
             chip.error('Nodes left to run, but no '
                        'running nodes. From/to may be invalid.', fatal=True)
 
-        # Check for completed nodes.
-        # TODO: consider staying in this section of loop until a node
-        # actually completes.
-        for node in list(running_nodes.keys()):
-            if not processes[node].is_alive():
-                del running_nodes[node]
-                if processes[node].exitcode > 0:
-                    status[node] = NodeStatus.ERROR
-                else:
-                    status[node] = NodeStatus.SUCCESS
+        if len(running_nodes) == 0:
+            break
+
+        # Block until at least one running node completes.
+        sentinels = {processes[node].sentinel: node for node in running_nodes}
+        for sentinel in multiprocessing.connection.wait(sentinels.keys()):
+            node = sentinels[sentinel]
+            processes[node].join()
+            timeline.record('node process', start_times[node], time.time(),
+                            node=node, category='scheduler')
+            del running_nodes[node]
+            del running_memory[node]
+            if processes[node].exitcode > 0:
+                status[node] = NodeStatus.ERROR
+            else:
+                status[node] = NodeStatus.SUCCESS
 
-        # TODO: exponential back-off with max?
-        time.sleep(0.1)
+            update_pending_nodes(dependents.get(node, []))
+
+
+def _get_schema_metrics(schema, flow, nodes, tool_tasks, metrics):
+    '''
+    Returns the recorded metrics of each node in schema which ran the same
+    tool and task as in the current flow.
+    '''
+    values = {metric: {} for metric in metrics}
+    for step, index in nodes:
+        try:
+            tool = schema.get('flowgraph', flow, step, index, 'tool')
+            task = schema.get('flowgraph', flow, step, index, 'task')
+            if (tool, task) != tool_tasks[(step, index)]:
+                continue
+            for metric in metrics:
+                value = schema.get('metric', metric, step=step, index=index)
+                if value is not None:
+                    values[metric][(step, index)] = value
+        except (KeyError, TypeError, ValueError):
+            continue
+    return values
+
+
+def _get_historical_metrics(chip, flow, nodes, metrics):
+    '''
+    Returns the metrics of nodes as recorded by previous jobs, looking first
+    in the manifest history and then at job manifests in the build directory.
+    The most recent value found for each node is used.
+    '''
+    # Limit how many manifests are read from the build directory
+    max_manifests = 5
+
+    tool_tasks = {(step, index): chip._get_tool_task(step, index, flow=flow)
+                  for step, index in nodes}
+
+    values = {metric: {} for metric in metrics}
+
+    def merge_values(schema):
+        for metric, node_values in _get_schema_metrics(schema, flow, nodes, tool_tasks,
+                                                       metrics).items():
+            for node, value in node_values.items():
+                values[metric].setdefault(node, value)
+
+    for job in reversed(chip.getkeys('history')):
+        merge_values(chip.schema.history(job))
+
+    jobname = chip.get('option', 'jobname')
+    designdir = os.path.dirname(chip._getworkdir())
+    manifests = []
+    if os.path.isdir(designdir):
+        for job in os.listdir(designdir):
+            if job == jobname or job in chip.getkeys('history'):
+                continue
+            manifest = os.path.join(designdir, job, f'{chip.design}.pkg.json')
+            if os.path.isfile(manifest):
+                manifests.append(manifest)
+    # Newest manifests first
+    manifests = sorted(manifests, key=os.path.getmtime, reverse=True)
+
+    for manifest in manifests[:max_manifests]:
+        if all(node in values[metric] for metric in metrics for node in nodes):
+            break
+        try:
+            schema = Schema(manifest=manifest, logger=chip.logger)
+        except (OSError, ValueError):
+            # Manifests which cannot be read, or were written by other schema
+            # versions, are skipped
+            continue
+        merge_values(schema)
+
+    return values
+
+
+def _get_node_priorities(nodes, dependents, task_times):
+    '''
+    Returns the critical path weight of each node, which is the estimated
+    time of the longest chain from the node to the end of the nodes to run.
+    Nodes without a recorded tasktime are weighted by the mean of the known
+    times, or 1 if no times are known.
+    '''
+    if task_times:
+        default_time = sum(task_times.values()) / len(task_times)
+    else:
+        default_time = 1
+
+    priorities = {}
+    node_set = set(nodes)
+
+    def get_priority(node):
+        if node not in priorities:
+            downstream = [get_priority(out_node) for out_node in dependents.get(node, [])
+                          if out_node in node_set]
+            priorities[node] = task_times.get(node, default_time) + max(downstream, default=0)
+        return priorities[node]
+
+    for node in nodes:
+        get_priority(node)
+
+    return priorities
 
 
 def _check_nodes_status(chip, flow, status):
@@ -1588,6 +1978,10 @@ def check_node_inputs(chip, step, index):
         chip.logger.warning(f'[{",".join(key)}] in {step}{index} has been modified '
                             'from previous run')
 
+    # Keys without any difference in the manifests do not need their values checked
+    changed_keys = set(keypath for keypath, _, _, _ in chip.schema.diff(
+        input_manifest, keypaths=[key.split(',') for key in set(required)]))
+
     # Check if keys have been modified
     for check_key in sorted(set(required)):
         key = check_key.split(',')
@@ -1596,6 +1990,12 @@ def check_node_inputs(chip, step, index):
             print_warning(key)
             return False
 
+        sc_type = chip.get(*key, field='type')
+        is_hashed = ('file' in sc_type or 'dir' in sc_type) and \
+            chip.get('option', 'hash') and input_chip.get('option', 'hash')
+        if not is_hashed and tuple(key) not in changed_keys:
+            continue
+
         pernode = chip.get(*key, field='pernode')
 
         check_step = step
@@ -1604,7 +2004,6 @@ def check_node_inputs(chip, step, index):
             check_step = None
             check_index = None
 
-        sc_type = chip.get(*key, field='type')
         if 'file' in sc_type or 'dir' in sc_type:
             if chip.get('option', 'hash') and input_chip.get('option', 'hash'):
                 check_hash = chip.hash_files(*key, update=False, check=False,
@@ -0,0 +1,170 @@
+'''
+Streaming of tool output.
+
+The output of a tool is read from its pipes as soon as it is produced, written
+to the files of the task and forwarded line by line to the logger.
+'''
+
+import codecs
+import locale
+import os
+import queue
+import selectors
+import threading
+import time
+
+
+# Maximum number of bytes read from a pipe at once
+_CHUNK_SIZE = 64 * 1024
+
+
+class OutputStreams:
+    '''
+    Tees the output pipes of a process to files and to the logger.
+
+    On POSIX systems the pipes are multiplexed with selectors. Elsewhere
+    selectors only support sockets, so each pipe is drained by a thread.
+
+    Args:
+        streams (list of (file, file, function)): pipe to read from, binary
+            file to write the output to and function called with each line of
+            output. The file and function may be None.
+        errors (str): codec error handler used to decode the output
+
+    Examples:
+        >>> streams = OutputStreams([(proc.stdout, log_writer, chip.logger.info)])
+        >>> while proc.poll() is None:
+        ...     streams.read(timeout=0.1)
+        >>> streams.close()
+    '''
+
+    def __init__(self, streams, errors='replace'):
+        encoding = locale.getpreferredencoding(False)
+
+        self.__streams = {}
+        for pipe, writer, log in streams:
+            self.__streams[pipe.fileno()] = {
+                'pipe': pipe,
+                'writer': writer,
+                'log': log,
+                'decoder': codecs.getincrementaldecoder(encoding)(errors=errors),
+                'partial': ''
+            }
+        self.__open = set(self.__streams.keys())
+
+        self.__selector = None
+        self.__queue = None
+        if os.name == 'posix':
+            self.__selector = selectors.DefaultSelector()
+            for fd in self.__open:
+                self.__selector.register(fd, selectors.EVENT_READ)
+        else:
+            self.__queue = queue.Queue()
+            for fd, stream in self.__streams.items():
+                threading.Thread(target=self.__drain, args=(fd, stream['pipe']),
+                                 daemon=True).start()
+
+    def read(self, timeout=None):
+        '''
+        Waits up to timeout seconds for output and processes all the output
+        which is available.
+
+        Args:
+            timeout (float): maximum time to wait in seconds, None waits until
+                output is available
+
+        Returns:
+            True if any of the pipes is still open, otherwise False.
+        '''
+        if not self.__open:
+            if timeout:
+                time.sleep(timeout)
+            return False
+
+        self.__read(timeout)
+        return bool(self.__open)
+
+    def close(self):
+        '''
+        Processes the output left in the pipes and stops reading.
+
+        Processes started by the tool may keep the pipes open after the tool
+        exits, so this does not wait for the pipes to be closed.
+        '''
+        while self.__open and self.__read(0):
+            pass
+
+        for fd in list(self.__open):
+            self.__close_stream(fd)
+
+        if self.__selector:
+            self.__selector.close()
+
+    def __read(self, timeout):
+        '''
+        Returns the number of chunks of output processed.
+        '''
+        chunks = 0
+        if self.__selector:
+            for key, _ in self.__selector.select(timeout):
+                try:
+                    data = os.read(key.fd, _CHUNK_SIZE)
+                except OSError:
+                    data = b''
+                self.__process(key.fd, data)
+                chunks += 1
+        else:
+            try:
+                fd, data = self.__queue.get(timeout=timeout)
+                while True:
+                    self.__process(fd, data)
+                    chunks += 1
+                    fd, data = self.__queue.get_nowait()
+            except queue.Empty:
+                pass
+        return chunks
+
+    def __drain(self, fd, pipe):
+        while True:
+            try:
+                data = pipe.read1(_CHUNK_SIZE)
+            except (OSError, ValueError):
+                data = b''
+            self.__queue.put((fd, data))
+            if not data:
+                break
+
+    def __process(self, fd, data):
+        if fd not in self.__open:
+            return
+
+        if not data:
+            self.__close_stream(fd)
+            return
+
+        stream = self.__streams[fd]
+        if stream['writer']:
+            stream['writer'].write(data)
+        self.__log(stream, stream['decoder'].decode(data))
+
+    def __close_stream(self, fd):
+        self.__open.discard(fd)
+
+        stream = self.__streams[fd]
+        self.__log(stream, stream['decoder'].decode(b'', final=True))
+        if stream['log'] and stream['partial']:
+            stream['log'](stream['partial'].rstrip())
+        stream['partial'] = ''
+
+        if self.__selector:
+            self.__selector.unregister(fd)
+            stream['pipe'].close()
+
+    def __log(self, stream, text):
+        if not stream['log'] or not text:
+            return
+
+        lines = (stream['partial'] + text).split('\n')
+        stream['partial'] = lines.pop()
+        for line in lines:
+            stream['log'](line.rstrip())
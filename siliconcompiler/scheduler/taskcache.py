@@ -0,0 +1,293 @@
+'''
+Content-addressed cache for task results.
+
+The results of a successful task are stored under a key computed from
+everything that can influence the task: the contents of the node inputs,
+the values of the parameters required by the task, the tool version and the
+environment. A task computing a key which is already present in the cache
+restores the stored outputs, reports, logs and metrics instead of running
+the tool.
+'''
+
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+import fasteners
+
+from siliconcompiler import _metadata
+
+
+# Metrics which are always recomputed when a task is restored
+_RECOMPUTED_METRICS = ('tasktime', 'mergetime', 'hashtime', 'copytime', 'checktime',
+                       'manifesttime', 'logtime', 'bytesread', 'byteswritten')
+# Records which describe how the results were produced
+_RESTORED_RECORDS = ('toolversion', 'toolpath', 'toolargs')
+
+
+def get_cache_path(chip):
+    '''
+    Returns the absolute path to the task cache or None if it is disabled.
+    '''
+    cache_path = chip.get('option', 'taskcache', 'path')
+    if not cache_path:
+        return None
+
+    cache_path = chip._resolve_env_vars(cache_path)
+    return os.path.abspath(os.path.join(chip.cwd, cache_path))
+
+
+def is_enabled(chip, step, index, replay=False):
+    '''
+    Checks if the results of a node can be cached.
+    '''
+    if not get_cache_path(chip):
+        return False
+
+    if replay or chip.get('option', 'skipall'):
+        return False
+
+    if chip.get('option', 'breakpoint', step=step, index=index):
+        return False
+
+    tool, task = chip._get_tool_task(step, index)
+    # Builtins are cheaper to rerun than to cache
+    return not chip._is_builtin(tool, task)
+
+
+def get_key(chip, step, index, toolpath, toolversion):
+    '''
+    Computes the cache key for a node.
+
+    This must be called from within the node working directory after the
+    inputs have been copied.
+    '''
+    tool, task = chip._get_tool_task(step, index)
+    tool_task_key = ('tool', tool, 'task', task)
+
+    required = set(chip.get(*tool_task_key, 'require', step=step, index=index))
+    for key in ('option', 'threads', 'prescript', 'postscript', 'refdir', 'script'):
+        required.add(','.join([*tool_task_key, key]))
+    for env_key in chip.getkeys(*tool_task_key, 'env'):
+        required.add(','.join([*tool_task_key, 'env', env_key]))
+    for env_key in chip.getkeys('tool', tool, 'licenseserver'):
+        required.add(','.join(['tool', tool, 'licenseserver', env_key]))
+    for env_key in chip.getkeys('option', 'env'):
+        required.add(','.join(['option', 'env', env_key]))
+
+    values = {}
+    for keypath in sorted(required):
+        key = keypath.split(',')
+        if not chip.valid(*key):
+            values[keypath] = None
+            continue
+
+        check_step, check_index = step, index
+        if chip.get(*key, field='pernode') == 'never':
+            check_step, check_index = None, None
+
+        value = chip.get(*key, step=check_step, index=check_index)
+        sc_type = chip.get(*key, field='type')
+        if value and ('file' in sc_type or 'dir' in sc_type):
+            files = chip._find_files(*key, missing_ok=True, step=check_step, index=check_index)
+            if not isinstance(files, list):
+                files = [files]
+            if all(files):
+                # Use file contents so the key does not depend on where the files live
+                value = chip.hash_files(*key, update=False, check=False, verbose=False,
+                                        allow_cache=True, step=check_step, index=check_index)
+        values[keypath] = value
+
+    if toolversion:
+        tool_id = {'version': toolversion}
+    elif toolpath:
+        stat = os.stat(toolpath)
+        tool_id = {'path': toolpath, 'size': stat.st_size, 'mtime': stat.st_mtime}
+    else:
+        tool_id = None
+
+    key_data = {
+        'scversion': _metadata.version,
+        'design': chip.design,
+        'top': chip.top(),
+        'step': step,
+        'index': index,
+        'tool': tool,
+        'task': task,
+        'toolid': tool_id,
+        'outputs': chip.get(*tool_task_key, 'output', step=step, index=index),
+        'values': values,
+        'inputs': _hash_inputs(f'inputs/{chip.design}.pkg.json')
+    }
+
+    return hashlib.sha256(
+        json.dumps(key_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def fetch(chip, key, step, index):
+    '''
+    Restores the results of a node from the cache into the current directory.
+
+    Returns:
+        True if the results were restored, otherwise False.
+    '''
+    cache_path = get_cache_path(chip)
+    entry_path = os.path.join(cache_path, key)
+
+    if not os.path.isdir(entry_path):
+        return False
+
+    with __get_lock(cache_path):
+        try:
+            with open(os.path.join(entry_path, 'entry.json')) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        shutil.copytree(os.path.join(entry_path, 'workdir'), '.', dirs_exist_ok=True)
+
+        # Mark entry as recently used
+        os.utime(entry_path)
+
+    tool, task = chip._get_tool_task(step, index)
+    for metric, value in entry['metrics'].items():
+        chip.set('metric', metric, value, step=step, index=index, clobber=True)
+    for metric, sources in entry['reports'].items():
+        chip.set('tool', tool, 'task', task, 'report', metric, sources,
+                 step=step, index=index, clobber=True)
+    for record, value in entry['records'].items():
+        chip.set('record', record, value, step=step, index=index, clobber=True)
+
+    chip.logger.info(f'Restored results from task cache entry {key}')
+    return True
+
+
+def store(chip, key, step, index):
+    '''
+    Stores the results of a node in the current directory into the cache.
+    '''
+    cache_path = get_cache_path(chip)
+    entry_path = os.path.join(cache_path, key)
+
+    if os.path.isdir(entry_path):
+        return
+
+    os.makedirs(cache_path, exist_ok=True)
+
+    tool, task = chip._get_tool_task(step, index)
+
+    entry = {
+        'metrics': {},
+        'reports': {},
+        'records': {}
+    }
+    for metric in chip.getkeys('metric'):
+        if metric in _RECOMPUTED_METRICS:
+            continue
+        value = chip.get('metric', metric, step=step, index=index)
+        if value is not None:
+            entry['metrics'][metric] = value
+    for metric in chip.getkeys('tool', tool, 'task', task, 'report'):
+        sources = chip.get('tool', tool, 'task', task, 'report', metric, step=step, index=index)
+        if sources:
+            entry['reports'][metric] = sources
+    for record in _RESTORED_RECORDS:
+        value = chip.get('record', record, step=step, index=index)
+        if value is not None:
+            entry['records'][record] = value
+
+    ignore_top = ('inputs', f'sc_{step}{index}.log', 'sc_manifest.*')
+    ignore_outputs = (f'{chip.design}.pkg.json', f'{chip.design}.pkg.delta.json')
+
+    def ignore(path, names):
+        path = os.path.normpath(path)
+        if path == '.':
+            patterns = ignore_top
+        elif path == 'outputs':
+            patterns = ignore_outputs
+        else:
+            return []
+        return [name for name in names
+                if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+
+    tmp_path = os.path.join(cache_path, f'.{key}.{uuid.uuid4().hex}')
+    try:
+        shutil.copytree('.', os.path.join(tmp_path, 'workdir'), ignore=ignore)
+
+        entry['size'] = _get_size(tmp_path)
+        with open(os.path.join(tmp_path, 'entry.json'), 'w') as f:
+            json.dump(entry, f, indent=2)
+
+        with __get_lock(cache_path):
+            if not os.path.isdir(entry_path):
+                os.rename(tmp_path, entry_path)
+                chip.logger.info(f'Stored results in task cache entry {key}')
+            _evict(cache_path, chip.get('option', 'taskcache', 'maxsize'))
+    finally:
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _evict(cache_path, maxsize):
+    '''
+    Removes the least recently used entries until the cache fits in maxsize MB.
+    '''
+    if maxsize is None:
+        return
+
+    maxsize = maxsize * 1024 * 1024
+
+    entries = []
+    total_size = 0
+    for entry in os.scandir(cache_path):
+        if not entry.is_dir() or entry.name.startswith('.'):
+            continue
+        try:
+            with open(os.path.join(entry.path, 'entry.json')) as f:
+                size = json.load(f)['size']
+        except (OSError, ValueError, KeyError):
+            continue
+        entries.append((entry.stat().st_mtime, size, entry.path))
+        total_size += size
+
+    for _, size, path in sorted(entries):
+        if total_size <= maxsize:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total_size -= size
+
+
+def _hash_inputs(manifest):
+    hashobj = hashlib.sha256()
+    if not os.path.isdir('inputs'):
+        return hashobj.hexdigest()
+
+    all_files = []
+    for root, _, files in os.walk('inputs', followlinks=True):
+        all_files.extend([os.path.join(root, f) for f in files])
+
+    for path in sorted(all_files):
+        if os.path.normpath(path) == os.path.normpath(manifest):
+            # The input manifest is covered by the required parameters
+            continue
+        hashobj.update(os.path.relpath(path, 'inputs').replace(os.sep, '/').encode('utf-8'))
+        with open(path, 'rb') as f:
+            for byte_block in iter(lambda: f.read(4096), b""):
+                hashobj.update(byte_block)
+
+    return hashobj.hexdigest()
+
+
+def _get_size(path):
+    size = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            size += os.path.getsize(os.path.join(root, f))
+    return size
+
+
+def __get_lock(cache_path):
+    return fasteners.InterProcessLock(os.path.join(cache_path, '.lock'))
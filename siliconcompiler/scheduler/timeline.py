@@ -0,0 +1,183 @@
+'''
+Timeline of a run in the trace event format, which can be loaded in
+chrome://tracing or Perfetto.
+
+Spans are recorded in the process they happen in. Node processes write their
+spans to the node working directory when they finish, and the spans are
+merged with those of the scheduler once the run completes.
+'''
+
+import contextlib
+import json
+import os
+import time
+
+
+# Spans recorded in this process
+_spans = []
+
+
+def clear():
+    '''
+    Removes all spans recorded in this process.
+    '''
+    _spans.clear()
+
+
+def record(name, start, end, node=None, category='sc'):
+    '''
+    Records a span.
+
+    Args:
+        name (str): name of the span
+        start (float): start time, as returned by time.time()
+        end (float): end time, as returned by time.time()
+        node (tuple of (step, index)): node the span belongs to, if None
+            the span belongs to the node of the process it was recorded in or
+            to the scheduler
+        category (str): category of the span, used to filter in the viewer
+    '''
+    _spans.append({
+        'name': name,
+        'cat': category,
+        'start': start,
+        'end': end,
+        'node': node
+    })
+
+
+def mark():
+    '''
+    Returns a marker for the spans recorded so far, to be passed to
+    :func:`get_durations`.
+    '''
+    return len(_spans)
+
+
+def get_durations(names, since=0):
+    '''
+    Returns the total time spent in spans with the given names.
+
+    Only spans recorded in this process without an explicit node are counted.
+
+    Args:
+        names (list of str): names of the spans to total
+        since (int): marker returned by :func:`mark`, only spans recorded
+            after the marker are counted
+
+    Returns:
+        dict mapping each name to its total duration in seconds
+    '''
+    durations = {name: 0.0 for name in names}
+    for s in _spans[since:]:
+        if s['node'] is None and s['name'] in durations:
+            durations[s['name']] += s['end'] - s['start']
+    return durations
+
+
+@contextlib.contextmanager
+def span(name, node=None, category='sc'):
+    '''
+    Records a span covering the body of the with statement.
+
+    Examples:
+        >>> with timeline.span('check_manifest'):
+        ...     chip.check_manifest()
+    '''
+    start = time.time()
+    try:
+        yield
+    finally:
+        record(name, start, time.time(), node=node, category=category)
+
+
+def get_node_path(chip, step, index):
+    '''
+    Returns the path of the file holding the spans recorded by a node.
+    '''
+    return os.path.join(chip._getworkdir(step=step, index=index),
+                        f'sc_{step}{index}.timeline.json')
+
+
+def write_node(chip, step, index):
+    '''
+    Writes the spans recorded in this process for a node.
+    '''
+    with open(get_node_path(chip, step, index), 'w') as f:
+        json.dump(_spans, f)
+
+
+def write(chip, nodes, path):
+    '''
+    Writes the timeline of a run.
+
+    Args:
+        chip (Chip): chip which was run
+        nodes (list of (step, index)): nodes to include, in the order of their tracks
+        path (str): path to the timeline file
+    '''
+    spans = [dict(s) for s in _spans]
+    for step, index in nodes:
+        node_path = get_node_path(chip, step, index)
+        if not os.path.isfile(node_path):
+            continue
+        try:
+            with open(node_path) as f:
+                node_spans = json.load(f)
+        except ValueError:
+            continue
+        for node_span in node_spans:
+            node_span['node'] = (step, index)
+        spans.extend(node_spans)
+
+    tracks = {None: 0}
+    for node in nodes:
+        tracks[tuple(node)] = len(tracks)
+
+    pid = 1
+    events = [{
+        'name': 'process_name',
+        'ph': 'M',
+        'pid': pid,
+        'args': {'name': f"{chip.design} {chip.get('option', 'jobname')}"}
+    }]
+    for node, tid in tracks.items():
+        if node:
+            step, index = node
+            track_name = f'{step}{index}'
+        else:
+            track_name = 'scheduler'
+        events.append({
+            'name': 'thread_name',
+            'ph': 'M',
+            'pid': pid,
+            'tid': tid,
+            'args': {'name': track_name}
+        })
+        events.append({
+            'name': 'thread_sort_index',
+            'ph': 'M',
+            'pid': pid,
+            'tid': tid,
+            'args': {'sort_index': tid}
+        })
+
+    if spans:
+        run_start = min(s['start'] for s in spans)
+    for s in spans:
+        node = tuple(s['node']) if s['node'] else None
+        if node not in tracks:
+            continue
+        events.append({
+            'name': s['name'],
+            'cat': s['cat'],
+            'ph': 'X',
+            'pid': pid,
+            'tid': tracks[node],
+            'ts': round((s['start'] - run_start) * 1e6),
+            'dur': round((s['end'] - s['start']) * 1e6)
+        })
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, indent=2)
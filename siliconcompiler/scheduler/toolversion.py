@@ -0,0 +1,119 @@
+'''
+Cache of tool executable lookups and version probes.
+
+Probing the version of a tool runs the tool, which can take seconds for some
+tools and is repeated by every node using it. The output of the probe is
+stored under the SiliconCompiler cache directory, keyed by the resolved path,
+modification time and inode of the executable, so the tool is only probed
+again once the executable changes.
+'''
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import uuid
+
+from siliconcompiler import package as sc_package
+
+
+# Executables found in this process, keyed by (exe, search path)
+_found_exes = {}
+
+
+def find_exe(exe, path):
+    '''
+    Returns the full path to an executable, or None if it cannot be found.
+
+    Args:
+        exe (str): name of the executable
+        path (str): search path, as in the PATH environment variable
+    '''
+    key = (exe, path)
+    fullexe = _found_exes.get(key)
+    if fullexe and os.access(fullexe, os.X_OK):
+        return fullexe
+
+    fullexe = shutil.which(exe, path=path)
+    if fullexe:
+        _found_exes[key] = fullexe
+    return fullexe
+
+
+def get_cache_path(chip):
+    '''
+    Returns the path to the directory holding the version probes.
+    '''
+    return os.path.join(sc_package.get_cache_path(chip), 'toolversions')
+
+
+def probe_version(chip, exe, vswitch):
+    '''
+    Runs an executable with its version switch, reusing the output of a
+    previous probe if the executable has not changed.
+
+    Args:
+        chip (Chip): chip to get the cache location from
+        exe (str): full path to the executable
+        vswitch (list of str): version switch
+
+    Returns:
+        tuple of (return code, output)
+    '''
+    entry_path = None
+    try:
+        entry_path = os.path.join(get_cache_path(chip), f'{_get_key(exe, vswitch)}.json')
+        with open(entry_path) as f:
+            entry = json.load(f)
+        return entry['returncode'], entry['output']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    proc = subprocess.run([exe, *vswitch],
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT,
+                          universal_newlines=True)
+
+    # Failures may be transient, so only successful probes are stored
+    if entry_path and proc.returncode == 0:
+        try:
+            _write_entry(entry_path, {
+                'exe': exe,
+                'vswitch': vswitch,
+                'returncode': proc.returncode,
+                'output': proc.stdout
+            })
+        except OSError:
+            pass
+
+    return proc.returncode, proc.stdout
+
+
+def _get_key(exe, vswitch):
+    realexe = os.path.realpath(exe)
+    stat = os.stat(realexe)
+
+    key_data = {
+        'exe': realexe,
+        'mtime': stat.st_mtime_ns,
+        'inode': stat.st_ino,
+        'size': stat.st_size,
+        'vswitch': vswitch
+    }
+
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _write_entry(entry_path, entry):
+    os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+    # Write to a temporary file first so concurrent nodes never read a partial entry
+    tmp_path = f'{entry_path}.{uuid.uuid4().hex}'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, entry_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,121 @@
+# Copyright 2024 Silicon Compiler Authors. All Rights Reserved.
+
+# NOTE: this file cannot rely on any third-party dependencies, including other
+# SC dependencies outside of its directory, since it may be used by tool drivers
+# that have isolated Python environments.
+
+'''
+Binary manifest format.
+
+The configuration dictionary is split into one section per top-level key, so
+a reader only parses the sections it accesses. The file layout is:
+
+- header: magic, format version and number of sections
+- table of contents: for each section, its offset and length in the file and
+  its key
+- sections: compact JSON encoding of the value of each key
+
+All integers are little endian.
+'''
+
+import json
+import struct
+
+
+_MAGIC = b'SCBM'
+_VERSION = 1
+
+# magic, format version, number of sections
+_HEADER = struct.Struct('<4sII')
+# offset, length, length of key
+_ENTRY = struct.Struct('<QQH')
+
+
+def encode_section(value):
+    '''
+    Returns the encoding of the value of a section.
+    '''
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def write(fout, sections):
+    '''
+    Writes a binary manifest.
+
+    Args:
+        fout (file): file opened in binary mode
+        sections (list of (str, bytes)): key and encoded value of each
+            section, see :func:`encode_section`
+    '''
+    keys = [key.encode('utf-8') for key, _ in sections]
+
+    offset = _HEADER.size + sum(_ENTRY.size + len(key) for key in keys)
+    toc = []
+    for key, (_, data) in zip(keys, sections):
+        toc.append(_ENTRY.pack(offset, len(data), len(key)))
+        toc.append(key)
+        offset += len(data)
+
+    fout.write(_HEADER.pack(_MAGIC, _VERSION, len(sections)))
+    fout.write(b''.join(toc))
+    for _, data in sections:
+        fout.write(data)
+
+
+class BinaryManifest:
+    '''
+    Sections of a binary manifest, decoded on first access.
+
+    The file is read once, so later changes to the file do not affect the
+    sections which have not been decoded yet.
+
+    Args:
+        filepath (str): path to the manifest
+
+    Examples:
+        >>> manifest = BinaryManifest('build/gcd/job0/gcd.pkg.scb')
+        >>> manifest.load('design')
+    '''
+
+    def __init__(self, filepath):
+        with open(filepath, 'rb') as f:
+            self.__data = f.read()
+
+        try:
+            magic, version, count = _HEADER.unpack_from(self.__data, 0)
+            if magic != _MAGIC:
+                raise ValueError('not a binary manifest')
+            if version != _VERSION:
+                raise ValueError(f'unsupported format version {version}')
+
+            self.__sections = {}
+            pos = _HEADER.size
+            for _ in range(count):
+                offset, length, key_length = _ENTRY.unpack_from(self.__data, pos)
+                pos += _ENTRY.size
+                key = self.__data[pos:pos + key_length].decode('utf-8')
+                pos += key_length
+                if offset + length > len(self.__data):
+                    raise ValueError(f'section {key} is truncated')
+                self.__sections[key] = (offset, length)
+        except (struct.error, ValueError) as e:
+            raise ValueError(f'Invalid binary manifest {filepath}: {e}') from e
+
+    def keys(self):
+        '''
+        Returns the keys of the sections, in file order.
+        '''
+        return list(self.__sections.keys())
+
+    def raw(self, key):
+        '''
+        Returns the encoded value of a section.
+        '''
+        offset, length = self.__sections[key]
+        return self.__data[offset:offset + length]
+
+    def load(self, key):
+        '''
+        Returns the decoded value of a section.
+        '''
+        return json.loads(self.raw(key))
@@ -11,7 +11,7 @@ try:
 except ImportError:
     from siliconcompiler.schema.utils import trim
 
-SCHEMA_VERSION = '0.40.6'
+SCHEMA_VERSION = '0.40.12'
 
 #############################################################################
 # PARAM DEFINITION
@@ -2043,6 +2043,23 @@ def schema_task(cfg, tool='default', task='default', step='default', index='defa
             by check_manifest() to verify that all parameters have been set up before
             step execution begins.""")
 
+    scparam(cfg, ['tool', tool, 'task', task, 'manifestkeys'],
+            sctype='[str]',
+            pernode='optional',
+            shorthelp="Task: manifest keypaths",
+            switch="-tool_task_manifestkeys 'tool task <str>'",
+            example=[
+                "cli: -tool_task_manifestkeys 'openroad place pdk'",
+                "api: chip.set('tool', 'openroad', 'task', 'place', 'manifestkeys', 'pdk')"],
+            schelp="""
+            List of keypaths read by the task scripts, in addition to the keypaths
+            listed in 'require'. All the parameters under a keypath are
+            included, so 'library' covers the parameters of all the libraries.
+            The list is used to write the manifest of the task when
+            ['option', 'scopedmanifest'] is set, and must cover all the
+            keypaths read by the task scripts. Tasks without a list get
+            the full manifest.""")
+
     metric = 'default'
     scparam(cfg, ['tool', tool, 'task', task, 'report', metric],
             sctype='[file]',
@@ -2482,6 +2499,48 @@ def schema_metric(cfg, step='default', index='default'):
             beginning to end, including data transfers and pre/post
             processing.""")
 
+    metrics = {'mergetime': 'merging the manifests of the node inputs',
+               'hashtime': 'hashing files',
+               'copytime': 'copying the outputs of the node inputs',
+               'checktime': 'checking the manifest',
+               'manifesttime': 'writing the input manifest and the tool manifest',
+               'logtime': 'checking the log file'}
+
+    for item, val in metrics.items():
+        scparam(cfg, ['metric', item],
+                sctype='float',
+                unit='s',
+                shorthelp=f"Metric: {item}",
+                switch=f"-metric_{item} 'step index <float>'",
+                example=[
+                    f"cli: -metric_{item} 'dfm 0 1.0'",
+                    f"api: chip.set('metric', '{item}', 1.0, step='dfm', index=0)"],
+                pernode='required',
+                schelp=f"""
+                Metric tracking the time spent by SiliconCompiler {val} on a
+                per step and index basis. The output manifest of the node is
+                written after the metric is recorded, so it is not included.""")
+
+    metrics = {'bytesread': 'read',
+               'byteswritten': 'written'}
+
+    for item, val in metrics.items():
+        scparam(cfg, ['metric', item],
+                sctype='float',
+                unit='B',
+                shorthelp=f"Metric: {item}",
+                switch=f"-metric_{item} 'step index <float>'",
+                example=[
+                    f"cli: -metric_{item} 'dfm 0 10e6'",
+                    f"api: chip.set('metric', '{item}', 10e6, step='dfm', index=0)"],
+                pernode='required',
+                schelp=f"""
+                Metric tracking the number of bytes {val} by SiliconCompiler
+                on a per step and index basis. It does not include the I/O
+                performed by the EDA executable 'exe'. The output manifest of
+                the node is written after the metric is recorded, so it is not
+                included.""")
+
     item = 'totaltime'
     scparam(cfg, ['metric', item],
             sctype='float',
@@ -2691,6 +2750,38 @@ def schema_option(cfg):
             cache parameter is empty, ".sc/cache" directory in the user's home
             directory will be used.""")
 
+    scparam(cfg, ['option', 'taskcache', 'path'],
+            sctype='str',
+            scope='job',
+            shorthelp="Task result cache directory",
+            switch="-taskcache_path <str>",
+            example=[
+                "cli: -taskcache_path /home/user/.sc/taskcache",
+                "api: chip.set('option', 'taskcache', 'path', '/home/user/.sc/taskcache')"],
+            schelp="""
+            Directory used to store the results of successfully completed tasks.
+            Results are stored under a key computed from the contents of the task
+            inputs, the values of the task's required parameters, the tool version and
+            the environment. When a task computes a key which is already present in
+            the cache, the outputs, reports, logs and metrics are restored from the cache
+            instead of running the tool. The cache can be shared between jobs and build
+            directories. If the parameter is empty, the task cache is disabled.""")
+
+    scparam(cfg, ['option', 'taskcache', 'maxsize'],
+            sctype='int',
+            scope='job',
+            unit='MB',
+            defvalue=10240,
+            shorthelp="Task result cache size limit",
+            switch="-taskcache_maxsize <int>",
+            example=[
+                "cli: -taskcache_maxsize 2048",
+                "api: chip.set('option', 'taskcache', 'maxsize', 2048)"],
+            schelp="""
+            Maximum size, specified in MB, of the task result cache in
+            :keypath:`option, taskcache, path`. When the limit is exceeded, the least
+            recently used entries are removed.""")
+
     scparam(cfg, ['option', 'nice'],
             sctype='int',
             scope='job',
@@ -3156,6 +3247,23 @@ def schema_option(cfg):
             being recorded in the manifest so only turn on this feature
             if you have control of the final manifest.""")
 
+    scparam(cfg, ['option', 'scopedmanifest'],
+            sctype='bool',
+            pernode='optional',
+            scope='job',
+            shorthelp="Enable task scoped manifests",
+            switch="-scopedmanifest <bool>",
+            example=["cli: -scopedmanifest",
+                     "api: chip.set('option', 'scopedmanifest', True)"],
+            schelp="""
+            Limits the TCL manifest of each task to the parameters it uses,
+            which reduces the time taken by the tool to load the manifest.
+            The manifest holds ['design'], ['arg'], ['option'], the flowgraph
+            entry of the node, the parameters of the tool and task, and the
+            parameters under the keypaths listed in the 'require' and
+            'manifestkeys' parameters of the task. Tasks which do not set
+            'manifestkeys' get the full manifest.""")
+
     scparam(cfg, ['option', 'trace'],
             sctype='bool',
             pernode='optional',
@@ -3167,6 +3275,20 @@ def schema_option(cfg):
             schelp="""
             Enables debug tracing during compilation and/or runtime.""")
 
+    scparam(cfg, ['option', 'timeline'],
+            sctype='bool',
+            scope='job',
+            shorthelp="Write run timeline",
+            switch="-timeline <bool>",
+            example=["cli: -timeline",
+                     "api: chip.set('option', 'timeline', True)"],
+            schelp="""
+            Writes a timeline of the run to <design>.timeline.json in the job
+            directory. The file uses the trace event format and can be loaded in
+            chrome://tracing or Perfetto. Each node is shown on its own track, covering
+            the time spent waiting to be scheduled, setting up the node, running the
+            tool and finalizing the node.""")
+
     scparam(cfg, ['option', 'skipall'],
             sctype='bool',
             scope='job',
@@ -3520,6 +3642,21 @@ def schema_option(cfg):
             Maximum number of concurrent nodes to run in a job. If not set this will default
             to the number of cpu cores available.""")
 
+    scparam(cfg, ['option', 'scheduler', 'maxmemory'],
+            sctype='int',
+            unit='MB',
+            shorthelp="Option: Maximum memory for concurrent nodes",
+            switch="-maxmemory <int>",
+            example=["cli: -maxmemory 16000",
+                     "api: chip.set('option', 'scheduler', 'maxmemory', 16000)"],
+            schelp="""
+            Maximum amount of memory, specified in MB, that the nodes running concurrently
+            on the local machine may use. A node is only started once its estimated peak
+            memory fits in the remaining budget. The estimate is taken from the memory
+            metric recorded by previous jobs and falls back to
+            :keypath:`option, scheduler, memory` when no record is available. If not set
+            this will default to the physical memory of the machine.""")
+
     return cfg
 
 
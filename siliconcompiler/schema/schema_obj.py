@@ -22,8 +22,15 @@ try:
 except ImportError:
     _has_yaml = False
 
+try:
+    import orjson
+    _has_orjson = True
+except ImportError:
+    _has_orjson = False
+
 from .schema_cfg import schema_cfg
-from .utils import escape_val_tcl, PACKAGE_ROOT
+from .utils import escape_val_tcl, PACKAGE_ROOT, ReadOnlyList
+from . import binary_manifest
 
 
 class Schema:
@@ -50,15 +57,36 @@ class Schema:
     GLOBAL_KEY = 'global'
     PERNODE_FIELDS = ('value', 'filehash', 'date', 'author', 'signature', 'package')
 
+    # Schema class -> default configuration dictionary, built once per process
+    # and shared by all the schemas initialized to default values
+    _templates = {}
+
+    # Type string -> function normalizing values of that type
+    __normalizers = {}
+
+    # Key of a job in the history of a manifest holding the name of the job
+    # it is written relative to, see __manifest_cfg()
+    _HISTORY_BASE_KEY = '__base__'
+
     def __init__(self, cfg=None, manifest=None, logger=None):
         if cfg is not None and manifest is not None:
             raise ValueError('You may not specify both cfg and manifest')
 
         self._init_logger(logger)
 
+        self._init_index()
+        self._init_sharing()
+        self._init_changes()
+        self._lazy = {}
+
+        if manifest is not None and Schema.__is_binary_manifest(str(manifest)):
+            self.__read_binary_manifest_file(str(manifest))
+            return
+
         if manifest is not None:
             # Normalize value to string in case we receive a pathlib.Path
             cfg = Schema.__read_manifest_file(str(manifest))
+            Schema.__expand_history(cfg)
         else:
             cfg = copy.deepcopy(cfg)
 
@@ -66,18 +94,271 @@ class Schema:
             try:
                 if Schema._dict_requires_normalization(cfg):
                     cfg = Schema._dict_to_schema(cfg)
+                Schema.__share_template(cfg, self.__get_template())
                 self.cfg = cfg
             except (TypeError, ValueError) as e:
                 raise ValueError('Attempting to read manifest with '
                                  f'incompatible schema version: {e}') \
                     from e
         else:
-            self.cfg = self._init_schema_cfg()
+            # Start out sharing the default configuration, which is copied
+            # where it is modified
+            self._cfg = self.__get_template()
+            self._shared = True
 
     ###########################################################################
     def _init_schema_cfg(self):
         return schema_cfg()
 
+    ###########################################################################
+    def __get_template(self):
+        schema_type = type(self)
+        if schema_type not in Schema._templates:
+            Schema._templates[schema_type] = self._init_schema_cfg()
+        return Schema._templates[schema_type]
+
+    ###########################################################################
+    @staticmethod
+    def __share_template(cfg, template, root=True):
+        '''
+        Replaces the fields of the parameters in cfg which are equal to the
+        fields of the default configuration with the fields of the default
+        configuration, so they are only stored once.
+
+        Args:
+            cfg (dict): configuration dictionary, which must not be shared
+            template (dict): default configuration dictionary matching cfg
+            root (bool): if True, cfg is a top-level configuration dictionary
+        '''
+        if Schema._is_leaf(cfg):
+            if not Schema._is_leaf(template):
+                return
+
+            for field, value in cfg.items():
+                if field == 'node' or field not in template:
+                    continue
+                default = template[field]
+                if type(value) is type(default) and value == default:
+                    cfg[field] = default
+
+            node = cfg['node']
+            if node.get('default') == template['node']['default']:
+                node['default'] = template['node']['default']
+            default_fields = node['default']['default']
+            for step, step_cfg in node.items():
+                if step == 'default':
+                    continue
+                for fields in step_cfg.values():
+                    for field, value in fields.items():
+                        # Only empty lists are shared, since equal values may
+                        # have different types, such as 1 and 1.0
+                        if value == [] and default_fields.get(field) == []:
+                            fields[field] = default_fields[field]
+            return
+
+        if Schema._is_leaf(template):
+            return
+
+        for key, subcfg in cfg.items():
+            if root and key == 'history':
+                # Jobs are subschemas, which hold the parameters recorded for
+                # the job and share the others with the default configuration
+                for job, subschema in subcfg.items():
+                    Schema.__share_template(subschema, template)
+                    subcfg[job] = Schema.__on_template(subschema, template)
+            elif root and key == 'library':
+                # Libraries are subschemas
+                for subschema in subcfg.values():
+                    Schema.__share_template(subschema, template)
+            elif key in template:
+                Schema.__share_template(subcfg, template[key], root=False)
+            elif 'default' in template:
+                Schema.__share_template(subcfg, template['default'], root=False)
+
+    ###########################################################################
+    @staticmethod
+    def __on_template(cfg, template):
+        '''
+        Returns cfg completed with the dictionaries of the default
+        configuration which it does not hold. The dictionaries added are
+        shared with the default configuration, so they must be copied before
+        being modified, see history().
+        '''
+        if Schema._is_leaf(cfg) or Schema._is_leaf(template):
+            return cfg
+
+        completed = template.copy()
+        for key, subcfg in cfg.items():
+            if key in template:
+                completed[key] = Schema.__on_template(subcfg, template[key])
+            elif 'default' in template:
+                completed[key] = Schema.__on_template(subcfg, template['default'])
+            else:
+                completed[key] = subcfg
+        return completed
+
+    @staticmethod
+    def __history_param(cfg):
+        '''
+        Returns the fields of a parameter which are recorded in history.
+        '''
+        return {field: value for field, value in cfg.items()
+                if field not in ('example', 'switch', 'help')}
+
+    @staticmethod
+    def __off_template(cfg, template):
+        '''
+        Returns cfg without the dictionaries which are equal to the ones of
+        the default configuration, which is the inverse of __on_template().
+        '''
+        if Schema._is_leaf(cfg):
+            return Schema.__history_param(cfg)
+        if Schema._is_leaf(template):
+            return cfg
+
+        trimmed = {}
+        for key, subcfg in cfg.items():
+            if key in template:
+                if subcfg is template[key] or subcfg == template[key]:
+                    continue
+                trimmed[key] = Schema.__off_template(subcfg, template[key])
+            elif 'default' in template:
+                trimmed[key] = Schema.__off_template(subcfg, template['default'])
+            else:
+                trimmed[key] = subcfg
+        return trimmed
+
+    @staticmethod
+    def __off_base(cfg, base):
+        '''
+        Returns the differences of cfg from base, where the keys of base which
+        are not in cfg are set to None.
+        '''
+        if Schema._is_leaf(cfg):
+            return Schema.__history_param(cfg)
+        if Schema._is_leaf(base):
+            return cfg
+
+        delta = {}
+        for key, subcfg in cfg.items():
+            if key not in base:
+                delta[key] = subcfg
+            elif not (subcfg is base[key] or subcfg == base[key]):
+                delta[key] = Schema.__off_base(subcfg, base[key])
+        for key in base:
+            if key not in cfg:
+                delta[key] = None
+        return delta
+
+    @staticmethod
+    def __on_base(delta, base):
+        '''
+        Returns base updated with delta, which is the inverse of __off_base().
+        The dictionaries of base which are not updated are shared.
+        '''
+        if Schema._is_leaf(delta) or Schema._is_leaf(base):
+            return delta
+
+        cfg = base.copy()
+        for key, subdelta in delta.items():
+            if subdelta is None:
+                cfg.pop(key, None)
+            elif key in base:
+                cfg[key] = Schema.__on_base(subdelta, base[key])
+            else:
+                cfg[key] = subdelta
+        return cfg
+
+    @staticmethod
+    def __expand_history(cfg):
+        '''
+        Replaces the jobs of a manifest written relative to a previous job
+        with the complete jobs.
+        '''
+        history = cfg.get('history')
+        if not history:
+            return
+
+        for job, job_cfg in history.items():
+            base_job = job_cfg.pop(Schema._HISTORY_BASE_KEY, None)
+            if base_job is not None:
+                history[job] = Schema.__on_base(job_cfg, history[base_job])
+
+    ###########################################################################
+    @property
+    def cfg(self):
+        self._load_sections()
+
+        # The configuration dictionary may be modified directly by the caller,
+        # so it cannot be shared with copies of this schema anymore
+        if self._shared:
+            self._cfg = copy.deepcopy(self._cfg)
+            self._init_sharing()
+        # Any parameter may be modified or replaced by the caller
+        self._clear_index()
+        self._changes = None
+        return self._cfg
+
+    @cfg.setter
+    def cfg(self, cfg):
+        self._cfg = cfg
+        self._lazy = {}
+        self._init_sharing()
+        self._clear_index()
+        self._changes = None
+
+    ###########################################################################
+    def _init_sharing(self):
+        # True if parts of the configuration dictionary may be shared with
+        # copies of this schema, in which case they are copied before being
+        # modified.
+        self._shared = False
+        # id -> dictionary, for dictionaries known to belong only to this
+        # schema while it is shared. Leaves are copied as a whole, so their
+        # contents belong to this schema as well. Holding the dictionaries
+        # keeps their ids from being reused.
+        self._owned = {}
+
+    ###########################################################################
+    def _init_index(self):
+        # Keypath tuple -> dictionary found by _search(), for keypaths where
+        # every key is present in the configuration
+        self._index = {}
+        # Keypath tuple -> dictionary found by _search(), for keypaths which
+        # fall back to 'default' templates. These must be dropped whenever a
+        # key is inserted, since the inserted key takes precedence over the
+        # template.
+        self._default_index = {}
+
+    def _clear_index(self):
+        '''
+        Drops the keypath index.
+
+        This must be called after structural changes made directly to the
+        configuration dictionary, such as replacing or removing subtrees.
+        '''
+        self._index.clear()
+        self._default_index.clear()
+
+    ###########################################################################
+    def _init_changes(self):
+        # Keypaths passed to _search() to modify the configuration since
+        # _pop_changes() was last called. Every parameter under these
+        # keypaths may have changed. None if the changes are not known.
+        self._changes = None
+
+    def _pop_changes(self):
+        '''
+        Returns the keypaths under which parameters may have changed since
+        the last call, and starts tracking changes from now on.
+
+        Returns:
+            set of keypath tuples, or None if any parameter may have changed.
+        '''
+        changes = self._changes
+        self._changes = set()
+        return changes
+
     ###########################################################################
     @staticmethod
     def _dict_to_schema_set(cfg, *key):
@@ -153,6 +434,8 @@ class Schema:
 
     ###########################################################################
     def _merge_with_init_schema(self):
+        self._load_sections()
+
         new_schema = Schema()
 
         for keylist in self.allkeys():
@@ -183,19 +466,82 @@ class Schema:
                                    self.get(*keylist, step=step, index=index, field=field),
                                    step=step, index=index, field=field)
 
-        if 'library' in self.cfg:
+        if 'library' in self._cfg:
             # Handle libraries seperately
-            for library in self.cfg['library'].keys():
+            for library in self._cfg['library'].keys():
                 lib_schema = Schema(cfg=self.getdict('library', library))
                 lib_schema._merge_with_init_schema()
                 new_schema.cfg['library'][library] = lib_schema.cfg
 
-        if 'history' in self.cfg:
+        if 'history' in self._cfg:
             # Copy over history
             new_schema.cfg['history'] = self.cfg['history']
 
         self.cfg = new_schema.cfg
 
+    ###########################################################################
+    @staticmethod
+    def __is_binary_manifest(filepath):
+        return re.search(r'\.scb$', filepath, flags=re.IGNORECASE) is not None
+
+    ###########################################################################
+    def __read_binary_manifest_file(self, filepath):
+        if not os.path.isfile(filepath):
+            raise ValueError(f'Manifest file not found {filepath}')
+
+        manifest = binary_manifest.BinaryManifest(filepath)
+
+        # Sections are only decoded once they are accessed
+        self._cfg = {}
+        self._lazy = {key: manifest for key in manifest.keys()}
+
+    ###########################################################################
+    def _load_sections(self, *keys):
+        '''
+        Decodes the sections of a binary manifest which have not been
+        accessed yet into the configuration dictionary.
+
+        Args:
+            keys (list of str): top-level keys of the sections to decode, if
+                empty all the sections are decoded.
+        '''
+        if not self._lazy:
+            return
+
+        if not keys:
+            keys = list(self._lazy.keys())
+
+        for key in keys:
+            manifest = self._lazy.pop(key, None)
+            if manifest is None:
+                continue
+
+            section = {key: manifest.load(key)}
+            Schema.__expand_history(section)
+            try:
+                if Schema._dict_requires_normalization(section):
+                    Schema._dict_to_schema(section)
+            except (TypeError, ValueError) as e:
+                raise ValueError('Attempting to read manifest with '
+                                 f'incompatible schema version: {e}') \
+                    from e
+            Schema.__share_template(section, self.__get_template())
+
+            if self._shared:
+                # Sections are added to the top-level dictionary, which may be
+                # shared with copies of this schema
+                self._cfg = self.__own(self._cfg)
+                self._clear_index()
+            self._cfg[key] = section[key]
+
+    ###########################################################################
+    def _has_section(self, key):
+        '''
+        Returns True if the schema has the top-level key, without decoding its
+        section of a binary manifest.
+        '''
+        return key in self._lazy or key in self._cfg
+
     ###########################################################################
     @staticmethod
     def __read_manifest_file(filepath):
@@ -221,14 +567,18 @@ class Schema:
 
         return localcfg
 
-    def get(self, *keypath, field='value', job=None, step=None, index=None):
+    def get(self, *keypath, field='value', job=None, step=None, index=None, copy=True):
         """
         Returns a schema parameter field.
 
         See :meth:`~siliconcompiler.core.Chip.get` for detailed documentation.
         """
+        value = self.__get(*keypath, field=field, job=job, step=step, index=index)
+
         # Prevent accidental modifications of the schema content by not passing a reference
-        return copy.copy(self.__get(*keypath, field=field, job=job, step=step, index=index))
+        if isinstance(value, list):
+            return value.copy() if copy else ReadOnlyList(value)
+        return value
 
     ###########################################################################
     def __get(self, *keypath, field='value', job=None, step=None, index=None):
@@ -245,7 +595,15 @@ class Schema:
         if isinstance(index, int):
             index = str(index)
 
-        if field in self.PERNODE_FIELDS:
+        return Schema.__get_field(cfg, field, step, index)
+
+    @staticmethod
+    def __get_field(cfg, field, step, index):
+        '''
+        Returns a field of a parameter, falling back to the global and default
+        values of pernode fields.
+        '''
+        if field in Schema.PERNODE_FIELDS:
             try:
                 return cfg['node'][step][index][field]
             except KeyError:
@@ -253,12 +611,12 @@ class Schema:
                     return cfg['node']['default']['default'][field]
 
             try:
-                return cfg['node'][step][self.GLOBAL_KEY][field]
+                return cfg['node'][step][Schema.GLOBAL_KEY][field]
             except KeyError:
                 pass
 
             try:
-                return cfg['node'][self.GLOBAL_KEY][self.GLOBAL_KEY][field]
+                return cfg['node'][Schema.GLOBAL_KEY][Schema.GLOBAL_KEY][field]
             except KeyError:
                 return cfg['node']['default']['default'][field]
         elif field in cfg:
@@ -266,6 +624,81 @@ class Schema:
         else:
             raise ValueError(f'Invalid field {field}')
 
+    ###########################################################################
+    def get_many(self, *keypath, field='value', nodes=None, job=None, copy=True):
+        '''
+        Returns a field of all the parameters matching a keypath pattern.
+
+        See :meth:`~siliconcompiler.core.Chip.query` for detailed documentation.
+        '''
+        if nodes is not None:
+            nodes = [(step, str(index) if isinstance(index, int) else index)
+                     for step, index in nodes]
+
+        values = {}
+        for param_keypath, cfg in self.__match(keypath, job):
+            pernode = cfg['pernode']
+            if nodes is None or pernode == 'never' or field not in self.PERNODE_FIELDS:
+                err = Schema._validate_step_index(pernode, field, None, None)
+                if err:
+                    raise ValueError(f'Invalid args to get_many() of keypath {param_keypath}: '
+                                     f'{err}')
+                value = Schema.__get_field(cfg, field, None, None)
+                if isinstance(value, list):
+                    value = value.copy() if copy else ReadOnlyList(value)
+                if nodes is None:
+                    values[param_keypath] = value
+                else:
+                    values[param_keypath] = {node: value for node in nodes}
+                continue
+
+            node_values = {}
+            for step, index in nodes:
+                err = Schema._validate_step_index(pernode, field, step, index)
+                if err:
+                    raise ValueError(f'Invalid args to get_many() of keypath {param_keypath}: '
+                                     f'{err}')
+                value = Schema.__get_field(cfg, field, step, index)
+                if isinstance(value, list):
+                    value = value.copy() if copy else ReadOnlyList(value)
+                node_values[(step, index)] = value
+            values[param_keypath] = node_values
+
+        return values
+
+    def __match(self, pattern, job):
+        '''
+        Yields the keypath and dictionary of each parameter matching a keypath
+        pattern, where '*' matches any key.
+        '''
+        # Only the keys after the first wildcard need to be matched against
+        # the dictionary, the prefix can be looked up directly
+        prefix = pattern[:pattern.index('*')] if '*' in pattern else pattern
+        cfg = self._search(*prefix, job=job)
+
+        def walk(cfg, keypath, rest):
+            if not rest:
+                if not Schema._is_leaf(cfg):
+                    raise ValueError(f'Invalid keypath {keypath}: get_many() '
+                                     'must be called on complete keypaths')
+                yield keypath, cfg
+                return
+
+            if Schema._is_leaf(cfg):
+                return
+
+            key = rest[0]
+            if key == '*':
+                for child in cfg:
+                    if child != 'default':
+                        yield from walk(cfg[child], (*keypath, child), rest[1:])
+            elif key in cfg:
+                yield from walk(cfg[key], (*keypath, key), rest[1:])
+            elif 'default' in cfg:
+                yield from walk(cfg['default'], (*keypath, key), rest[1:])
+
+        yield from walk(cfg, tuple(prefix), pattern[len(prefix):])
+
     ###########################################################################
     def set(self, *args, field='value', clobber=True, step=None, index=None):
         '''
@@ -275,7 +708,7 @@ class Schema:
         '''
 
         keypath = args[:-1]
-        cfg = self._search(*keypath, insert_defaults=True)
+        cfg = self._search(*keypath, insert_defaults=True, modify=True)
 
         return self._set(*args, logger=self.logger, cfg=cfg, field=field, clobber=clobber,
                          step=step, index=index)
@@ -323,16 +756,147 @@ class Schema:
             step = step if step is not None else Schema.GLOBAL_KEY
             index = index if index is not None else Schema.GLOBAL_KEY
 
-            if step not in cfg['node']:
-                cfg['node'][step] = {}
-            if index not in cfg['node'][step]:
-                cfg['node'][step][index] = copy.deepcopy(cfg['node']['default']['default'])
-            cfg['node'][step][index][field] = value
+            Schema.__node_fields(cfg, step, index)[field] = value
         else:
             cfg[field] = value
 
         return True
 
+    ###########################################################################
+    @staticmethod
+    def __node_fields(cfg, step, index):
+        '''
+        Returns the per-node fields of a parameter for a step and index,
+        adding them if needed.
+
+        The fields of a new node start out sharing the default values.
+        '''
+        try:
+            return cfg['node'][step][index]
+        except KeyError:
+            pass
+
+        node_fields = cfg['node']['default']['default'].copy()
+        cfg['node'].setdefault(step, {})[index] = node_fields
+        return node_fields
+
+    ###########################################################################
+    @staticmethod
+    def _copy_cfg(cfg):
+        '''
+        Returns a copy of a configuration dictionary.
+
+        The values of the fields and the default per-node fields are not
+        modified in place, so they are shared with cfg rather than copied,
+        which is faster than copy.deepcopy() and keeps the copy small.
+        '''
+        if Schema._is_leaf(cfg):
+            param = cfg.copy()
+            param['node'] = {
+                step: step_cfg if step == 'default' else
+                {index: fields.copy() for index, fields in step_cfg.items()}
+                for step, step_cfg in cfg['node'].items()}
+            return param
+
+        return {key: Schema._copy_cfg(subcfg) for key, subcfg in cfg.items()}
+
+    ###########################################################################
+    def _merge_params(self, src, clobber=True, clear=True, skip_fields=(), keypath_filter=None):
+        '''
+        Merges the parameters of a schema of the same version into this
+        schema with _merge_param(). History, libraries and keypaths with
+        'default' are skipped.
+
+        Args:
+            src (Schema): schema to merge
+            clobber (bool): if False, values which are already set are kept
+            clear (bool): if False, list values and fields are extended
+            skip_fields (list of str): fields, other than the per-node fields,
+                which are not merged
+            keypath_filter (function): called with the keypath and dictionary
+                of each parameter, which is only merged if it returns True
+        '''
+        # History and libraries are not merged, so their sections are not decoded
+        sections = [key for key in src._lazy if key not in ('history', 'library')]
+        if sections:
+            src._load_sections(*sections)
+
+        for keypath, src_cfg in Schema.__iter_params(src._cfg, ()):
+            if keypath_filter and not keypath_filter(keypath, src_cfg):
+                continue
+            self._merge_param(src_cfg, *keypath,
+                              clobber=clobber,
+                              append=not clear and src_cfg['type'].startswith('['),
+                              skip_fields=skip_fields)
+
+    @staticmethod
+    def __iter_params(cfg, keypath):
+        for key, subcfg in cfg.items():
+            if key == 'default':
+                continue
+            if not keypath and key in ('history', 'library'):
+                continue
+            if Schema._is_leaf(subcfg):
+                yield (*keypath, key), subcfg
+            else:
+                yield from Schema.__iter_params(subcfg, (*keypath, key))
+
+    ###########################################################################
+    def _merge_param(self, src_cfg, *keypath, clobber=True, append=False, skip_fields=()):
+        '''
+        Merges a parameter of a schema of the same version into this schema.
+
+        This is equivalent to calling set(), or add() if append is True, with
+        each per-node value and field of the parameter, followed by set() with
+        each of its other fields, but the values are not checked and
+        normalized again.
+
+        Args:
+            src_cfg (dict): parameter to merge, as returned by _search()
+            keypath (list of str): keypath of the parameter in this schema
+            clobber (bool): if False, values which are already set are kept
+            append (bool): if True, list values and fields are extended
+            skip_fields (list of str): fields, other than the per-node fields,
+                which are not merged
+        '''
+        cfg = self._search(*keypath, insert_defaults=True, modify=True)
+
+        if not cfg['lock']:
+            for step, step_cfg in src_cfg['node'].items():
+                if step == 'default':
+                    continue
+                for index, src_fields in step_cfg.items():
+                    if 'value' not in src_fields:
+                        continue
+
+                    keep_value = not append and not clobber and Schema._is_set(
+                        cfg,
+                        step=None if step == Schema.GLOBAL_KEY else step,
+                        index=None if index == Schema.GLOBAL_KEY else index)
+
+                    node_fields = Schema.__node_fields(cfg, step, index)
+
+                    # Per-node fields are independent, so their order does not matter
+                    for field, value in src_fields.items():
+                        if keep_value and field == 'value':
+                            continue
+                        if append:
+                            if value is not None:
+                                node_fields[field] = node_fields[field] + value
+                        else:
+                            # Values are not modified in place, so they are shared
+                            node_fields[field] = value
+
+        locked = cfg['lock']
+        for field, value in src_cfg.items():
+            if field == 'node' or field in skip_fields:
+                continue
+            if locked and field != 'lock':
+                continue
+            if field == 'lock':
+                locked = value
+            cfg[field] = value
+
     ###########################################################################
     def add(self, *args, field='value', step=None, index=None):
         '''
@@ -343,7 +907,7 @@ class Schema:
         keypath = args[:-1]
         value = args[-1]
 
-        cfg = self._search(*keypath, insert_defaults=True)
+        cfg = self._search(*keypath, insert_defaults=True, modify=True)
 
         if not Schema._is_leaf(cfg):
             raise ValueError(f'Invalid keypath {keypath}: add() '
@@ -375,14 +939,10 @@ class Schema:
             modified_step = step if step is not None else self.GLOBAL_KEY
             modified_index = index if index is not None else self.GLOBAL_KEY
 
-            if modified_step not in cfg['node']:
-                cfg['node'][modified_step] = {}
-            if modified_index not in cfg['node'][modified_step]:
-                cfg['node'][modified_step][modified_index] = copy.deepcopy(
-                    cfg['node']['default']['default'])
-            cfg['node'][modified_step][modified_index][field].extend(value)
+            node_fields = Schema.__node_fields(cfg, modified_step, modified_index)
+            node_fields[field] = node_fields[field] + value
         else:
-            cfg[field].extend(value)
+            cfg[field] = cfg[field] + value
 
         return True
 
@@ -458,7 +1018,7 @@ class Schema:
             self.logger.error(f'Cannot remove default keypath: {keypath}')
             return
 
-        cfg = self._search(*search_path)
+        cfg = self._search(*search_path, modify=True)
         if 'default' not in cfg:
             self.logger.error(f'Cannot remove a non-default keypath: {keypath}')
             return
@@ -474,6 +1034,7 @@ class Schema:
                 return
 
         del cfg[removal_key]
+        self._clear_index()
 
     ###########################################################################
     def unset(self, *keypath, step=None, index=None):
@@ -482,7 +1043,7 @@ class Schema:
 
         See :meth:`~siliconcompiler.core.Chip.unset` for detailed documentation.
         '''
-        cfg = self._search(*keypath)
+        cfg = self._search(*keypath, modify=True)
 
         if not Schema._is_leaf(cfg):
             raise ValueError(f'Invalid keypath {keypath}: unset() '
@@ -586,7 +1147,10 @@ class Schema:
         else:
             default = None
 
-        cfg = self.cfg
+        if keylist:
+            self._load_sections(keylist[0])
+
+        cfg = self._cfg
         for key in keylist:
             if key in cfg:
                 cfg = cfg[key]
@@ -609,22 +1173,51 @@ class Schema:
         '''
         Copies all non-empty parameters from current job into the history
         dictionary.
+
+        Parameters which are equal to the ones recorded for the previous job
+        are shared with it rather than copied, and the parameters which were
+        not recorded are shared with the default configuration.
         '''
 
         # initialize new dict
         jobname = self.get('option', 'jobname')
-        self.cfg['history'][jobname] = {}
+        history = self._search('history', modify=True)
+        previous_jobs = [job for job in history if job != jobname]
+        previous = history[previous_jobs[-1]] if previous_jobs else {}
+
+        self._load_sections()
+        job_cfg = {}
+        for key, cfg in Schema.__iter_leaves(self._cfg, ()):
+            scope = self.get(*key, field='scope')
+            if self._is_empty(*key) or scope != 'job':
+                continue
 
-        # copy in all empty values of scope job
-        allkeys = self.allkeys()
-        for key in allkeys:
-            # ignore history in case of cumulative history
-            if key[0] != 'history':
-                scope = self.get(*key, field='scope')
-                if not self._is_empty(*key) and (scope == 'job'):
-                    self._copyparam(self.cfg,
-                                    self.cfg['history'][jobname],
-                                    key)
+            # Fields are not modified in place, so they are shared with the
+            # current job
+            param = Schema.__history_param(Schema._copy_cfg(cfg))
+
+            dest = job_cfg
+            prev = previous
+            for subkey in key[:-1]:
+                dest = dest.setdefault(subkey, {})
+                prev = prev.get(subkey, {})
+            prev = prev.get(key[-1])
+            if prev is not None and Schema._is_leaf(prev) and prev == param:
+                param = prev
+            dest[key[-1]] = param
+
+        history[jobname] = Schema.__on_template(job_cfg, self.__get_template())
+
+    @staticmethod
+    def __iter_leaves(cfg, keypath):
+        for key, subcfg in cfg.items():
+            if not keypath and key == 'history':
+                # ignore history in case of cumulative history
+                continue
+            if Schema._is_leaf(subcfg):
+                yield (*keypath, key), subcfg
+            else:
+                yield from Schema.__iter_leaves(subcfg, (*keypath, key))
 
     @staticmethod
     def _check_and_normalize(value, sc_type, field, keypath, allowed_values):
@@ -667,81 +1260,119 @@ class Schema:
 
     @staticmethod
     def _normalize_value(value, sc_type, error_msg, allowed_values):
+        try:
+            normalize = Schema.__normalizers[sc_type]
+        except KeyError:
+            normalize = Schema.__compile_normalizer(sc_type)
+            Schema.__normalizers[sc_type] = normalize
+
+        return normalize(value, error_msg, allowed_values)
+
+    @staticmethod
+    def __compile_normalizer(sc_type):
+        '''
+        Returns a function normalizing values of a type, so the type string is
+        parsed once rather than on every call to set() and add().
+        '''
         if sc_type.startswith('['):
-            base_type = sc_type[1:-1]
+            normalize_item = Schema.__compile_normalizer(sc_type[1:-1])
 
-            # Need to try 2 different recursion strategies - if value is a list already, then we can
-            # recurse on it directly. However, if that doesn't work, then it might be a
-            # list-of-lists/tuples that needs to be wrapped in an outer list, so we try that.
-            if isinstance(value, (list, set, tuple)):
-                try:
-                    return [Schema._normalize_value(v, base_type, error_msg, allowed_values)
-                            for v in value]
-                except TypeError:
-                    pass
+            def normalize_list(value, error_msg, allowed_values):
+                # Need to try 2 different recursion strategies - if value is a list already, then
+                # we can recurse on it directly. However, if that doesn't work, then it might be a
+                # list-of-lists/tuples that needs to be wrapped in an outer list, so we try that.
+                if isinstance(value, (list, set, tuple)):
+                    try:
+                        return [normalize_item(v, error_msg, allowed_values) for v in value]
+                    except TypeError:
+                        pass
 
-            value = [value]
-            return [Schema._normalize_value(v, base_type, error_msg, allowed_values) for v in value]
+                return [normalize_item(value, error_msg, allowed_values)]
+            return normalize_list
 
         if sc_type.startswith('('):
             # TODO: make parsing more robust to support tuples-of-tuples
-            if isinstance(value, str):
-                value = value[1:-1].split(',')
-            elif not (isinstance(value, tuple) or isinstance(value, list)):
-                raise TypeError(error_msg)
-
-            base_types = sc_type[1:-1].split(',')
-            if len(value) != len(base_types):
-                raise TypeError(error_msg)
-            return tuple(Schema._normalize_value(v, base_type, error_msg, allowed_values)
-                         for v, base_type in zip(value, base_types))
-
-        if sc_type == 'bool':
-            if value == 'true':
-                return True
-            if value == 'false':
-                return False
-            if isinstance(value, bool):
-                return value
-            if isinstance(value, (int, float)):
-                return value != 0
-            raise TypeError(error_msg)
+            normalize_items = [Schema.__compile_normalizer(base_type)
+                               for base_type in sc_type[1:-1].split(',')]
+
+            def normalize_tuple(value, error_msg, allowed_values):
+                if isinstance(value, str):
+                    value = value[1:-1].split(',')
+                elif not (isinstance(value, tuple) or isinstance(value, list)):
+                    raise TypeError(error_msg)
+
+                if len(value) != len(normalize_items):
+                    raise TypeError(error_msg)
+                return tuple(normalize_item(v, error_msg, allowed_values)
+                             for v, normalize_item in zip(value, normalize_items))
+            return normalize_tuple
+
+        normalizers = {
+            'bool': Schema.__normalize_bool,
+            'int': Schema.__normalize_int,
+            'float': Schema.__normalize_float,
+            'str': Schema.__normalize_str,
+            'file': Schema.__normalize_path,
+            'dir': Schema.__normalize_path,
+            'enum': Schema.__normalize_enum
+        }
+        if sc_type not in normalizers:
+            raise ValueError(f'Invalid type specifier: {sc_type}')
+        return normalizers[sc_type]
 
+    @staticmethod
+    def __normalize_bool(value, error_msg, allowed_values):
+        if value == 'true':
+            return True
+        if value == 'false':
+            return False
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return value != 0
+        raise TypeError(error_msg)
+
+    @staticmethod
+    def __normalize_int(value, error_msg, allowed_values):
         try:
-            if sc_type == 'int':
-                return int(value)
+            return int(value)
+        except TypeError:
+            raise TypeError(error_msg) from None
 
-            if sc_type == 'float':
-                return float(value)
+    @staticmethod
+    def __normalize_float(value, error_msg, allowed_values):
+        try:
+            return float(value)
         except TypeError:
             raise TypeError(error_msg) from None
 
-        if sc_type == 'str':
-            if isinstance(value, str):
-                return value
-            elif isinstance(value, bool):
-                return str(value).lower()
-            elif isinstance(value, (list, tuple)):
-                raise TypeError(error_msg)
-            else:
-                return str(value)
+    @staticmethod
+    def __normalize_str(value, error_msg, allowed_values):
+        if isinstance(value, str):
+            return value
+        elif isinstance(value, bool):
+            return str(value).lower()
+        elif isinstance(value, (list, tuple)):
+            raise TypeError(error_msg)
+        else:
+            return str(value)
 
-        if sc_type in ('file', 'dir'):
-            if isinstance(value, (str, pathlib.Path)):
-                return str(value)
-            else:
-                raise TypeError(error_msg)
-
-        if sc_type == 'enum':
-            if isinstance(value, str):
-                if value in allowed_values:
-                    return value
-                valid = ", ".join(allowed_values)
-                raise ValueError(error_msg + f", and value of {valid}")
-            else:
-                raise TypeError(error_msg)
+    @staticmethod
+    def __normalize_path(value, error_msg, allowed_values):
+        if isinstance(value, (str, pathlib.Path)):
+            return str(value)
+        else:
+            raise TypeError(error_msg)
 
-        raise ValueError(f'Invalid type specifier: {sc_type}')
+    @staticmethod
+    def __normalize_enum(value, error_msg, allowed_values):
+        if isinstance(value, str):
+            if value in allowed_values:
+                return value
+            valid = ", ".join(allowed_values)
+            raise ValueError(error_msg + f", and value of {valid}")
+        else:
+            raise TypeError(error_msg)
 
     @staticmethod
     def _normalize_field(value, sc_type, field, keypath):
@@ -887,12 +1518,77 @@ class Schema:
 
         return None
 
-    def _search(self, *keypath, insert_defaults=False, job=None):
+    def _search(self, *keypath, insert_defaults=False, job=None, modify=False):
+        if self._lazy:
+            if job is not None:
+                self._load_sections('history')
+            else:
+                # An empty keypath returns the top-level dictionary, which
+                # needs all the sections
+                self._load_sections(*keypath[:1])
+
+        if modify or insert_defaults:
+            if self._changes is not None:
+                try:
+                    if job is not None:
+                        self._changes.add(('history', job, *keypath))
+                    else:
+                        self._changes.add(keypath)
+                except TypeError:
+                    # Keys which are not strings are reported below
+                    pass
+
+            # Jobs share parameters with each other, see history()
+            if job is not None:
+                return self.history(job)._search(*keypath, insert_defaults=insert_defaults,
+                                                 modify=True)
+            if len(keypath) > 1 and keypath[0] == 'history':
+                return self.history(keypath[1])._search(*keypath[2:],
+                                                        insert_defaults=insert_defaults,
+                                                        modify=True)
+
+        if self._shared and (modify or insert_defaults):
+            return self.__search_owned(keypath, insert_defaults, job)
+
         if job is not None:
-            cfg = self.cfg['history'][job]
+            # History is not indexed since jobs are replaced as a whole
+            return Schema.__search(self._cfg['history'][job], keypath, insert_defaults)[0]
+        if keypath and keypath[0] == 'history':
+            return Schema.__search(self._cfg, keypath, insert_defaults)[0]
+
+        try:
+            return self._index[keypath]
+        except (KeyError, TypeError):
+            pass
+
+        if not insert_defaults:
+            try:
+                return self._default_index[keypath]
+            except (KeyError, TypeError):
+                pass
+
+        cfg, inserted, uses_default = Schema.__search(self._cfg, keypath, insert_defaults)
+        if inserted:
+            self._default_index.clear()
+
+        if uses_default:
+            self._default_index[keypath] = cfg
         else:
-            cfg = self.cfg
+            self._index[keypath] = cfg
 
+        return cfg
+
+    @staticmethod
+    def __search(cfg, keypath, insert_defaults):
+        '''
+        Walks the configuration dictionary.
+
+        Returns:
+            tuple of (dictionary found, True if keys were inserted,
+            True if a 'default' template was used in place of a key)
+        '''
+        inserted = False
+        uses_default = False
         for key in keypath:
             if not isinstance(key, str):
                 raise TypeError(f'Invalid keypath {keypath}: key is not a string: {key}')
@@ -904,15 +1600,99 @@ class Schema:
                 cfg = cfg[key]
             elif 'default' in cfg:
                 if insert_defaults:
-                    cfg[key] = copy.deepcopy(cfg['default'])
+                    cfg[key] = Schema._copy_cfg(cfg['default'])
                     cfg = cfg[key]
+                    inserted = True
                 else:
                     cfg = cfg['default']
+                    uses_default = True
             else:
                 raise ValueError(f'Invalid keypath {keypath}: unexpected key: {key}')
 
+        return cfg, inserted, uses_default
+
+    def __search_owned(self, keypath, insert_defaults, job):
+        '''
+        Walks the configuration dictionary like _search(), copying the
+        dictionaries along the way which may be shared with copies of this
+        schema, so the dictionary found can be modified.
+        '''
+        if job is not None:
+            walk = ('history', job, *keypath)
+        else:
+            walk = keypath
+        indexed = job is None and not (keypath and keypath[0] == 'history')
+
+        self._cfg = cfg = self.__own(self._cfg)
+        path = [((), cfg)]
+        copied = False
+        inserted = False
+        uses_default = False
+        for n, key in enumerate(walk):
+            if not isinstance(key, str):
+                raise TypeError(f'Invalid keypath {keypath}: key is not a string: {key}')
+
+            if Schema._is_leaf(cfg):
+                raise ValueError(f'Invalid keypath {keypath}: unexpected key: {key}')
+
+            if key not in cfg:
+                if 'default' not in cfg:
+                    raise ValueError(f'Invalid keypath {keypath}: unexpected key: {key}')
+
+                if insert_defaults:
+                    cfg[key] = Schema._copy_cfg(cfg['default'])
+                    self.__set_owned(cfg[key])
+                    inserted = True
+                else:
+                    key = 'default'
+                    uses_default = True
+
+            subcfg = self.__own(cfg[key])
+            if subcfg is not cfg[key]:
+                cfg[key] = subcfg
+                copied = True
+            cfg = subcfg
+
+            if not uses_default:
+                path.append((walk[:n + 1], cfg))
+
+        if indexed:
+            if copied:
+                # Point the index at the copies
+                for index_keypath, index_cfg in path:
+                    if index_keypath in self._index:
+                        self._index[index_keypath] = index_cfg
+            if copied or inserted:
+                self._default_index.clear()
+
+            if uses_default:
+                self._default_index[keypath] = cfg
+            else:
+                self._index[keypath] = cfg
+
         return cfg
 
+    def __own(self, cfg):
+        '''
+        Returns cfg if it belongs to this schema, otherwise a copy of it.
+        '''
+        if id(cfg) in self._owned:
+            return cfg
+
+        if Schema._is_leaf(cfg):
+            cfg = Schema._copy_cfg(cfg)
+            self.__set_owned(cfg)
+        else:
+            cfg = cfg.copy()
+            self._owned[id(cfg)] = cfg
+        return cfg
+
+    def __set_owned(self, cfg):
+        self._owned[id(cfg)] = cfg
+        if not Schema._is_leaf(cfg):
+            for subcfg in cfg.values():
+                self.__set_owned(subcfg)
+
     ###########################################################################
     def allkeys(self, *keypath_prefix):
         '''
@@ -928,7 +1708,8 @@ class Schema:
     ###########################################################################
     def _allkeys(self, cfg=None, base_key=None):
         if cfg is None:
-            cfg = self.cfg
+            self._load_sections()
+            cfg = self._cfg
 
         if Schema._is_leaf(cfg):
             return []
@@ -966,23 +1747,308 @@ class Schema:
                     cfgdst[key] = copy.deepcopy(cfgsrc[key])
 
     ###########################################################################
-    def write_json(self, fout):
-        fout.write(json.dumps(self.cfg, indent=4))
+    def diff(self, other, keypaths=None):
+        '''
+        Returns the differences between this schema and another schema.
+
+        Both schemas are walked once. Subtrees which are shared by both
+        schemas, such as the parameters which were not modified since one
+        schema was copied from the other, or which compare equal are skipped
+        without being walked.
+
+        Args:
+            other (Schema): schema to compare to
+            keypaths (list of list of str): keypath prefixes, if provided only
+                the parameters under one of these prefixes are compared
+
+        Returns:
+            list of (keypath, field, step, index) tuples, one for each field
+            which differs. step and index are None for fields which are not
+            per-node and for global values, and 'default' for default values.
+            field is None for parameters which are only found in one of the
+            schemas.
+
+        Examples:
+            >>> schema.diff(other, keypaths=[['metric']])
+            [(('metric', 'errors'), 'value', 'syn', '0')]
+            The errors metric of syn0 differs, no other metric does.
+        '''
+        self._load_sections()
+        other._load_sections()
+
+        if keypaths is None:
+            prefixes = None
+        else:
+            prefixes = [tuple(keypath) for keypath in keypaths]
+            if () in prefixes:
+                prefixes = None
+
+        diffs = []
+        Schema.__diff(self._cfg, other._cfg, (), prefixes, diffs)
+        return diffs
+
+    @staticmethod
+    def __diff(cfg, other_cfg, keypath, prefixes, diffs):
+        '''
+        Args:
+            prefixes (list of tuple of str): keypath prefixes longer than
+                keypath, which the keys below keypath must match. None if all
+                the keys below keypath are compared.
+        '''
+        if cfg is other_cfg:
+            return
+        if prefixes is None and cfg == other_cfg:
+            return
+
+        is_leaf = cfg is not None and Schema._is_leaf(cfg)
+        other_is_leaf = other_cfg is not None and Schema._is_leaf(other_cfg)
+        if is_leaf and other_is_leaf:
+            Schema.__diff_param(cfg, other_cfg, keypath, diffs)
+            return
+        if is_leaf or other_is_leaf:
+            # Only found in one of the schemas
+            diffs.append((keypath, None, None, None))
+            return
+
+        if cfg is None:
+            cfg = {}
+        if other_cfg is None:
+            other_cfg = {}
+
+        depth = len(keypath)
+        for key in [*cfg.keys(), *[key for key in other_cfg if key not in cfg]]:
+            if key == 'default':
+                continue
+
+            sub_prefixes = None
+            if prefixes is not None:
+                sub_prefixes = [prefix for prefix in prefixes if prefix[depth] == key]
+                if not sub_prefixes:
+                    continue
+                if any(len(prefix) == depth + 1 for prefix in sub_prefixes):
+                    sub_prefixes = None
+
+            Schema.__diff(cfg.get(key), other_cfg.get(key), (*keypath, key), sub_prefixes, diffs)
+
+    @staticmethod
+    def __diff_param(cfg, other_cfg, keypath, diffs):
+        for field in [*cfg.keys(), *[field for field in other_cfg if field not in cfg]]:
+            if field == 'node':
+                continue
+            if cfg.get(field) != other_cfg.get(field):
+                diffs.append((keypath, field, None, None))
+
+        node = cfg['node']
+        other_node = other_cfg['node']
+        if node == other_node:
+            return
+
+        # Missing per-node values are compared against the default value
+        default = node['default']['default']
+        other_default = other_node['default']['default']
+        for step in [*node.keys(), *[step for step in other_node if step not in node]]:
+            step_cfg = node.get(step, {})
+            other_step_cfg = other_node.get(step, {})
+            if step_cfg == other_step_cfg:
+                continue
+
+            for index in [*step_cfg.keys(),
+                          *[index for index in other_step_cfg if index not in step_cfg]]:
+                fields = step_cfg.get(index, default)
+                other_fields = other_step_cfg.get(index, other_default)
+                if fields == other_fields:
+                    continue
+
+                for field in [*fields.keys(),
+                              *[field for field in other_fields if field not in fields]]:
+                    if fields.get(field) != other_fields.get(field):
+                        diffs.append((keypath,
+                                      field,
+                                      None if step == Schema.GLOBAL_KEY else step,
+                                      None if index == Schema.GLOBAL_KEY else index))
+
+    ###########################################################################
+    def _get_delta(self, base):
+        '''
+        Returns a schema holding only the parameters which were added or
+        changed relative to base. History and libraries are not included.
+        The schema version is always included, so the delta can be merged as
+        a trusted manifest.
+
+        Args:
+            base (Schema): earlier copy of this schema. The parameters which
+                were not modified since the copy are still shared with it, so
+                they are skipped without being compared.
+        '''
+        self._load_sections()
+        base._load_sections()
+
+        delta = Schema(cfg={})
+        self._copyparam(self._cfg, delta._cfg, ('schemaversion',))
+        for keypath in Schema.__changed_keypaths(self._cfg, base._cfg, ()):
+            self._copyparam(self._cfg, delta._cfg, keypath)
+        return delta
+
+    ###########################################################################
+    @staticmethod
+    def __changed_keypaths(cfg, base_cfg, keypath):
+        if cfg is base_cfg:
+            return []
+
+        if Schema._is_leaf(cfg):
+            if cfg == base_cfg:
+                return []
+            return [keypath]
+
+        changed = []
+        for key, subcfg in cfg.items():
+            if key == 'default':
+                continue
+            if not keypath and key in ('history', 'library'):
+                continue
+            base_subcfg = base_cfg.get(key) if base_cfg else None
+            changed.extend(Schema.__changed_keypaths(subcfg, base_subcfg, (*keypath, key)))
+        return changed
+
+    ###########################################################################
+    def write_json(self, fout, compact=False):
+        '''
+        Writes the schema as JSON.
+
+        The manifest is encoded and written one parameter at a time, so the
+        whole document is never held in memory.
+
+        Each job in history holds the parameters recorded for it. In compact
+        manifests, the jobs after the first one only hold the parameters which
+        differ from the previous job, along with the name of that job under
+        '__base__'. These are only read by schema version 0.40.12 and later.
+
+        Args:
+            fout (file): file opened in text mode
+            compact (bool): if True, the manifest is written without
+                whitespace, which is smaller and faster to write and read, and
+                is encoded with orjson if it is installed.
+        '''
+        self._load_sections()
+        for chunk in Schema.__iter_json(self.__manifest_cfg(relative_jobs=compact), compact, 0):
+            fout.write(chunk)
+
+    def __manifest_cfg(self, relative_jobs):
+        '''
+        Returns the configuration dictionary to write to a manifest, where the
+        jobs in history only hold the parameters which were recorded, rather
+        than the complete default configuration. The others are added back
+        when the manifest is read.
+
+        Args:
+            relative_jobs (bool): if True, the jobs after the first one only
+                hold the parameters which differ from the previous job.
+        '''
+        history = self._cfg.get('history')
+        if not history:
+            return self._cfg
+
+        # Successive jobs usually differ little, so each job may be written
+        # relative to the previous one
+        template = self.__get_template()
+        written_history = {}
+        base_job = None
+        for job, job_cfg in history.items():
+            if base_job is None or not relative_jobs:
+                written_history[job] = Schema.__off_template(job_cfg, template)
+            else:
+                written_history[job] = {
+                    Schema._HISTORY_BASE_KEY: base_job,
+                    **Schema.__off_base(job_cfg, history[base_job])
+                }
+            base_job = job
+
+        return {**self._cfg, 'history': written_history}
+
+    @staticmethod
+    def __iter_json(cfg, compact, depth):
+        '''
+        Yields the JSON encoding of cfg, which is the same as
+        json.dumps(cfg, indent=4), or json.dumps(cfg, separators=(',', ':'))
+        if compact is True, in pieces.
+        '''
+        # Values other than dictionaries are the job names of written history
+        if not isinstance(cfg, dict) or Schema._is_leaf(cfg):
+            if compact:
+                # orjson writes NaN and infinity as null, so the parameters
+                # which may hold them are encoded with json
+                if _has_orjson and not (isinstance(cfg, dict) and 'float' in cfg['type']):
+                    yield orjson.dumps(cfg).decode('utf-8')
+                else:
+                    yield json.dumps(cfg, separators=(',', ':'))
+            else:
+                yield json.dumps(cfg, indent=4).replace('\n', '\n' + ' ' * 4 * depth)
+            return
+
+        if not cfg:
+            yield '{}'
+            return
+
+        if compact:
+            key_prefix = ''
+            key_separator = ':'
+            end = '}'
+        else:
+            key_prefix = '\n' + ' ' * 4 * (depth + 1)
+            key_separator = ': '
+            end = '\n' + ' ' * 4 * depth + '}'
+
+        separator = '{'
+        for key, subcfg in cfg.items():
+            yield f'{separator}{key_prefix}{json.dumps(key)}{key_separator}'
+            yield from Schema.__iter_json(subcfg, compact, depth + 1)
+            separator = ','
+        yield end
+
+    ###########################################################################
+    def write_binary(self, fout):
+        '''
+        Writes the schema as a binary manifest, see
+        :mod:`~siliconcompiler.schema.binary_manifest`.
+
+        The jobs in history are written like in compact JSON manifests, see
+        write_json().
+
+        Args:
+            fout (file): file opened in binary mode
+        '''
+        sections = [(key, binary_manifest.encode_section(value))
+                    for key, value in self.__manifest_cfg(relative_jobs=True).items()]
+        # Sections which were never accessed are written as they were read
+        sections.extend((key, manifest.raw(key)) for key, manifest in self._lazy.items())
+        binary_manifest.write(fout, sections)
 
     ###########################################################################
     def write_yaml(self, fout):
         if not _has_yaml:
             raise ImportError('yaml package required to write YAML manifest')
-        fout.write(yaml.dump(self.cfg, Dumper=YamlIndentDumper, default_flow_style=False))
+        self._load_sections()
+        fout.write(yaml.dump(self.__manifest_cfg(relative_jobs=False), Dumper=YamlIndentDumper,
+                             default_flow_style=False))
 
     ###########################################################################
-    def write_tcl(self, fout, prefix="", step=None, index=None, template=None):
+    def write_tcl(self, fout, prefix="", step=None, index=None, template=None, keypaths=None):
         '''
         Prints out schema as TCL dictionary
+
+        Args:
+            keypaths (list of list of str): if set, only the parameters under
+                these keypaths are written. Keypaths which are not in the
+                schema are ignored.
         '''
 
+        if keypaths is None:
+            allkeys = self.allkeys()
+        else:
+            allkeys = self._allkeys_under(keypaths)
+
         tcl_set_cmds = []
-        for key in self.allkeys():
+        for key in allkeys:
             typestr = self.get(*key, field='type')
             pernode = self.get(*key, field='pernode')
 
@@ -992,9 +2058,9 @@ class Schema:
                 continue
 
             if pernode != 'never':
-                value = self.get(*key, step=step, index=index)
+                value = self.get(*key, step=step, index=index, copy=False)
             else:
-                value = self.get(*key)
+                value = self.get(*key, copy=False)
 
             # create a TCL dict
             keystr = ' '.join([escape_val_tcl(keypart, 'str') for keypart in key])
@@ -1023,6 +2089,30 @@ class Schema:
                 fout.write(cmd + '\n')
             fout.write('\n')
 
+    def _allkeys_under(self, keypaths):
+        '''
+        Returns the keypaths of the parameters under each keypath, without
+        duplicates.
+        '''
+        keys = {}
+        for keypath in keypaths:
+            self._load_sections(*keypath[:1])
+
+            cfg = self._cfg
+            for key in keypath:
+                if Schema._is_leaf(cfg) or key not in cfg:
+                    cfg = None
+                    break
+                cfg = cfg[key]
+            if cfg is None:
+                continue
+
+            if Schema._is_leaf(cfg):
+                keys[tuple(keypath)] = None
+            else:
+                keys.update(dict.fromkeys(self._allkeys(cfg=cfg, base_key=keypath)))
+        return list(keys)
+
     ###########################################################################
     def write_csv(self, fout):
         csvwriter = csv.writer(fout)
@@ -1047,8 +2137,27 @@ class Schema:
 
     ###########################################################################
     def copy(self):
-        '''Returns deep copy of Schema object.'''
-        return Schema(cfg=self.cfg)
+        '''Returns copy of Schema object.
+
+        The configuration dictionary is shared by both objects until one of
+        them modifies it, at which point only the modified parameters are
+        copied.
+        '''
+        schema = Schema.__new__(Schema)
+        schema._init_logger()
+        schema._init_index()
+        schema._init_sharing()
+        schema._init_changes()
+        schema._cfg = self._cfg
+        # Sections which were not decoded yet are decoded by each schema
+        schema._lazy = self._lazy.copy()
+
+        # Neither object can modify the configuration in place anymore
+        schema._shared = True
+        self._shared = True
+        self._owned = {}
+
+        return schema
 
     ###########################################################################
     def prune(self):
@@ -1056,45 +2165,37 @@ class Schema:
 
         Also deletes 'help' and 'example' keys.
         '''
-        # When at top of tree loop maxdepth times to make sure all stale
-        # branches have been removed, not elegant, but stupid-simple
-        # "good enough"
-
-        # 10 should be enough for anyone...
-        maxdepth = 10
+        self._load_sections()
 
-        for _ in range(maxdepth):
-            self._prune()
+        # A new configuration dictionary is built, so a dictionary shared with
+        # copies of this schema is left untouched
+        self._cfg = Schema.__pruned(self._cfg)
+        self._owned = {}
+        self._clear_index()
+        self._changes = None
 
     ###########################################################################
-    def _prune(self, *keypath):
+    @staticmethod
+    def __pruned(cfg):
         '''
-        Internal recursive function that creates a local copy of the Chip
-        schema (cfg) with only essential non-empty parameters retained.
-
+        Internal recursive function that returns a copy of cfg with only
+        essential non-empty parameters retained. The fields of the parameters
+        are shared with cfg.
         '''
-        cfg = self._search(*keypath)
+        if Schema._is_leaf(cfg):
+            return {field: value for field, value in cfg.items()
+                    if field not in ('help', 'example')}
 
-        # Prune when the default & value are set to the following
-        # Loop through all keys starting at the top
-        for k in list(cfg.keys()):
+        pruned = {}
+        for key, subcfg in cfg.items():
             # removing all default/template keys
-            # reached a default subgraph, delete it
-            if k == 'default':
-                del cfg[k]
-            # reached leaf-cell
-            elif 'help' in cfg[k].keys():
-                del cfg[k]['help']
-            elif 'example' in cfg[k].keys():
-                del cfg[k]['example']
-            elif Schema._is_leaf(cfg[k]):
-                pass
+            if key == 'default':
+                continue
+            subcfg = Schema.__pruned(subcfg)
             # removing stale branches
-            elif not cfg[k]:
-                cfg.pop(k)
-            # keep traversing tree
-            else:
-                self._prune(*keypath, k)
+            if subcfg:
+                pruned[key] = subcfg
+        return pruned
 
     ###########################################################################
     def _is_empty(self, *keypath):
@@ -1117,16 +2218,36 @@ class Schema:
         If job doesn't currently exist in history, create it with default
         values.
 
+        Parameters of a job may be shared with other jobs and with the default
+        configuration, so the returned schema copies them before modifying
+        them, and stores the copies in the job.
+
         Args:
             job (str): Name of historical job to return.
         '''
-        if job not in self.cfg['history']:
-            self.cfg['history'][job] = self._init_schema_cfg()
-
-        # Can't initialize Schema() by passing in cfg since it performs a deep
-        # copy.
-        schema = Schema()
-        schema.cfg = self.cfg['history'][job]
+        self._load_sections('history')
+        if job not in self._cfg['history']:
+            # The new job shares all its parameters with the default configuration
+            self._search('history', modify=True)[job] = self.__get_template().copy()
+
+        if self._shared:
+            # The top-level dictionary of the job is modified in place, so it
+            # cannot be shared with copies of this schema
+            job_cfg = self.__search_owned((), False, job)
+        else:
+            job_cfg = self._cfg['history'][job]
+
+        schema = Schema.__new__(Schema)
+        schema._init_logger()
+        schema._init_index()
+        schema._init_sharing()
+        schema._init_changes()
+        schema._cfg = job_cfg
+        schema._lazy = {}
+
+        # Only the top-level dictionary of the job belongs to it
+        schema._shared = True
+        schema._owned[id(job_cfg)] = job_cfg
         return schema
 
     #######################################
@@ -1142,19 +2263,32 @@ class Schema:
 
     #######################################
     def __getstate__(self):
+        self._load_sections()
+
         attributes = self.__dict__.copy()
 
         # We have to remove the chip's logger before serializing the object
         # since the logger object is not serializable.
         del attributes['logger']
+
+        # The index holds references into the configuration dictionary, which
+        # would be duplicated by serialization
+        del attributes['_index']
+        del attributes['_default_index']
+
+        # The restored configuration is not shared with anything
+        del attributes['_owned']
+        attributes['_shared'] = False
         return attributes
 
     #######################################
     def __setstate__(self, state):
         self.__dict__ = state
 
-        # Reinitialize logger on restore
+        # Reinitialize logger and index on restore
         self._init_logger()
+        self._init_index()
+        self._owned = {}
 
     #######################################
     def get_default(self, *keypath):
@@ -1180,7 +2314,7 @@ class Schema:
         '''
         keypath = args[:-1]
         value = args[-1]
-        cfg = self._search(*keypath)
+        cfg = self._search(*keypath, modify=True)
 
         if not Schema._is_leaf(cfg):
             raise ValueError(f'Invalid keypath {keypath}: set_default() '
@@ -1190,8 +2324,10 @@ class Schema:
         if 'enum' in cfg:
             allowed_values = cfg['enum']
 
-        cfg['node']['default']['default']['value'] = Schema._check_and_normalize(
-            value, cfg['type'], 'value', keypath, allowed_values)
+        value = Schema._check_and_normalize(value, cfg['type'], 'value', keypath, allowed_values)
+
+        # The default fields may be shared with other parameters
+        cfg['node']['default'] = {'default': {**cfg['node']['default']['default'], 'value': value}}
 
     ###########################################################################
     def create_cmdline(self,
@@ -1567,7 +2703,7 @@ class Schema:
         Reads a manifest from disk and merges it with the current manifest.
 
         The file format read is determined by the filename suffix. Currently
-        json (*.json) and yaml(*.yaml) formats are supported.
+        json (*.json), yaml (*.yaml) and binary (*.scb) formats are supported.
 
         Args:
             filename (filepath): Path to a manifest file to be loaded.
@@ -1581,61 +2717,77 @@ class Schema:
         """
         schema = Schema(manifest=filename, logger=self.logger)
 
-        if schema.get('schemaversion') != self.get('schemaversion'):
+        # Manifests written with the same schema version hold normalized values
+        trusted = schema.get('schemaversion') == self.get('schemaversion')
+        if not trusted:
             self.logger.warning("Mismatch in schema versions: "
                                 f"{schema.get('schemaversion')} != {self.get('schemaversion')}")
 
-        for keylist in schema.allkeys():
-            if keylist[0] in ('history', 'library'):
-                continue
-            if 'default' in keylist:
-                continue
-            typestr = schema.get(*keylist, field='type')
-            should_append = re.match(r'\[', typestr) and not clear
+        if trusted:
+            def merge_key(keypath, cfg):
+                if allow_missing_keys and not self.valid(*keypath, default_valid=True):
+                    self.logger.warning(f'{keypath} not found in schema, skipping...')
+                    return False
+                return True
 
-            if allow_missing_keys and not self.valid(*keylist, default_valid=True):
-                self.logger.warning(f'{keylist} not found in schema, skipping...')
-                continue
+            self._merge_params(schema, clobber=clobber, clear=clear, keypath_filter=merge_key)
+        else:
+            for keylist in schema.allkeys():
+                if keylist[0] in ('history', 'library'):
+                    continue
+                if 'default' in keylist:
+                    continue
+                typestr = schema.get(*keylist, field='type')
+                should_append = re.match(r'\[', typestr) and not clear
 
-            for val, step, index in schema._getvals(*keylist, return_defvalue=False):
-                # update value, handling scalars vs. lists
-                if should_append:
-                    self.add(*keylist, val, step=step, index=index)
-                else:
-                    self.set(*keylist, val, step=step, index=index, clobber=clobber)
+                if allow_missing_keys and not self.valid(*keylist, default_valid=True):
+                    self.logger.warning(f'{keylist} not found in schema, skipping...')
+                    continue
 
-                # update other pernode fields
-                # TODO: only update these if clobber is successful
-                step_key = Schema.GLOBAL_KEY if not step else step
-                idx_key = Schema.GLOBAL_KEY if not index else index
-                for field in schema.getdict(*keylist)['node'][step_key][idx_key].keys():
-                    if field == 'value':
-                        continue
-                    v = schema.get(*keylist, step=step, index=index, field=field)
+                for val, step, index in schema._getvals(*keylist, return_defvalue=False):
+                    # update value, handling scalars vs. lists
                     if should_append:
-                        self.add(*keylist, v, step=step, index=index, field=field)
+                        self.add(*keylist, val, step=step, index=index)
                     else:
-                        self.set(*keylist, v, step=step, index=index, field=field)
+                        self.set(*keylist, val, step=step, index=index, clobber=clobber)
+
+                    # update other pernode fields
+                    # TODO: only update these if clobber is successful
+                    step_key = Schema.GLOBAL_KEY if not step else step
+                    idx_key = Schema.GLOBAL_KEY if not index else index
+                    for field in schema.getdict(*keylist)['node'][step_key][idx_key].keys():
+                        if field == 'value':
+                            continue
+                        v = schema.get(*keylist, step=step, index=index, field=field)
+                        if should_append:
+                            self.add(*keylist, v, step=step, index=index, field=field)
+                        else:
+                            self.set(*keylist, v, step=step, index=index, field=field)
 
-            # update other fields that a user might modify
-            for field in schema.getdict(*keylist).keys():
-                if field in ('node',):
-                    # skip these fields (node handled above)
-                    continue
+                # update other fields that a user might modify
+                for field in schema.getdict(*keylist).keys():
+                    if field in ('node',):
+                        # skip these fields (node handled above)
+                        continue
 
-                # TODO: should we be taking into consideration clobber for these fields?
-                v = schema.get(*keylist, field=field)
-                self.set(*keylist, v, field=field)
+                    # TODO: should we be taking into consideration clobber for these fields?
+                    v = schema.get(*keylist, field=field)
+                    self.set(*keylist, v, field=field)
 
         # Read history, if we're not already reading into a job
         if 'history' in schema.getkeys():
+            history = self._search('history', modify=True)
             for historic_job in schema.getkeys('history'):
-                self.cfg['history'][historic_job] = schema.getdict('history', historic_job)
+                # Only the top-level dictionary of a job is modified in place,
+                # see history()
+                history[historic_job] = schema._search('history', historic_job).copy()
 
         # TODO: better way to handle this?
         if 'library' in schema.getkeys():
+            library = self._search('library', modify=True)
             for libname in schema.getkeys('library'):
-                self.cfg['library'][libname] = schema.getdict('library', libname)
+                library[libname] = schema.getdict('library', libname)
+            self._clear_index()
 
 
 if _has_yaml:
@@ -7,10 +7,50 @@
 import os
 import re
 import sys
+from collections.abc import Sequence
 
 PACKAGE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
 
 
+class ReadOnlyList(Sequence):
+    '''
+    Read-only view of a list, which is not copied.
+
+    The view compares equal to lists with the same items. Slicing returns a
+    new list.
+    '''
+
+    __slots__ = ('__items',)
+
+    def __init__(self, items):
+        self.__items = items
+
+    def __getitem__(self, index):
+        return self.__items[index]
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __contains__(self, item):
+        return item in self.__items
+
+    def __eq__(self, other):
+        if isinstance(other, ReadOnlyList):
+            other = other.__items
+        return self.__items == other
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return self.__items + list(other)
+
+    def __repr__(self):
+        return repr(self.__items)
+
+
 def escape_val_tcl(val, typestr):
     '''Recursive helper function for converting Python values to safe TCL
     values, based on the SC type string.'''
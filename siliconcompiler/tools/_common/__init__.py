@@ -17,10 +17,10 @@ def get_libraries(chip, include_asic=True):
     libs = []
 
     if include_asic and chip.get('option', 'mode') == 'asic':
-        libs.extend(chip.get('asic', 'logiclib', step=step, index=index))
-        libs.extend(chip.get('asic', 'macrolib', step=step, index=index))
+        libs.extend(chip.get('asic', 'logiclib', step=step, index=index, copy=False))
+        libs.extend(chip.get('asic', 'macrolib', step=step, index=index, copy=False))
 
-    libs.extend(chip.get('option', 'library', step=step, index=index))
+    libs.extend(chip.get('option', 'library', step=step, index=index, copy=False))
 
     return libs
 
@@ -106,7 +106,7 @@ def __get_step_index(chip, *key):
 def __is_key_valid(chip, *key):
     if chip.valid(*key):
         step, index = __get_step_index(chip, *key)
-        if chip.get(*key, step=step, index=index):
+        if chip.get(*key, step=step, index=index, copy=False):
             return True
     return False
 
@@ -229,7 +229,8 @@ def find_incoming_ext(chip, support_exts, default_ext):
     for input_step, input_index in chip.get('flowgraph', flow, step, index, 'input'):
         tool, task = chip._get_tool_task(input_step, input_index, flow=flow)
         output_exts = {get_file_ext(f): f for f in chip.get('tool', tool, 'task', task, 'output',
-                                                            step=input_step, index=input_index)}
+                                                            step=input_step, index=input_index,
+                                                            copy=False)}
         # Search the supported order
         for ext in support_exts:
             if ext in output_exts:
@@ -278,7 +279,7 @@ def input_provides(chip, step, index, flow=None):
         tool, task = chip._get_tool_task(in_step, in_index, flow=flow)
 
         for output in chip.get('tool', tool, 'task', task, 'output',
-                               step=in_step, index=in_index):
+                               step=in_step, index=in_index, copy=False):
             inputs.setdefault(output, []).append((in_step, in_index))
 
     return inputs
@@ -66,6 +66,11 @@ def _minmax(chip, *nodes, op=None):
     flow = chip.get('option', 'flow')
     nodelist = list(nodes)
 
+    # Fetch the values of all the metrics for all the nodes at once.
+    # query() returns None on errors, which leaves the values unset.
+    metric_values = chip.query('metric', '*', nodes=nodelist) or {}
+    metrics = {keypath[-1]: values for keypath, values in metric_values.items()}
+
     # Keeping track of the steps/indexes that have goals met
     failed = {}
     for step, index in nodelist:
@@ -76,10 +81,12 @@ def _minmax(chip, *nodes, op=None):
         if chip.get('flowgraph', flow, step, index, 'status') == NodeStatus.ERROR:
             failed[step][index] = True
         else:
-            for metric in chip.getkeys('metric'):
-                if chip.valid('flowgraph', flow, step, index, 'goal', metric):
-                    goal = chip.get('flowgraph', flow, step, index, 'goal', metric)
-                    real = chip.get('metric', metric, step=step, index=index)
+            goals = chip.query('flowgraph', flow, step, index, 'goal', '*') or {}
+            for metric, values in metrics.items():
+                goal_keypath = ('flowgraph', flow, step, index, 'goal', metric)
+                if goal_keypath in goals:
+                    goal = goals[goal_keypath]
+                    real = values[step, index]
                     if real is None:
                         chip.error(f'Metric {metric} has goal for {step}{index} '
                                    'but it has not been set.', fatal=True)
@@ -92,12 +99,12 @@ def _minmax(chip, *nodes, op=None):
     # Calculate max/min values for each metric
     max_val = {}
     min_val = {}
-    for metric in chip.getkeys('metric'):
+    for metric, values in metrics.items():
         max_val[metric] = 0
         min_val[metric] = float("inf")
         for step, index in nodelist:
             if not failed[step][index]:
-                real = chip.get('metric', metric, step=step, index=index)
+                real = values[step, index]
                 if real is None:
                     continue
                 max_val[metric] = max(max_val[metric], real)
@@ -111,13 +118,13 @@ def _minmax(chip, *nodes, op=None):
             continue
 
         score = 0.0
-        for metric in chip.getkeys('flowgraph', flow, step, index, 'weight'):
-            weight = chip.get('flowgraph', flow, step, index, 'weight', metric)
+        weights = chip.query('flowgraph', flow, step, index, 'weight', '*') or {}
+        for (*_, metric), weight in weights.items():
             if not weight:
                 # skip if weight is 0 or None
                 continue
 
-            real = chip.get('metric', metric, step=step, index=index)
+            real = metrics.get(metric, {}).get((step, index))
             if real is None:
                 chip.error(f'Metric {metric} has weight for {step}{index} '
                            'but it has not been set.', fatal=True)
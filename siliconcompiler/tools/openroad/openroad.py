@@ -147,6 +147,13 @@ def setup(chip):
                  ",".join(key),
                  step=step, index=index)
 
+    # Parameters read by the scripts, used for scoped manifests
+    for key in (['asic'], ['constraint'], ['datasheet'], ['input'], ['pdk', pdkname],
+                *[['library', lib] for lib in [*targetlibs, *macrolibs]]):
+        chip.add('tool', tool, 'task', task, 'manifestkeys',
+                 ",".join(key),
+                 step=step, index=index)
+
     # set default values for openroad
     _define_ord_params(chip)
     _define_sta_params(chip)
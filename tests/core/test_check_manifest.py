@@ -3,6 +3,7 @@ import siliconcompiler
 from siliconcompiler.scheduler import _setup_node
 
 import os
+import pickle
 
 import pytest
 
@@ -217,6 +218,55 @@ def test_check_missing_library():
     assert not chip.check_manifest()
 
 
+def test_check_manifest_changes(merge_flow_chip):
+    chip = merge_flow_chip
+    chip.set('tool', 'fake', 'task', 'foo', 'output', 'bar.out', step='parallel1', index='0')
+    chip.set('tool', 'fake', 'task', 'bar', 'output', 'foo.out', step='parallel2', index='0')
+    assert chip.check_manifest()
+
+    # Only the changed parameters are checked again
+    chip.unset('design')
+    assert not chip.check_manifest()
+
+    chip.set('design', 'test')
+    assert chip.check_manifest()
+
+
+def test_check_manifest_dynamic_changes(merge_flow_chip):
+    chip = merge_flow_chip
+    chip.set('tool', 'fake', 'task', 'foo', 'output', 'bar.out', step='parallel1', index='0')
+    chip.set('tool', 'fake', 'task', 'bar', 'output', 'foo.out', step='parallel2', index='0')
+
+    with open('test.txt', 'w') as f:
+        f.write('test')
+    chip.set('option', 'file', 'test', 'test.txt')
+    chip.set('tool', 'fake', 'task', 'baz', 'require', 'option,file,test',
+             step='export', index='0')
+    assert chip.check_manifest()
+
+    # The node is checked with the paths resolved by the check before the run
+    node_chip = pickle.loads(pickle.dumps(chip))
+    node_chip.set('arg', 'step', 'export')
+    node_chip.set('arg', 'index', '0')
+    inputs_dir = os.path.join(node_chip._getworkdir(step='export', index='0'), 'inputs')
+    os.makedirs(inputs_dir)
+    for filename in ('foo.out', 'bar.out'):
+        with open(os.path.join(inputs_dir, filename), 'w') as f:
+            f.write('test')
+    assert node_chip.check_manifest()
+
+    # Resolved paths are still checked to exist
+    os.remove('test.txt')
+    assert not node_chip.check_manifest()
+
+    with open('test.txt', 'w') as f:
+        f.write('test')
+    assert node_chip.check_manifest()
+
+    node_chip.set('option', 'file', 'test', 'missing.txt')
+    assert not node_chip.check_manifest()
+
+
 #########################
 if __name__ == "__main__":
     test_check_manifest()
@@ -1,3 +1,5 @@
+import pytest
+
 import siliconcompiler
 
 
@@ -6,3 +8,31 @@ def test_get_copy():
     cfg = chip.get('option', 'cfg')
     cfg.append('manifest.json')
     assert chip.get('option', 'cfg') != cfg
+
+
+def test_get_no_copy():
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'cfg', 'a.json')
+
+    cfg = chip.get('option', 'cfg', copy=False)
+    assert cfg == ['a.json']
+    assert list(cfg) == ['a.json']
+
+    # Values are not modified in place, so the list is left as it was
+    chip.add('option', 'cfg', 'b.json')
+    assert cfg == ['a.json']
+    assert chip.get('option', 'cfg') == ['a.json', 'b.json']
+
+
+def test_get_no_copy_read_only():
+    chip = siliconcompiler.Chip('test')
+    cfg = chip.get('option', 'cfg', copy=False)
+    assert cfg == []
+
+    # The list may be shared with every other schema
+    with pytest.raises(AttributeError):
+        cfg.append('oops')
+    with pytest.raises(TypeError):
+        cfg[0:0] = ['oops']
+
+    assert siliconcompiler.Chip('test').get('option', 'cfg') == []
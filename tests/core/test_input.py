@@ -0,0 +1,37 @@
+import pytest
+
+import siliconcompiler
+
+
+@pytest.mark.nostrict
+def test_input_list():
+    chip = siliconcompiler.Chip('test')
+    chip.input(['top.v', 'alu.sv', 'top.sdc', 'top.vhd'])
+
+    assert chip.get('input', 'rtl', 'verilog') == ['top.v', 'alu.sv']
+    assert chip.get('input', 'constraint', 'sdc') == ['top.sdc']
+    assert chip.get('input', 'rtl', 'vhdl') == ['top.vhd']
+
+
+@pytest.mark.nostrict
+def test_input_list_matches_single():
+    files = [f'rtl/mod{n}.v' for n in range(100)]
+
+    chip = siliconcompiler.Chip('test')
+    chip.input(files, package='rtl')
+
+    single = siliconcompiler.Chip('test')
+    for filename in files:
+        single.input(filename, package='rtl')
+
+    assert chip.get('input', 'rtl', 'verilog') == single.get('input', 'rtl', 'verilog')
+    assert chip.get('input', 'rtl', 'verilog', field='package') == ['rtl'] * len(files)
+    assert single.get('input', 'rtl', 'verilog', field='package') == ['rtl'] * len(files)
+
+
+@pytest.mark.nostrict
+def test_input_list_fileset():
+    chip = siliconcompiler.Chip('test')
+    chip.input(['a.v', 'b.txt'], fileset='rtl', filetype='verilog')
+
+    assert chip.get('input', 'rtl', 'verilog') == ['a.v', 'b.txt']
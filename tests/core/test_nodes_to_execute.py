@@ -360,3 +360,32 @@ def test_nodes_to_execute_different_flow_from_to():
         ('G', '0'),
         ('H', '0')
     ]
+
+
+def test_nodes_to_execute_wide():
+    '''
+    Fully connected layers of parallel nodes, the number of paths through
+    the flowgraph grows exponentially with the number of layers
+    '''
+    chip = siliconcompiler.Chip('test')
+    flow = 'test'
+
+    steps = ('A', 'B', 'C', 'D', 'E', 'F', 'G', 'H')
+    indices = [str(n) for n in range(8)]
+    for step in steps:
+        for index in indices:
+            chip.node(flow, step, nop, index=index)
+    for tail, head in zip(steps[:-1], steps[1:]):
+        for tail_index in indices:
+            for head_index in indices:
+                chip.edge(flow, tail, head, tail_index=tail_index, head_index=head_index)
+
+    chip.set('option', 'flow', flow)
+
+    assert set(chip.nodes_to_execute()) == set([(step, index)
+                                                for step in steps for index in indices])
+
+    chip.set('option', 'prune', [('C', '0'), ('C', '1')])
+    assert set(chip.nodes_to_execute()) == set([(step, index)
+                                                for step in steps for index in indices
+                                                if (step, index) not in (('C', '0'), ('C', '1'))])
@@ -0,0 +1,109 @@
+import pytest
+
+import siliconcompiler
+from siliconcompiler.report import utils as report_utils
+from siliconcompiler.tools.builtin import _common as builtin_common
+
+
+def test_query():
+    chip = siliconcompiler.Chip('test')
+    chip.set('metric', 'cellarea', 10.0, step='syn', index='0')
+    chip.set('metric', 'cellarea', 20.0, step='place', index='0')
+    chip.set('metric', 'errors', 1, step='place', index='0')
+
+    nodes = [('syn', '0'), ('place', 0)]
+    metrics = chip.query('metric', '*', nodes=nodes)
+
+    assert set(metrics.keys()) == set(('metric', metric) for metric in chip.getkeys('metric'))
+    assert metrics[('metric', 'cellarea')] == {('syn', '0'): 10.0, ('place', '0'): 20.0}
+    assert metrics[('metric', 'errors')] == {('syn', '0'): None, ('place', '0'): 1}
+
+    # Matches the values returned by get()
+    for (_, metric), values in metrics.items():
+        for (step, index), value in values.items():
+            assert chip.get('metric', metric, step=step, index=index) == value
+
+
+def test_query_global():
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'var', 'a', 'x')
+    chip.set('option', 'var', 'b', ['y', 'z'])
+
+    assert chip.query('option', 'var', '*') == {
+        ('option', 'var', 'a'): ['x'],
+        ('option', 'var', 'b'): ['y', 'z']
+    }
+
+    # Parameters which are not set per node have the same value for all nodes
+    assert chip.query('option', 'var', '*', nodes=[('syn', '0'), ('place', '0')]) == {
+        ('option', 'var', 'a'): {('syn', '0'): ['x'], ('place', '0'): ['x']},
+        ('option', 'var', 'b'): {('syn', '0'): ['y', 'z'], ('place', '0'): ['y', 'z']}
+    }
+
+    assert chip.query('option', 'var', '*', field='type') == {
+        ('option', 'var', 'a'): '[str]',
+        ('option', 'var', 'b'): '[str]'
+    }
+
+
+def test_query_default():
+    chip = siliconcompiler.Chip('test')
+    chip.set('tool', 'openroad', 'task', 'place', 'var', 'place_density', '0.5',
+             step='place', index='0')
+
+    # Keys which are not found fall back to the 'default' template, as in get()
+    assert chip.query('tool', '*', 'task', '*', 'var', 'place_density',
+                      nodes=[('place', '0'), ('place', '1')]) == {
+        ('tool', 'openroad', 'task', 'place', 'var', 'place_density'): {
+            ('place', '0'): ['0.5'],
+            ('place', '1'): []
+        }
+    }
+
+    assert chip.query('tool', 'yosys', 'task', '*', 'var', '*', nodes=[('syn', '0')]) == {}
+
+
+def test_query_strict():
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'strict', True)
+
+    with pytest.raises(siliconcompiler.SiliconCompilerError):
+        chip.query('metric', '*')
+
+    assert chip.query('metric', '*', nodes=[('syn', '0')])
+
+
+def test_query_invalid():
+    chip = siliconcompiler.Chip('test')
+
+    with pytest.raises(siliconcompiler.SiliconCompilerError):
+        chip.query('metric', 'notakey', '*')
+
+    with pytest.raises(siliconcompiler.SiliconCompilerError):
+        chip.query('option', '*')
+
+
+def test_query_error_callers(monkeypatch):
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'continue', True)
+    chip.set('option', 'flow', 'test')
+    for index in ('0', '1'):
+        chip.node('test', 'syn', 'siliconcompiler.tools.builtin.nop', index=index)
+        chip.set('metric', 'cellarea', 10.0, step='syn', index=index)
+    nodes = [('syn', '0'), ('syn', '1')]
+
+    # Every query fails, as with an invalid keypath
+    query = chip.query
+    monkeypatch.setattr(chip, 'query', lambda *keypath, **kwargs: query('metric', 'notakey', '*'))
+    assert chip.query('metric', '*') is None
+
+    _, errors, metrics, _, metrics_to_show, reports = \
+        report_utils._collect_data(chip, flowgraph_nodes=nodes)
+    assert errors == {('syn', '0'): False, ('syn', '1'): False}
+    assert metrics[('syn', '0')]['cellarea'] is None
+    assert metrics_to_show == []
+    assert reports[('syn', '0')]['cellarea'] == []
+
+    assert report_utils._find_summary_metrics(chip, {'area': ('cellarea', str)}) == {}
+
+    assert builtin_common._minmax(chip, *nodes, op='minimum') == (0.0, ('syn', '0'))
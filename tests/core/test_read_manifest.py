@@ -5,6 +5,7 @@ import json
 import packaging.version
 
 from siliconcompiler.schema import Schema
+from siliconcompiler.schema import binary_manifest
 
 import pytest
 
@@ -82,3 +83,78 @@ def test_read_job():
 if __name__ == "__main__":
     from tests.fixtures import datadir
     test_modified_schema(datadir(__file__))
+
+
+def test_read_binary_manifest():
+    '''Make sure that binary manifests read the same as JSON manifests.'''
+    chip = siliconcompiler.Chip('foo')
+    chip.input('foo.v')
+    chip.schema.record_history()
+    chip.write_manifest('tmp.json')
+    chip.write_manifest('tmp.scb')
+
+    chip_json = siliconcompiler.Chip('foo')
+    chip_json.read_manifest('tmp.json')
+
+    chip_binary = siliconcompiler.Chip('foo')
+    chip_binary.read_manifest('tmp.scb')
+    assert chip_binary.get('input', 'rtl', 'verilog', job='job0', step='import', index=0) == \
+        ['foo.v']
+    assert chip_binary.schema.cfg == chip_json.schema.cfg
+
+
+@pytest.mark.parametrize('partial', [True, False])
+def test_read_binary_manifest_lazy(monkeypatch, partial):
+    '''Make sure that reading a binary manifest only decodes the sections it uses.'''
+    chip = siliconcompiler.Chip('foo')
+    chip.load_target('freepdk45_demo')
+    chip.input('foo.v')
+    chip.schema.record_history()
+    chip.write_manifest('tmp.scb')
+
+    loaded = []
+    load = binary_manifest.BinaryManifest.load
+
+    def record_load(self, key):
+        loaded.append(key)
+        return load(self, key)
+    monkeypatch.setattr(binary_manifest.BinaryManifest, 'load', record_load)
+
+    chip_binary = siliconcompiler.Chip('foo')
+    chip_binary._read_manifest('tmp.scb', partial=partial)
+
+    assert 'input' in loaded
+    assert ('history' in loaded) == (not partial)
+    assert ('library' in loaded) == (not partial)
+    assert chip_binary.get('input', 'rtl', 'verilog', step='import', index=0) == ['foo.v']
+    if not partial:
+        assert chip_binary.getkeys('history') == ['job0']
+        assert chip_binary.getkeys('library') == chip.getkeys('library')
+
+
+@pytest.mark.parametrize('clobber', [True, False])
+@pytest.mark.parametrize('clear', [True, False])
+@pytest.mark.parametrize('partial', [True, False])
+def test_trusted_merge(clobber, clear, partial):
+    '''Make sure that trusted merges match merges which normalize the values.'''
+    src = siliconcompiler.Chip('foo')
+    src.input('foo.v')
+    src.set('input', 'rtl', 'verilog', 'bar.v', step='syn', index='0')
+    src.set('input', 'rtl', 'verilog', 'hash', field='filehash', step='syn', index='0')
+    src.set('option', 'var', 'test', ['a', 'b'])
+    src.set('option', 'var', 'locked', 'src')
+    src.set('metric', 'errors', 1, step='syn', index='0')
+    src.set('constraint', 'component', 'inst', 'placement', (1.0, 2.0, 0.0))
+    src.write_manifest('tmp.json')
+
+    def merge(trusted):
+        chip = siliconcompiler.Chip('foo')
+        chip.set('option', 'var', 'test', 'c')
+        chip.set('option', 'var', 'locked', 'dest')
+        chip.set('option', 'var', 'locked', True, field='lock')
+        chip.set('metric', 'errors', 5, step='syn', index='0')
+        chip._merge_manifest(Schema(manifest='tmp.json'),
+                             clobber=clobber, clear=clear, partial=partial, trusted=trusted)
+        return chip
+
+    assert merge(True).schema.cfg == merge(False).schema.cfg
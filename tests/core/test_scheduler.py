@@ -0,0 +1,300 @@
+import json
+import os
+import psutil
+import pytest
+
+import siliconcompiler
+from siliconcompiler import NodeStatus
+from siliconcompiler.schema import Schema
+from siliconcompiler.tools.builtin import nop
+from tests.core.tools.dummy import process
+from siliconcompiler import scheduler
+from siliconcompiler.scheduler import timeline
+from siliconcompiler.scheduler import _get_node_priorities, _get_historical_metrics, \
+    check_node_inputs
+
+
+def _nop_diamond(design='test'):
+    chip = siliconcompiler.Chip(design)
+    chip.load_target('freepdk45_demo')
+    chip.set('option', 'nodisplay', True)
+    chip.set('option', 'quiet', True)
+
+    flow = 'test'
+    chip.set('option', 'flow', flow)
+    chip.node(flow, 'import', nop)
+    for index in ('0', '1'):
+        chip.node(flow, 'branch', nop, index=index)
+        chip.edge(flow, 'import', 'branch', head_index=index)
+    chip.node(flow, 'join', nop)
+    for index in ('0', '1'):
+        chip.edge(flow, 'branch', 'join', tail_index=index)
+
+    chip.set('tool', 'builtin', 'task', 'nop', 'threads', 1)
+
+    return chip
+
+
+def test_launch_nodes_dependencies():
+    chip = _nop_diamond()
+    chip.run()
+
+    flow = chip.get('option', 'flow')
+    for step, index in (('import', '0'), ('branch', '0'), ('branch', '1'), ('join', '0')):
+        assert chip.get('flowgraph', flow, step, index, 'status') == NodeStatus.SUCCESS
+
+    # Nodes must not start before their inputs have finished
+    import_end = chip.get('record', 'endtime', step='import', index='0')
+    join_start = chip.get('record', 'starttime', step='join', index='0')
+    for index in ('0', '1'):
+        assert chip.get('record', 'starttime', step='branch', index=index) >= import_end
+        assert chip.get('record', 'endtime', step='branch', index=index) <= join_start
+
+
+def test_node_priorities_from_history():
+    chip = _nop_diamond()
+    flow = chip.get('option', 'flow')
+
+    # Record a previous job where branch1 was much slower than branch0
+    chip.set('metric', 'tasktime', 1, step='import', index='0')
+    chip.set('metric', 'tasktime', 5, step='branch', index='0')
+    chip.set('metric', 'tasktime', 50, step='branch', index='1')
+    chip.set('metric', 'tasktime', 2, step='join', index='0')
+    chip.schema.record_history()
+    for step, index in chip.nodes_to_execute():
+        chip.unset('metric', 'tasktime', step=step, index=index)
+    chip.set('option', 'jobname', 'job1')
+
+    nodes = chip.nodes_to_execute()
+    history = _get_historical_metrics(chip, flow, nodes, ('tasktime',))
+    assert history['tasktime'] == {
+        ('import', '0'): 1,
+        ('branch', '0'): 5,
+        ('branch', '1'): 50,
+        ('join', '0'): 2
+    }
+
+    dependents = {
+        ('import', '0'): [('branch', '0'), ('branch', '1')],
+        ('branch', '0'): [('join', '0')],
+        ('branch', '1'): [('join', '0')]
+    }
+    priorities = _get_node_priorities(nodes, dependents, history['tasktime'])
+
+    assert priorities[('join', '0')] == 2
+    assert priorities[('branch', '0')] == 7
+    assert priorities[('branch', '1')] == 52
+    assert priorities[('import', '0')] == 53
+
+
+def test_node_priorities_no_history():
+    nodes = [('import', '0'), ('branch', '0'), ('branch', '1'), ('join', '0')]
+    dependents = {
+        ('import', '0'): [('branch', '0'), ('branch', '1')],
+        ('branch', '0'): [('join', '0')],
+        ('branch', '1'): [('join', '0')]
+    }
+    priorities = _get_node_priorities(nodes, dependents, {})
+
+    # Without history, nodes are ranked by the length of the downstream chain
+    assert priorities[('join', '0')] == 1
+    assert priorities[('branch', '0')] == 2
+    assert priorities[('branch', '1')] == 2
+    assert priorities[('import', '0')] == 3
+
+
+def test_launch_nodes_memory_budget():
+    chip = _nop_diamond()
+
+    # Each node is expected to need the full budget, so the branches cannot overlap
+    chip.set('option', 'scheduler', 'maxmemory', 100)
+    chip.set('option', 'scheduler', 'memory', 100)
+    chip.run()
+
+    flow = chip.get('option', 'flow')
+    for step, index in (('import', '0'), ('branch', '0'), ('branch', '1'), ('join', '0')):
+        assert chip.get('flowgraph', flow, step, index, 'status') == NodeStatus.SUCCESS
+
+    branch0 = (chip.get('record', 'starttime', step='branch', index='0'),
+               chip.get('record', 'endtime', step='branch', index='0'))
+    branch1 = (chip.get('record', 'starttime', step='branch', index='1'),
+               chip.get('record', 'endtime', step='branch', index='1'))
+    assert branch0[1] <= branch1[0] or branch1[1] <= branch0[0]
+
+
+def test_launch_nodes_memory_history(monkeypatch):
+    chip = _nop_diamond()
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+
+    # Record a previous job where each node used the full budget
+    for step, index in chip.nodes_to_execute():
+        chip.set('metric', 'memory', 100 * 1024 * 1024, step=step, index=index)
+    chip.schema.record_history()
+    for step, index in chip.nodes_to_execute():
+        chip.unset('metric', 'memory', step=step, index=index)
+    chip.set('option', 'jobname', 'job1')
+
+    # The branches fit by node and thread count, so only the recorded memory
+    # keeps them from running at the same time
+    chip.set('option', 'scheduler', 'maxmemory', 100)
+
+    running = set()
+    max_running = []
+
+    class TrackedProcess:
+        def __init__(self, node, process):
+            self.node = node
+            self.process = process
+
+        def start(self):
+            running.add(self.node)
+            max_running.append(len(running))
+            self.process.start()
+
+        def join(self):
+            self.process.join()
+            running.discard(self.node)
+
+        @property
+        def sentinel(self):
+            return self.process.sentinel
+
+        @property
+        def exitcode(self):
+            return self.process.exitcode
+
+    launch_nodes = scheduler._launch_nodes
+
+    def track_launch_nodes(chip, nodes_to_run, processes, local_processes, status):
+        processes = {node: TrackedProcess(node, process) for node, process in processes.items()}
+        launch_nodes(chip, nodes_to_run, processes, local_processes, status)
+    monkeypatch.setattr(scheduler, '_launch_nodes', track_launch_nodes)
+
+    chip.run()
+
+    flow = chip.get('option', 'flow')
+    for step, index in (('import', '0'), ('branch', '0'), ('branch', '1'), ('join', '0')):
+        assert chip.get('flowgraph', flow, step, index, 'status') == NodeStatus.SUCCESS
+    assert max(max_running) == 1
+
+
+@pytest.mark.parametrize('maxnodes,reads_history', [(None, False), (1, True)])
+def test_launch_nodes_history_on_demand(monkeypatch, maxnodes, reads_history):
+    chip = _nop_diamond()
+    chip.set('option', 'scheduler', 'maxnodes', maxnodes)
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+
+    calls = []
+
+    def get_historical_metrics(*args):
+        calls.append(args)
+        return _get_historical_metrics(*args)
+    monkeypatch.setattr(scheduler, '_get_historical_metrics', get_historical_metrics)
+
+    chip.run()
+
+    # History is only needed to order the nodes which cannot all start at once
+    assert bool(calls) == reads_history
+
+
+def test_node_process_state(monkeypatch, tmp_path):
+    def run():
+        chip = siliconcompiler.Chip('test')
+        chip.load_target('freepdk45_demo')
+        chip.set('option', 'nodisplay', True)
+        chip.set('option', 'quiet', True)
+
+        flow = 'test'
+        chip.set('option', 'flow', flow)
+        chip.node(flow, 'first', process)
+        chip.node(flow, 'second', process)
+        chip.edge(flow, 'first', 'second')
+        chip.run()
+
+        results = []
+        for step in ('first', 'second'):
+            assert chip.get('flowgraph', flow, step, '0', 'status') == NodeStatus.SUCCESS
+            with open(os.path.join(chip._getworkdir(step=step, index='0'), 'process.json')) as f:
+                results.append(json.load(f))
+        return results
+
+    # Start the forkserver before changing the state of this process
+    run()
+
+    monkeypatch.setenv('SC_TEST_NODE_ENV', 'changed')
+    monkeypatch.chdir(tmp_path)
+
+    for result in run():
+        # Nodes see the current environment and working directory of this
+        # process, not those of the forkserver
+        assert result['env'] == 'changed'
+        assert result['cwd'].startswith(str(tmp_path))
+        # Each node starts from the preloaded modules, without the state left
+        # by earlier nodes
+        assert result['runs'] == 0
+
+
+def test_overhead_metrics():
+    chip = _nop_diamond()
+    chip.run()
+
+    for step, index in (('import', '0'), ('branch', '0'), ('branch', '1'), ('join', '0')):
+        tasktime = chip.get('metric', 'tasktime', step=step, index=index)
+        for metric in ('mergetime', 'hashtime', 'copytime', 'checktime', 'manifesttime'):
+            value = chip.get('metric', metric, step=step, index=index)
+            assert value is not None
+            assert 0 <= value <= tasktime
+
+        # The input manifest is written by every node
+        assert chip.get('metric', 'manifesttime', step=step, index=index) > 0
+        if psutil.LINUX:
+            assert chip.get('metric', 'byteswritten', step=step, index=index) > 0
+
+
+def test_overhead_metrics_spans(monkeypatch):
+    chip = siliconcompiler.Chip('test')
+    monkeypatch.setattr(scheduler, '_node_overhead_start', (timeline.mark(), None))
+
+    # Writing the input manifest and the tool manifest both count as manifest time
+    timeline.record('write_manifest', 0, 1)
+    timeline.record('_write_task_manifest', 0, 2)
+    timeline.record('check_manifest', 0, 4)
+    scheduler._record_overhead(chip, 'import', '0')
+
+    assert chip.get('metric', 'manifesttime', step='import', index='0') == 3
+    assert chip.get('metric', 'checktime', step='import', index='0') == 4
+    assert chip.get('metric', 'hashtime', step='import', index='0') == 0
+
+
+def test_delta_manifests():
+    chip = _nop_diamond()
+    chip.run()
+
+    flow = chip.get('option', 'flow')
+    outputs = os.path.join(chip._getworkdir(step='join', index='0'), 'outputs')
+    delta = Schema(manifest=os.path.join(outputs, 'test.pkg.delta.json'))
+
+    # Only parameters changed during the run are included, along with the
+    # changes merged from the input nodes
+    assert not delta.valid('pdk', 'freepdk45', 'stackup')
+    assert delta.get('flowgraph', flow, 'join', '0', 'status') == NodeStatus.SUCCESS
+    assert delta.get('metric', 'tasktime', step='join', index='0') is not None
+    assert delta.get('metric', 'tasktime', step='import', index='0') is not None
+
+    assert os.path.getsize(os.path.join(outputs, 'test.pkg.delta.json')) < \
+        os.path.getsize(os.path.join(outputs, 'test.pkg.json')) / 10
+
+    for step, index in (('import', '0'), ('branch', '0'), ('branch', '1'), ('join', '0')):
+        assert chip.get('metric', 'tasktime', step=step, index=index) is not None
+
+
+def test_check_node_inputs():
+    chip = _nop_diamond()
+    chip.run()
+
+    chip.set('option', 'resume', True)
+    assert check_node_inputs(chip, 'join', '0')
+
+    chip.set('tool', 'builtin', 'task', 'nop', 'option', '-changed', step='join', index='0')
+    assert not check_node_inputs(chip, 'join', '0')
+    assert check_node_inputs(chip, 'branch', '0')
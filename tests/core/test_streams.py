@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import siliconcompiler
+from siliconcompiler import scheduler
+from siliconcompiler.scheduler import _setup_node
+from siliconcompiler.scheduler.streams import OutputStreams
+import tests.core.tools.run.run as run
+
+
+def _run(script, stderr_to_stdout=False):
+    stdout_lines = []
+    stderr_lines = []
+
+    with open('stdout.log', 'wb') as stdout_writer, open('stderr.log', 'wb') as stderr_writer:
+        proc = subprocess.Popen([sys.executable, '-c', script],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT if stderr_to_stdout else subprocess.PIPE)
+        pipes = [(proc.stdout, stdout_writer, stdout_lines.append)]
+        if not stderr_to_stdout:
+            pipes.append((proc.stderr, stderr_writer, stderr_lines.append))
+
+        streams = OutputStreams(pipes)
+        while proc.poll() is None:
+            streams.read(timeout=0.1)
+        streams.close()
+
+    return stdout_lines, stderr_lines
+
+
+def test_output_streams():
+    stdout, stderr = _run(
+        'import sys, time\n'
+        'for n in range(3):\n'
+        '    print(f"line {n}  ", flush=True)\n'
+        '    time.sleep(0.05)\n'
+        'print("error", file=sys.stderr, flush=True)\n'
+        'sys.stdout.write("partial")\n')
+
+    assert stdout == ['line 0', 'line 1', 'line 2', 'partial']
+    assert stderr == ['error']
+
+    with open('stdout.log') as f:
+        assert f.read().splitlines() == ['line 0  ', 'line 1  ', 'line 2  ', 'partial']
+    with open('stderr.log') as f:
+        assert f.read() == 'error\n'
+
+
+def test_output_streams_large():
+    stdout, _ = _run('for n in range(100000):\n    print(n)\n', stderr_to_stdout=True)
+
+    assert stdout == [str(n) for n in range(100000)]
+    with open('stdout.log') as f:
+        assert f.read().splitlines() == stdout
+
+
+def test_output_streams_realtime():
+    stdout_lines = []
+
+    proc = subprocess.Popen([sys.executable, '-c',
+                             'import sys\n'
+                             'print("ready", flush=True)\n'
+                             'sys.stdin.readline()\n'],
+                            stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE)
+    streams = OutputStreams([(proc.stdout, None, stdout_lines.append)])
+
+    # The line is forwarded while the process is still running
+    for _ in range(100):
+        streams.read(timeout=0.1)
+        if stdout_lines:
+            break
+    assert stdout_lines == ['ready']
+    assert proc.poll() is None
+
+    proc.communicate(b'\n')
+    streams.close()
+
+
+def test_output_streams_closed_on_interrupt(monkeypatch):
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'mode', 'asic')
+    chip.node('testflow', 'run', run)
+    chip.set('option', 'flow', 'testflow')
+    chip.set('tool', 'run', 'task', 'run', 'option', ['-c', 'sleep 1'], step='run', index='0')
+    _setup_node(chip, 'run', '0')
+    chip.set('arg', 'step', 'run')
+    chip.set('arg', 'index', '0')
+
+    closed = []
+    close = OutputStreams.close
+
+    def record_close(self):
+        closed.append(self)
+        close(self)
+
+    def interrupt(self, timeout=None):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(OutputStreams, 'close', record_close)
+    monkeypatch.setattr(OutputStreams, 'read', interrupt)
+    monkeypatch.setattr(scheduler, '_haltstep', lambda *args, **kwargs: sys.exit(1))
+
+    # The step is halted, and the pipes of the tool are still closed
+    with pytest.raises(SystemExit):
+        scheduler._run_executable_or_builtin(chip, 'run', '0', '0', None, os.getcwd())
+    assert len(closed) == 1
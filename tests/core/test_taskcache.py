@@ -0,0 +1,80 @@
+import os
+
+import siliconcompiler
+from siliconcompiler.scheduler import taskcache
+
+from tests.core.tools.dummy import cache
+
+
+def _cache_chip(cache_path):
+    chip = siliconcompiler.Chip('test')
+    chip.load_target('freepdk45_demo')
+    chip.set('option', 'nodisplay', True)
+    chip.set('option', 'quiet', True)
+
+    flow = 'cache'
+    chip.set('option', 'flow', flow)
+    chip.node(flow, 'cache', cache)
+
+    chip.set('option', 'var', 'cache_test', 'a')
+    chip.set('option', 'taskcache', 'path', cache_path)
+
+    return chip
+
+
+def _read_output(chip, jobname):
+    path = os.path.join(chip._getworkdir(jobname=jobname, step='cache', index='0'),
+                        'outputs', 'test.v')
+    with open(path) as f:
+        return f.read()
+
+
+def test_taskcache_hit():
+    chip = _cache_chip('taskcache')
+    chip.set('option', 'jobname', 'job0')
+    chip.run()
+    first = _read_output(chip, 'job0')
+    assert len(os.listdir('taskcache')) == 2  # entry and lock
+
+    chip = _cache_chip('taskcache')
+    chip.set('option', 'jobname', 'job1')
+    chip.set('option', 'builddir', 'build_other')
+    chip.run()
+
+    assert _read_output(chip, 'job1') == first
+    assert chip.get('metric', 'cells', step='cache', index='0') == 10
+    assert chip.get('tool', 'dummy', 'task', 'cache', 'report', 'cells',
+                    step='cache', index='0') == ['reports/area.rpt']
+    assert os.path.isfile(os.path.join(chip._getworkdir(jobname='job1', step='cache', index='0'),
+                                       'reports', 'area.rpt'))
+
+
+def test_taskcache_miss():
+    chip = _cache_chip('taskcache')
+    chip.set('option', 'jobname', 'job0')
+    chip.run()
+    first = _read_output(chip, 'job0')
+
+    chip = _cache_chip('taskcache')
+    chip.set('option', 'jobname', 'job1')
+    chip.set('option', 'var', 'cache_test', 'b')
+    chip.run()
+
+    assert _read_output(chip, 'job1') != first
+
+
+def test_taskcache_eviction():
+    chip = _cache_chip('taskcache')
+    chip.set('option', 'taskcache', 'maxsize', 0)
+    chip.run()
+
+    # Entry does not fit in the cache
+    assert os.listdir('taskcache') == ['.lock']
+
+
+def test_taskcache_disabled():
+    chip = siliconcompiler.Chip('test')
+    assert taskcache.get_cache_path(chip) is None
+
+    chip.set('option', 'taskcache', 'path', 'taskcache')
+    assert taskcache.get_cache_path(chip) == os.path.abspath('taskcache')
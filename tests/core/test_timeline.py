@@ -0,0 +1,92 @@
+import json
+import os
+
+import siliconcompiler
+from siliconcompiler.scheduler import timeline
+from siliconcompiler.tools.builtin import nop
+
+
+def _run_timeline():
+    chip = siliconcompiler.Chip('test')
+    chip.load_target('freepdk45_demo')
+    chip.set('option', 'nodisplay', True)
+    chip.set('option', 'quiet', True)
+    chip.set('option', 'timeline', True)
+
+    flow = 'test'
+    chip.set('option', 'flow', flow)
+    chip.node(flow, 'import', nop)
+    for index in ('0', '1'):
+        chip.node(flow, 'branch', nop, index=index)
+        chip.edge(flow, 'import', 'branch', head_index=index)
+
+    chip.run()
+
+    with open(os.path.join(chip._getworkdir(), 'test.timeline.json')) as f:
+        return chip, json.load(f)
+
+
+def test_timeline_tracks():
+    _, trace = _run_timeline()
+
+    tracks = {}
+    for event in trace['traceEvents']:
+        if event['name'] == 'thread_name':
+            tracks[event['args']['name']] = event['tid']
+
+    assert set(tracks.keys()) == {'scheduler', 'import0', 'branch0', 'branch1'}
+
+    def get_spans(track):
+        return [event for event in trace['traceEvents']
+                if event['ph'] == 'X' and event['tid'] == tracks[track]]
+
+    assert 'check_manifest' in [event['name'] for event in get_spans('scheduler')]
+
+    for track in ('import0', 'branch0', 'branch1'):
+        spans = get_spans(track)
+        names = [event['name'] for event in spans]
+        for name in ('_setup_node', 'waiting on inputs', 'waiting on resources',
+                     'node process', '_setupnode', '_merge_input_dependencies_manifests',
+                     'check_manifest', '_finalizenode', 'write_manifest'):
+            assert name in names
+
+        # Spans recorded in the node process are within the node process span
+        node_span, = [event for event in spans if event['name'] == 'node process']
+        setup_span, = [event for event in spans if event['name'] == '_setupnode']
+        assert setup_span['ts'] >= node_span['ts']
+        assert setup_span['ts'] + setup_span['dur'] <= node_span['ts'] + node_span['dur']
+
+
+def test_timeline_disabled():
+    chip = siliconcompiler.Chip('test')
+    chip.load_target('freepdk45_demo')
+    chip.set('option', 'nodisplay', True)
+    chip.set('option', 'quiet', True)
+
+    flow = 'test'
+    chip.set('option', 'flow', flow)
+    chip.node(flow, 'import', nop)
+    chip.run()
+
+    assert not os.path.exists(os.path.join(chip._getworkdir(), 'test.timeline.json'))
+    assert not os.path.exists(os.path.join(chip._getworkdir(step='import', index='0'),
+                                           'sc_import0.timeline.json'))
+
+
+def test_timeline_durations():
+    timeline.clear()
+    timeline.record('write_manifest', 10, 11)
+    mark = timeline.mark()
+    timeline.record('write_manifest', 20, 22)
+    timeline.record('write_manifest', 30, 33)
+    timeline.record('_hash_files', 40, 44)
+    timeline.record('write_manifest', 50, 55, node=('import', '0'))
+
+    assert timeline.get_durations(['write_manifest', '_hash_files', 'check_manifest'],
+                                  since=mark) == {
+        'write_manifest': 5,
+        '_hash_files': 4,
+        'check_manifest': 0
+    }
+    assert timeline.get_durations(['write_manifest'])['write_manifest'] == 6
+    timeline.clear()
@@ -1,5 +1,6 @@
 from siliconcompiler import Chip
 from siliconcompiler.scheduler import _check_tool_version
+from siliconcompiler.scheduler import toolversion
 from tests.core.tools.fake import fake_out, fake
 import os
 import pytest
@@ -62,3 +63,36 @@ def test_check_tool_version_failed():
 
     with open('test.log') as f:
         assert "Tool 'tool.sh' responsed with: VERSION FAILED" not in f.read()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='Bash not available')
+def test_probe_version_cached():
+    with open('tool.sh', 'w') as f:
+        f.write('#!/usr/bin/env bash\n')
+        f.write('echo "probe" >> probes.txt\n')
+        f.write('echo "1.0.0"\n')
+
+    os.chmod('tool.sh', 0o777)
+
+    chip = Chip('test')
+    chip.set('option', 'cache', os.path.abspath('cache'))
+
+    def get_probes():
+        with open('probes.txt') as f:
+            return len(f.read().splitlines())
+
+    assert toolversion.probe_version(chip, os.path.abspath('tool.sh'), ['-ver']) == \
+        (0, '1.0.0\n')
+    assert toolversion.probe_version(chip, os.path.abspath('tool.sh'), ['-ver']) == \
+        (0, '1.0.0\n')
+    assert get_probes() == 1
+
+    # Different switch is probed separately
+    toolversion.probe_version(chip, os.path.abspath('tool.sh'), ['--version'])
+    assert get_probes() == 2
+
+    # Changing the executable triggers a new probe
+    stat = os.stat('tool.sh')
+    os.utime('tool.sh', ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    toolversion.probe_version(chip, os.path.abspath('tool.sh'), ['-ver'])
+    assert get_probes() == 3
@@ -1,10 +1,15 @@
 # Copyright 2020 Silicon Compiler Authors. All Rights Reserved.
 import csv
+import glob
+import importlib
 import os
+import re
 
 import pytest
 
 import siliconcompiler
+from siliconcompiler.tools.builtin import nop
+from siliconcompiler.scheduler import _setup_node
 
 
 def test_write_manifest():
@@ -87,6 +92,105 @@ multiple lines, spaces, and TCL special characters. This package costs $5 {for r
     assert tcl_eval('[sc_cfg_get input rtl verilog]') == 'rtl/design.v'
 
 
+def test_scoped_tcl():
+    chip = siliconcompiler.Chip('top')
+    chip.node('test', 'syn', nop)
+    chip.set('option', 'flow', 'test')
+    chip.set('arg', 'step', 'syn')
+    chip.set('arg', 'index', '0')
+
+    chip.input('top.v')
+    chip.set('package', 'description', 'test')
+    chip.add('constraint', 'outline', (0, 0))
+    chip.set('tool', 'builtin', 'task', 'nop', 'require', 'package,description',
+             step='syn', index='0')
+    chip.set('tool', 'builtin', 'task', 'nop', 'manifestkeys', ['input', 'library,missing'],
+             step='syn', index='0')
+
+    def get_keys(path):
+        with open(path) as f:
+            return [line.split()[3].strip('"') for line in f
+                    if line.startswith('dict set sc_cfg')]
+
+    chip.write_manifest('full.tcl')
+    assert 'constraint' in get_keys('full.tcl')
+
+    chip.set('option', 'scopedmanifest', True)
+    chip.write_manifest('scoped.tcl')
+    keys = get_keys('scoped.tcl')
+    assert set(keys) == {'design', 'arg', 'option', 'flowgraph', 'tool', 'package', 'input'}
+    assert keys.count('package') == 1
+
+    with open('scoped.tcl') as f:
+        manifest = f.read()
+    assert 'dict set sc_cfg "input" "rtl" "verilog" [list "top.v"]' in manifest
+    assert '"tool" "builtin" "task" "nop" "manifestkeys"' in manifest
+
+
+def _get_script_keys(scripts):
+    '''
+    Returns the keypaths read by TCL scripts, up to the first key which is
+    not a literal.
+    '''
+    keys = set()
+    for script in scripts:
+        with open(script) as f:
+            for match in re.finditer(r'sc_cfg_(?:get|exists) ([^\]]+)', f.read()):
+                keypath = []
+                for key in match.group(1).split():
+                    keypath.append(key)
+                    if not re.fullmatch(r'[a-z_]+', key):
+                        break
+                keys.add(tuple(keypath[0:2]))
+    return keys
+
+
+@pytest.mark.parametrize('tool,task,module,scoped', [
+    ('openroad', 'floorplan', 'siliconcompiler.tools.openroad.floorplan', True),
+    ('yosys', 'syn_asic', 'siliconcompiler.tools.yosys.syn_asic', False)])
+def test_scoped_tcl_tool_scripts(tool, task, module, scoped):
+    chip = siliconcompiler.Chip('gcd')
+    chip.load_target('freepdk45_demo')
+    chip.input('gcd.v')
+    chip.node('test', 'task', importlib.import_module(module))
+    chip.set('option', 'flow', 'test')
+    chip.set('option', 'scopedmanifest', True)
+    _setup_node(chip, 'task', '0')
+    chip.set('arg', 'step', 'task')
+    chip.set('arg', 'index', '0')
+
+    # Only tasks which list the keypaths read by their scripts are scoped
+    assert bool(chip.get('tool', tool, 'task', task, 'manifestkeys',
+                         step='task', index='0')) == scoped
+
+    chip.write_manifest('sc_manifest.tcl')
+    with open('sc_manifest.tcl') as f:
+        manifest = {tuple(key.strip('"') for key in line.split()[3:5]) for line in f
+                    if line.startswith('dict set sc_cfg')}
+    toplevel = {key[0] for key in manifest}
+
+    tooldir = os.path.dirname(importlib.import_module(module).__file__)
+    scripts = glob.glob(os.path.join(tooldir, '*.tcl')) + \
+        glob.glob(os.path.join(tooldir, 'scripts', '*.tcl')) + \
+        glob.glob(os.path.join(tooldir, '..', '_common', 'tcl', '*.tcl'))
+    script_keys = _get_script_keys(scripts)
+    assert script_keys
+
+    libs = chip.get('asic', 'logiclib', step='task', index='0') + \
+        chip.get('asic', 'macrolib', step='task', index='0')
+    for key in script_keys:
+        if key[0] in ('fpga', 'tool'):
+            # fpga keys are only read for fpga targets, and tool keys are
+            # always included
+            continue
+        assert key[0] in toplevel, key
+        if key == ('library', '$lib') or key == ('library', '$sc_mainlib'):
+            for lib in libs:
+                assert ('library', lib) in manifest, lib
+        elif key == ('pdk', '$sc_pdk'):
+            assert ('pdk', chip.get('option', 'pdk')) in manifest
+
+
 def test_csv():
     chip = siliconcompiler.Chip('test')
     chip.input('source.v')
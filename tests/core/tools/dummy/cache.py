@@ -0,0 +1,29 @@
+from tests.core.tools.dummy.dummy import setup as dummy_setup
+import uuid
+
+
+def setup(chip):
+    dummy_setup(chip)
+
+    step = chip.get('arg', 'step')
+    index = chip.get('arg', 'index')
+
+    chip.set('tool', 'dummy', 'task', 'cache', 'output', chip.top() + '.v',
+             step=step, index=index)
+    chip.add('tool', 'dummy', 'task', 'cache', 'require', 'option,var,cache_test',
+             step=step, index=index)
+
+
+def run(chip):
+    step = chip.get('arg', 'step')
+    index = chip.get('arg', 'index')
+
+    # Write unique content so a rerun can be told apart from a restored result
+    with open(f'outputs/{chip.top()}.v', 'w') as f:
+        f.write(f'// {uuid.uuid4().hex}\n')
+    with open('reports/area.rpt', 'w') as f:
+        f.write('10\n')
+
+    chip._record_metric(step, index, 'cells', 10, 'reports/area.rpt')
+
+    return 0
@@ -0,0 +1,29 @@
+from tests.core.tools.dummy.dummy import setup as dummy_setup
+import json
+import os
+
+import siliconcompiler
+
+
+def setup(chip):
+    dummy_setup(chip)
+
+    step = chip.get('arg', 'step')
+    index = chip.get('arg', 'index')
+
+    chip.set('tool', 'dummy', 'task', 'process', 'threads', 1,
+             step=step, index=index)
+
+
+def run(chip):
+    # Record the state seen by the node process, and leave state behind in the
+    # preloaded siliconcompiler module for a later node to find
+    with open('process.json', 'w') as f:
+        json.dump({
+            'env': os.getenv('SC_TEST_NODE_ENV'),
+            'cwd': os.getcwd(),
+            'runs': getattr(siliconcompiler, '_test_node_runs', 0)
+        }, f)
+    siliconcompiler._test_node_runs = getattr(siliconcompiler, '_test_node_runs', 0) + 1
+
+    return 0
@@ -1,7 +1,10 @@
+import json
+import math
 import pathlib
 import pytest
 
 from siliconcompiler.schema import Schema
+from siliconcompiler.schema import schema_obj
 
 
 def test_manifest():
@@ -42,3 +45,154 @@ def test_read_manifest_with_disallow_missing_keys():
     schema2 = Schema()
     with pytest.raises(ValueError):
         schema2.read_manifest('tmp.json', allow_missing_keys=False)
+
+
+@pytest.mark.parametrize('has_orjson', [False, True])
+def test_write_json(monkeypatch, has_orjson):
+    if has_orjson:
+        pytest.importorskip('orjson')
+    monkeypatch.setattr(schema_obj, '_has_orjson', has_orjson)
+
+    schema = Schema()
+    schema.set('input', 'rtl', 'verilog', 'foo.v')
+    schema.set('metric', 'errors', 1, step='syn', index='0')
+    schema.set('package', 'description', 'caf\u00e9 "quoted"\n')
+    schema.record_history()
+
+    with open('tmp.json', 'w') as f:
+        schema.write_json(f)
+    with open('tmp.json') as f:
+        manifest = f.read()
+    assert manifest == json.dumps(json.loads(manifest), indent=4)
+
+    # Jobs in history are written without the default parameters
+    cfg = schema.cfg
+    written_cfg = json.loads(manifest)
+    assert written_cfg.pop('history')['job0'] != cfg.pop('history')['job0']
+    assert written_cfg == cfg
+
+    with open('compact.json', 'w') as f:
+        schema.write_json(f, compact=True)
+    with open('compact.json') as f:
+        assert '\n' not in f.read()
+
+    schema2 = Schema(manifest='compact.json')
+    assert schema2.cfg == schema.cfg
+
+
+@pytest.mark.parametrize('has_orjson', [False, True])
+@pytest.mark.parametrize('compact', [False, True])
+def test_write_json_nonfinite(monkeypatch, has_orjson, compact):
+    if has_orjson:
+        pytest.importorskip('orjson')
+    monkeypatch.setattr(schema_obj, '_has_orjson', has_orjson)
+
+    schema = Schema()
+    schema.set('metric', 'tasktime', float('inf'), step='syn', index='0')
+    schema.set('metric', 'totaltime', float('nan'), step='syn', index='0')
+
+    with open('tmp.json', 'w') as f:
+        schema.write_json(f, compact=compact)
+
+    # Non-finite values are written like json.dumps() does, rather than as null
+    schema2 = Schema(manifest='tmp.json')
+    assert schema2.get('metric', 'tasktime', step='syn', index='0') == float('inf')
+    assert math.isnan(schema2.get('metric', 'totaltime', step='syn', index='0'))
+
+
+@pytest.mark.parametrize('suffix', ['json', 'compact.json', 'scb'])
+def test_history_manifest(suffix):
+    schema = Schema()
+    schema.set('option', 'jobname', 'job0')
+    schema.set('option', 'var', 'removed', 'value')
+    schema.set('metric', 'errors', 1, step='syn', index='0')
+    schema.set('input', 'rtl', 'verilog', 'foo.v')
+    schema.record_history()
+
+    schema.set('option', 'jobname', 'job1')
+    schema.unset('option', 'var', 'removed')
+    schema.set('metric', 'errors', 2, step='syn', index='0')
+    schema.record_history()
+
+    manifest = f'tmp.{suffix}'
+    if suffix == 'json':
+        with open(manifest, 'w') as f:
+            schema.write_json(f)
+        with open(manifest) as f:
+            written_job = json.load(f)['history']['job1']
+
+        # Jobs hold all the parameters recorded for them
+        assert '__base__' not in written_job
+        assert written_job['option']['jobname']['node']['global']['global']['value'] == 'job1'
+        assert 'var' not in written_job['option']
+        assert 'verilog' in written_job['input']['rtl']
+    elif suffix == 'compact.json':
+        with open(manifest, 'w') as f:
+            schema.write_json(f, compact=True)
+        with open(manifest) as f:
+            written_job = json.load(f)['history']['job1']
+
+        # Jobs are written relative to the previous job
+        assert written_job['__base__'] == 'job0'
+        assert set(written_job.keys()) == {'__base__', 'option', 'metric'}
+    else:
+        with open(manifest, 'wb') as f:
+            schema.write_binary(f)
+
+    schema2 = Schema(manifest=manifest)
+    assert schema2.get('option', 'jobname', job='job0') == 'job0'
+    assert schema2.get('option', 'jobname', job='job1') == 'job1'
+    assert schema2.get('option', 'var', 'removed', job='job0') == ['value']
+    assert schema2.getkeys('option', 'var', job='job0') == ['removed']
+    assert schema2.getkeys('option', 'var', job='job1') == []
+    assert schema2.get('option', 'var', 'removed', job='job1') == []
+    assert schema2.get('metric', 'errors', job='job0', step='syn', index='0') == 1
+    assert schema2.get('metric', 'errors', job='job1', step='syn', index='0') == 2
+    assert schema2.get('input', 'rtl', 'verilog', job='job1', step='import', index='0') == \
+        ['foo.v']
+    assert schema2.get('metric', 'warnings', job='job1', step='syn', index='0') is None
+
+
+def test_binary_manifest():
+    schema = Schema()
+    schema.set('input', 'rtl', 'verilog', 'foo.v')
+    schema.set('option', 'jobname', 'job0')
+    schema.set('metric', 'errors', 1, step='syn', index='0')
+    schema.set('tool', 'yosys', 'task', 'syn', 'var', 'test', 'value',
+               step='syn', index='0')
+    schema.set('constraint', 'component', 'inst', 'placement', (1.0, 2.0, 0.0))
+    schema.record_history()
+
+    with open('tmp.json', 'w') as f:
+        schema.write_json(f)
+    with open('tmp.scb', 'wb') as f:
+        schema.write_binary(f)
+
+    schema2 = Schema(manifest='tmp.scb')
+    assert schema2.get('input', 'rtl', 'verilog') == ['foo.v']
+
+    # Only the sections which were accessed are decoded
+    assert 'input' in schema2._cfg
+    assert 'history' not in schema2._cfg
+    assert 'tool' not in schema2._cfg
+
+    assert schema2.get('constraint', 'component', 'inst', 'placement') == (1.0, 2.0, 0.0)
+    assert schema2.history('job0').get('metric', 'errors', step='syn', index='0') == 1
+    assert schema2.getkeys('tool') == ['yosys']
+
+    # Sections which were not decoded are written as they were read
+    schema3 = Schema(manifest='tmp.scb')
+    with open('tmp2.scb', 'wb') as f:
+        schema3.write_binary(f)
+
+    expected = Schema(manifest='tmp.json').cfg
+    assert Schema(manifest='tmp.scb').cfg == expected
+    assert Schema(manifest='tmp2.scb').cfg == expected
+
+
+def test_binary_manifest_invalid():
+    with open('tmp.scb', 'wb') as f:
+        f.write(b'{}')
+
+    with pytest.raises(ValueError):
+        Schema(manifest='tmp.scb')
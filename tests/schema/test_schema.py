@@ -1,9 +1,11 @@
+import copy
 import pathlib
+import pickle
 
 import pytest
 
 from siliconcompiler.schema import Schema
-from siliconcompiler.schema.schema_cfg import scparam
+from siliconcompiler.schema.schema_cfg import scparam, schema_cfg
 from siliconcompiler import Chip
 
 
@@ -134,3 +136,306 @@ def test_merge_with_init_with_lib():
     chip.schema._merge_with_init_schema()
 
     assert 'sky130hd' in chip.getkeys('library')
+
+
+def test_index_default_then_set():
+    schema = Schema()
+
+    # Lookup falls back to the 'default' template
+    assert schema.get('option', 'var', 'test') == []
+
+    schema.set('option', 'var', 'test', 'value')
+    assert schema.get('option', 'var', 'test') == ['value']
+
+    # Other keys still fall back to the template
+    assert schema.get('option', 'var', 'other') == []
+    assert schema.getkeys('option', 'var') == ['test']
+
+
+def test_index_remove():
+    schema = Schema()
+
+    schema.set('option', 'var', 'test', 'value')
+    assert schema.get('option', 'var', 'test') == ['value']
+
+    schema._remove('option', 'var', 'test')
+    assert schema.get('option', 'var', 'test') == []
+    assert schema.getkeys('option', 'var') == []
+
+    schema.set('option', 'var', 'test', 'new')
+    assert schema.get('option', 'var', 'test') == ['new']
+
+
+def test_index_replace_cfg():
+    schema = Schema()
+    schema.set('design', 'old')
+    assert schema.get('design') == 'old'
+
+    new_schema = Schema()
+    new_schema.set('design', 'new')
+    schema.cfg = new_schema.cfg
+
+    assert schema.get('design') == 'new'
+
+
+def test_index_edit_cfg():
+    schema = Schema()
+    schema.set('option', 'jobname', 'old')
+
+    # Replace a section once the schema no longer shares its configuration
+    schema.cfg
+    assert not schema._shared
+    assert schema.get('option', 'jobname') == 'old'
+    option = copy.deepcopy(schema.cfg['option'])
+    option['jobname']['node']['global']['global']['value'] = 'new'
+    schema.cfg['option'] = option
+
+    assert schema.get('option', 'jobname') == 'new'
+    schema.set('option', 'jobname', 'set')
+    assert schema.cfg['option']['jobname']['node']['global']['global']['value'] == 'set'
+
+
+def test_index_pickle():
+    schema = Schema()
+    schema.set('design', 'test')
+    restored = pickle.loads(pickle.dumps(schema))
+
+    restored.set('design', 'restored')
+    assert restored.get('design') == 'restored'
+    assert restored.getdict('design')['node']['global']['global']['value'] == 'restored'
+    assert schema.get('design') == 'test'
+
+
+def test_copy_on_write():
+    schema = Schema()
+    schema.set('design', 'test')
+    schema.set('option', 'var', 'test', 'value')
+    schema.set('metric', 'errors', 1, step='syn', index='0')
+
+    copy = schema.copy()
+    copy.set('design', 'copy')
+    copy.add('option', 'var', 'test', 'copy')
+    copy.set('option', 'var', 'new', 'copy')
+    copy.unset('metric', 'errors', step='syn', index='0')
+
+    assert schema.get('design') == 'test'
+    assert schema.get('option', 'var', 'test') == ['value']
+    assert schema.getkeys('option', 'var') == ['test']
+    assert schema.get('metric', 'errors', step='syn', index='0') == 1
+
+    assert copy.get('design') == 'copy'
+    assert copy.get('option', 'var', 'test') == ['value', 'copy']
+    assert copy.get('option', 'var', 'new') == ['copy']
+    assert copy.get('metric', 'errors', step='syn', index='0') is None
+
+    # Modifying the original does not change the copy either
+    schema.set('design', 'original')
+    schema.set_default('option', 'var', 'test', ['default'])
+    assert copy.get('design') == 'copy'
+    assert copy.get_default('option', 'var', 'test') == []
+
+    # Unmodified parameters are shared
+    assert schema.getdict('option', 'jobname') == copy.getdict('option', 'jobname')
+    assert schema._search('option', 'jobname') is copy._search('option', 'jobname')
+
+
+def test_copy_on_write_prune():
+    schema = Schema()
+    schema.set('design', 'test')
+
+    copy = schema.copy()
+    copy.prune()
+
+    assert 'help' not in copy.getdict('design')
+    assert 'help' in schema.getdict('design')
+    assert 'default' in schema.getdict('option', 'var')
+
+
+def test_copy_on_write_direct_access():
+    schema = Schema()
+    schema.set('design', 'test')
+
+    copy = schema.copy()
+    copy.cfg['design']['node']['global']['global']['value'] = 'copy'
+
+    assert schema.get('design') == 'test'
+    assert copy.get('design') == 'copy'
+
+
+def test_copy_on_write_history():
+    schema = Schema()
+    schema.set('option', 'jobname', 'job0')
+    schema.set('metric', 'errors', 1, step='syn', index='0')
+    schema.record_history()
+
+    copy = schema.copy()
+    copy.history('job0').set('metric', 'errors', 2, step='syn', index='0')
+
+    assert copy.history('job0').get('metric', 'errors', step='syn', index='0') == 2
+    assert schema.history('job0').get('metric', 'errors', step='syn', index='0') == 1
+
+
+def test_shared_history():
+    schema = Schema()
+    schema.set('option', 'var', 'test', 'value')
+    schema.set('option', 'jobname', 'job0')
+    schema.set('metric', 'errors', 1, step='syn', index='0')
+    schema.record_history()
+
+    schema.set('option', 'jobname', 'job1')
+    schema.set('metric', 'errors', 2, step='syn', index='0')
+    schema.record_history()
+
+    # Parameters which did not change are shared between jobs, and the ones
+    # which were not recorded with the default configuration
+    assert schema._search('option', 'var', 'test', job='job0') is \
+        schema._search('option', 'var', 'test', job='job1')
+    assert schema._search('metric', 'errors', job='job0') is not \
+        schema._search('metric', 'errors', job='job1')
+    assert schema._search('input', job='job0') is Schema._templates[Schema]['input']
+    assert schema.get('input', 'rtl', 'verilog', job='job0', step='import', index='0') == []
+
+    # Shared parameters are copied before being modified
+    schema.history('job1').set('option', 'var', 'test', 'other')
+    schema.history('job1').set('input', 'rtl', 'verilog', 'test.v')
+    schema.set('option', 'var', 'test', 'current')
+    assert schema.get('option', 'var', 'test', job='job0') == ['value']
+    assert schema.get('option', 'var', 'test', job='job1') == ['other']
+    assert schema.getkeys('input', 'rtl', job='job0') == []
+    assert schema.getkeys('input', 'rtl', job='job1') == ['verilog']
+    assert Schema._templates[Schema] == schema_cfg()
+
+    # Jobs survive pickling with their shared parameters
+    restored = pickle.loads(pickle.dumps(schema))
+    assert restored._search('option', 'jobname', job='job0') is not \
+        restored._search('option', 'jobname', job='job1')
+    assert restored._search('metric', 'warnings', job='job0') is \
+        restored._search('metric', 'warnings', job='job1')
+    assert restored.get('metric', 'errors', job='job0', step='syn', index='0') == 1
+    assert restored.get('metric', 'errors', job='job1', step='syn', index='0') == 2
+
+
+def test_default_template():
+    schema = Schema()
+    schema.set('design', 'test')
+    schema.set('option', 'var', 'test', 'value')
+    schema.cfg['option']['jobname']['node']['default']['default']['value'] = 'direct'
+
+    # Modifications never leak into the template shared by new schemas
+    new_schema = Schema()
+    assert new_schema.get('design') is None
+    assert new_schema.getkeys('option', 'var') == []
+    assert new_schema.get('option', 'jobname') == 'job0'
+    assert Schema._templates[Schema] == schema_cfg()
+
+
+def test_shared_fields(tmp_path):
+    keypath = ('tool', 'test', 'task', 'test', 'var')
+
+    schema = Schema()
+    schema.add(*keypath, 'a', 'one')
+    schema.add(*keypath, 'b', 'two', step='syn', index='0')
+
+    param_a = schema._search(*keypath, 'a')
+    param_b = schema._search(*keypath, 'b')
+    assert param_a['help'] is param_b['help']
+    assert param_a['node']['default'] is param_b['node']['default']
+
+    # Shared fields are never modified in place
+    schema.add(*keypath, 'a', 'four')
+    schema.set_default(*keypath, 'b', ['three'])
+    assert schema.get(*keypath, 'a') == ['one', 'four']
+    assert schema.get_default(*keypath, 'a') == []
+    assert schema.get(*keypath, 'b', step='syn', index='0') == ['two']
+    assert schema.get(*keypath, 'b') == ['three']
+    assert Schema._templates[Schema] == schema_cfg()
+
+    # Fields read from a manifest are shared with the default configuration
+    manifest = str(tmp_path / 'test.json')
+    with open(manifest, 'w') as f:
+        schema.write_json(f)
+    read_schema = Schema(manifest=manifest)
+    template = Schema._templates[Schema]
+    assert read_schema._search('design')['help'] is template['design']['help']
+    assert read_schema._search(*keypath, 'a')['help'] is \
+        template['tool']['default']['task']['default']['var']['default']['help']
+    assert read_schema.get(*keypath, 'a') == ['one', 'four']
+    assert read_schema.get(*keypath, 'b') == ['three']
+
+
+def test_get_delta():
+    schema = Schema()
+    schema.set('design', 'test')
+    schema.set('option', 'jobname', 'job0')
+    schema.record_history()
+
+    base = schema.copy()
+    schema.set('metric', 'errors', 1, step='syn', index='0')
+    schema.set('option', 'var', 'new', 'value')
+    schema.set('design', 'test')
+    schema.record_history()
+
+    delta = schema._get_delta(base)
+    assert set(delta.allkeys()) == {
+        ('schemaversion',),
+        ('metric', 'errors'),
+        ('option', 'var', 'new')
+    }
+    assert delta.get('metric', 'errors', step='syn', index='0') == 1
+    assert delta.get('option', 'var', 'new') == ['value']
+
+
+def test_diff():
+    schema = Schema()
+    schema.set('design', 'test')
+    schema.set('option', 'var', 'test', 'value')
+    schema.set('metric', 'errors', 1, step='syn', index='0')
+
+    other = schema.copy()
+    assert schema.diff(other) == []
+
+    other.set('design', 'other')
+    other.set('option', 'var', 'new', 'value')
+    other.set('metric', 'errors', 2, step='syn', index='0')
+    other.set('metric', 'warnings', 1, step='syn', index='0')
+    other.set('option', 'var', 'test', True, field='lock')
+
+    assert set(schema.diff(other)) == {
+        (('design',), 'value', None, None),
+        (('option', 'var', 'new'), None, None, None),
+        (('option', 'var', 'test'), 'lock', None, None),
+        (('metric', 'errors'), 'value', 'syn', '0'),
+        (('metric', 'warnings'), 'value', 'syn', '0')
+    }
+
+    assert schema.diff(other, keypaths=[['metric', 'errors'], ['design']]) == [
+        (('design',), 'value', None, None),
+        (('metric', 'errors'), 'value', 'syn', '0')
+    ]
+
+
+def test_pop_changes():
+    schema = Schema()
+    # Changes made before tracking started are not known
+    assert schema._pop_changes() is None
+
+    schema.set('design', 'test')
+    schema.add('option', 'var', 'new', 'value')
+    schema.unset('metric', 'errors', step='syn', index='0')
+    schema.get('option', 'jobname')
+    assert schema._pop_changes() == {
+        ('design',),
+        ('option', 'var', 'new'),
+        ('metric', 'errors')
+    }
+    assert schema._pop_changes() == set()
+
+    # Copies do not know about the changes made before
+    copy = schema.copy()
+    schema.set('option', 'var', 'test', 'value')
+    assert schema._pop_changes() == {('option', 'var', 'test')}
+    assert copy._pop_changes() is None
+
+    # The configuration may be modified directly
+    schema.cfg['design']
+    assert schema._pop_changes() is None